@@ -0,0 +1,68 @@
+"""
+Memoria ocupada por cada agente
+
+Compara el tamaño de los agentes de mablane.algortims con el de las
+versiones compactas de mablane.serving, medido con tracemalloc al crear
+muchas instancias, y lo expresa como múltiplo de K×8 bytes.
+
+    python benchmarks/compact_memory.py --agents 100000 --bandits 10
+"""
+
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from mablane.algortims import Epsilon, ThompsonSampling, UCB1, UCBV
+from mablane.bandits import BinomialBandit
+from mablane.serving import CompactEpsilon, CompactThompsonSampling, CompactUCB1, CompactUCBV
+
+
+def measure(factory, agents, episodes):
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+
+    instances = [factory() for _ in range(agents)]
+
+    for agent in instances[:100]:
+        for bandit in np.random.randint(len(agent._plays), size=episodes):
+            agent.record(bandit, 1.0)
+
+    used = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(start, 'filename'))
+    tracemalloc.stop()
+
+    return used / agents
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agents', type=int, default=100000)
+    parser.add_argument('--bandits', type=int, default=10)
+    parser.add_argument('--episodes', type=int, default=100)
+    args = parser.parse_args()
+
+    k = args.bandits
+    bandits = [BinomialBandit(0.1) for _ in range(k)]
+
+    factories = {
+        'Epsilon': lambda: Epsilon(bandits),
+        'CompactEpsilon': lambda: CompactEpsilon(k),
+        'CompactEpsilon (float64)': lambda: CompactEpsilon(k, dtype=np.float64, count_dtype=np.int64),
+        'UCB1': lambda: UCB1(bandits),
+        'CompactUCB1': lambda: CompactUCB1(k),
+        'UCBV': lambda: UCBV(bandits),
+        'CompactUCBV': lambda: CompactUCBV(k),
+        'ThompsonSampling': lambda: ThompsonSampling(bandits),
+        'CompactThompsonSampling': lambda: CompactThompsonSampling(k),
+    }
+
+    # Solamente las 100 primeras instancias registran tiradas, por lo que
+    # el histórico de los agentes originales apenas influye en la media
+    print(f'{"agent":<26}{"bytes/agent":>12}{"× K·8":>8}')
+    for name, factory in factories.items():
+        size = measure(factory, args.agents, args.episodes)
+        print(f'{name:<26}{size:>12.0f}{size / (8 * k):>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+import numpy as np
+
+
+class SufficientStatistics:
+    """
+    Estadísticos suficientes de las recompensas de un conjunto de
+    bandidos guardados en vectores
+
+    Para cada posición se guarda el número de observaciones, la media y
+    las sumas de los cuadrados (M2) y, opcionalmente, de los cubos y las
+    cuartas potencias (M3, M4) de las desviaciones respecto a la media.
+    Las observaciones individuales se incorporan con el algoritmo de
+    Welford y los lotes se resumen por posición y se combinan con las
+    fórmulas de Chan y Pébay, por lo que nunca se restan sumas de
+    cuadrados grandes y los momentos no pierden precisión ni se vuelven
+    negativos con horizontes largos.
+
+    Parámetros
+    ----------
+    shape : integer or tuple of integer
+        Dimensiones de los vectores, por ejemplo el número de bandidos
+    moments : integer
+        Número de momentos que se calculan, entre 1 (solamente la media)
+        y 4
+    dtype : numpy.dtype
+        Tipo de la media y de los momentos
+
+    Métodos
+    -------
+    update :
+        Incorpora una observación
+    update_batch :
+        Incorpora un lote de observaciones de varias posiciones
+    combine :
+        Incorpora los estadísticos calculados sobre otras observaciones
+    reset :
+        Elimina las observaciones de algunas posiciones
+    variance :
+        Obtención de la varianza
+    sum :
+        Obtención de la suma de las observaciones
+
+    References
+    ----------
+    B. P. Welford. "Note on a Method for Calculating Corrected Sums of
+    Squares and Products." Technometrics 4(3):419-420, 1962.
+
+    Philippe Pébay. "Formulas for Robust, One-Pass Parallel Computation
+    of Covariances and Arbitrary-Order Statistical Moments." Sandia
+    Report SAND2008-6212, 2008.
+    """
+
+    def __init__(self, shape, moments=2, dtype=np.float64):
+        if moments not in (1, 2, 3, 4):
+            raise ValueError(f'moments must be between 1 and 4, got {moments}')
+
+        self.shape = shape
+        self.moments = moments
+
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape, dtype=dtype)
+        self.m2 = np.zeros(shape, dtype=dtype) if moments >= 2 else None
+        self.m3 = np.zeros(shape, dtype=dtype) if moments >= 3 else None
+        self.m4 = np.zeros(shape, dtype=dtype) if moments >= 4 else None
+
+
+    def update(self, index, value):
+        """ Incorpora una observación
+
+        Parámetros
+        ----------
+        index : integer or tuple of integer
+            Posición de la observación
+        value : float
+            Valor de la observación
+        """
+        self.count[index] += 1
+
+        n = self.count[index]
+        delta = value - self.mean[index]
+        delta_n = delta / n
+
+        self.mean[index] += delta_n
+
+        if self.moments == 1:
+            return
+
+        # Los momentos superiores se actualizan antes que los inferiores,
+        # ya que dependen de sus valores previos
+        term = delta * delta_n * (n - 1)
+
+        if self.moments >= 4:
+            self.m4[index] += term * delta_n**2 * (n * n - 3 * n + 3) \
+                              + 6 * delta_n**2 * self.m2[index] - 4 * delta_n * self.m3[index]
+
+        if self.moments >= 3:
+            self.m3[index] += term * delta_n * (n - 2) - 3 * delta_n * self.m2[index]
+
+        self.m2[index] += term
+
+
+    def update_batch(self, index, values):
+        """ Incorpora un lote de observaciones
+
+        Parámetros
+        ----------
+        index : array of integer or tuple of array of integer
+            Posición de cada una de las observaciones. Con vectores de
+            varias dimensiones se indica una tupla con un vector por
+            dimensión. Las posiciones se pueden repetir
+        values : array of float
+            Valor de cada una de las observaciones
+        """
+        values = np.asarray(values, dtype=float).ravel()
+
+        if isinstance(index, tuple):
+            index = np.ravel_multi_index(index, self.count.shape)
+
+        index = np.asarray(index).ravel()
+
+        # Resumen del lote en cada una de las posiciones que aparecen, de
+        # forma que el coste no depende del tamaño de los vectores
+        positions, index = np.unique(index, return_inverse=True)
+        size = len(positions)
+
+        count = np.bincount(index, minlength=size)
+        mean = np.bincount(index, values, minlength=size) / count
+
+        moments = [None, None, None]
+        deviation = values - mean[index]
+
+        for order in range(2, self.moments + 1):
+            moments[order - 2] = np.bincount(index, deviation**order, minlength=size)
+
+        self._combine(positions, count, mean, *moments)
+
+
+    def combine(self, other):
+        """ Incorpora los estadísticos de otro conjunto de observaciones
+
+        Parámetros
+        ----------
+        other : SufficientStatistics
+            Estadísticos con las mismas dimensiones y al menos los mismos
+            momentos
+        """
+        self._combine(slice(None), *[None if values is None else values.ravel()
+                                     for values in (other.count, other.mean, other.m2, other.m3, other.m4)])
+
+
+    def reset(self, index=None):
+        """ Elimina las observaciones de algunas posiciones
+
+        Parámetros
+        ----------
+        index : integer or array of integer
+            Posiciones que se reinician. Si es None se reinician todas
+        """
+        if index is None:
+            index = Ellipsis
+
+        for values in (self.count, self.mean, self.m2, self.m3, self.m4):
+            if values is not None:
+                values[index] = 0
+
+
+    def variance(self, index=None, ddof=0):
+        """ Varianza de las observaciones
+
+        Parámetros
+        ----------
+        index : integer or array of integer
+            Posiciones de las que se quiere la varianza. Si es None se
+            devuelven todas
+        ddof : integer
+            Grados de libertad que se restan al número de observaciones
+
+        Retorna
+        -------
+        variance: array of float
+            Varianza de cada posición, cero si no hay suficientes
+            observaciones
+        """
+        if index is None:
+            index = Ellipsis
+
+        count = self.count[index] - ddof
+        m2 = self.m2[index]
+
+        return np.divide(m2, count, out=np.zeros(np.shape(m2)), where=count > 0)
+
+
+    def sum(self, index=None):
+        if index is None:
+            index = Ellipsis
+
+        return self.mean[index] * self.count[index]
+
+
+    def _combine(self, positions, count, mean, m2=None, m3=None, m4=None):
+        # Los vectores se tratan como planos para seleccionar las posiciones
+        flat = [None if values is None else values.reshape(-1)
+                for values in (self.count, self.mean, self.m2, self.m3, self.m4)]
+
+        n_a = flat[0][positions].astype(float)
+        n_b = np.asarray(count, dtype=float)
+        n = n_a + n_b
+
+        # Se evita dividir entre cero en las posiciones sin observaciones
+        n_safe = np.where(n > 0, n, 1)
+        delta = mean - flat[1][positions]
+        delta_n = delta / n_safe
+
+        flat[0][positions] += np.asarray(count, dtype=np.int64)
+        flat[1][positions] += delta_n * n_b
+
+        if self.moments == 1:
+            return
+
+        m2_a = flat[2][positions]
+        term = delta * delta_n * n_a * n_b
+
+        if self.moments >= 3:
+            m3_a = flat[3][positions]
+
+        if self.moments >= 4:
+            flat[4][positions] += m4 + term * delta_n**2 * (n_a**2 - n_a * n_b + n_b**2) \
+                                  + 6 * delta_n**2 * (n_a**2 * m2 + n_b**2 * m2_a) \
+                                  + 4 * delta_n * (n_a * m3 - n_b * m3_a)
+
+        if self.moments >= 3:
+            flat[3][positions] += m3 + term * delta_n * (n_a - n_b) + 3 * delta_n * (n_a * m2 - n_b * m2_a)
+
+        flat[2][positions] += m2 + term
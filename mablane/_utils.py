@@ -0,0 +1,62 @@
+import numpy as np
+
+
+def argmax_random(values, axis=-1):
+    """ Obtiene el índice del máximo rompiendo los empates al azar
+
+    Parámetros
+    ----------
+    values : array of float
+        Matriz con los valores a comparar
+    axis : integer
+        Eje sobre el que se busca el máximo
+
+    Retorna
+    -------
+    index: integer or array of integer
+        Índice del máximo, elegido al azar entre los empatados
+    """
+    values = np.asarray(values)
+    is_max = values == np.max(values, axis=axis, keepdims=True)
+
+    # Cada máximo recibe una clave aleatoria y se queda el de mayor clave
+    keys = np.where(is_max, np.random.random(values.shape), -1)
+
+    return np.argmax(keys, axis=axis)
+
+
+def grouped_cumsum(groups, values):
+    """ Suma acumulada de los valores dentro de cada grupo
+
+    Parámetros
+    ----------
+    groups : array of integer
+        Grupo de cada valor
+    values : array of float
+        Valores en orden de llegada
+
+    Retorna
+    -------
+    cumsum: array of float
+        Suma de los valores del grupo hasta cada posición, incluida
+    position: array of integer
+        Número de valores del grupo hasta cada posición, incluida
+    """
+    groups = np.asarray(groups)
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+
+    # Inicio del tramo de cada grupo en el orden estable
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    lengths = np.diff(np.r_[starts, len(groups)])
+    offset = np.repeat(starts, lengths)
+
+    cumsum = np.cumsum(np.asarray(values, dtype=float)[order])
+    before = np.r_[0.0, cumsum][offset]
+
+    result = np.empty(len(groups))
+    position = np.empty(len(groups), dtype=np.int64)
+    result[order] = cumsum - before
+    position[order] = np.arange(len(groups)) - offset + 1
+
+    return result, position
@@ -0,0 +1,160 @@
+import os
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class BoundCache:
+    """
+    Caché de las cotas de confianza que dependen únicamente del número
+    entero de éxitos, de tiradas y de la tirada actual
+
+    Con recompensas de Bernoulli o binomiales las cotas de CPUCB, KLUCB
+    y BayesUCB se repiten a menudo para las mismas parejas de éxitos y
+    tiradas, por lo que se guardan las últimas maxsize calculadas y solo
+    se evalúa la función especial para las que faltan, en una única
+    llamada vectorizada. Para que el número de tiradas no haga únicas
+    todas las consultas, la cota se calcula en una rejilla logarítmica
+    con resolution puntos por cada duplicación de las tiradas y se
+    interpola linealmente en el logaritmo entre los dos puntos más
+    próximos. La caché se puede compartir entre agentes y guardar en
+    disco, ya que cada cota se guarda junto a la huella de la función
+    y de los parámetros con los que se ha calculado.
+
+    Parámetros
+    ----------
+    maxsize : integer
+        Número máximo de cotas guardadas
+    resolution : integer
+        Número de puntos de la rejilla por cada duplicación de las
+        tiradas. Si es None las cotas se guardan para cada tirada exacta
+    path : string
+        Fichero NPZ del que se cargan las cotas si existe y en el que se
+        guardan con save
+
+    Métodos
+    -------
+    lookup :
+        Obtención de las cotas de varios bandidos
+    save :
+        Guarda las cotas en disco
+    hit_rate :
+        Proporción de consultas resueltas con la caché
+    """
+
+    def __init__(self, maxsize=2**18, resolution=16, path=None):
+        self.maxsize = maxsize
+        self.resolution = resolution
+        self.path = path
+
+        self.hits = 0
+        self.misses = 0
+
+        self._values = OrderedDict()
+
+        if path is not None and os.path.exists(path):
+            with np.load(path) as data:
+                keys = data['keys'].tolist()
+                fingerprints = (data['fingerprints'].tolist() if 'fingerprints' in data.files
+                                else [''] * len(keys))
+
+                self._values.update(zip([(f, *key) for f, key in zip(fingerprints, keys)],
+                                        data['values'].tolist()))
+
+
+    @property
+    def hit_rate(self):
+        return self.hits / max(self.hits + self.misses, 1)
+
+
+    def lookup(self, function, successes, plays, total, fingerprint=''):
+        """ Cotas de varios bandidos
+
+        Parámetros
+        ----------
+        function : callable
+            Función function(successes, plays, total) que calcula las
+            cotas de forma vectorizada, también sobre total
+        successes : array of integer
+            Número de éxitos de cada bandido
+        plays : array of integer
+            Número de tiradas de cada bandido
+        total : integer
+            Tirada actual
+        fingerprint : string
+            Huella de la función y de sus parámetros. Las cotas de
+            distintas huellas se guardan por separado
+
+        Retorna
+        -------
+        bounds: array of float
+            Cota de cada bandido
+        """
+        successes = np.rint(successes).astype(np.int64)
+        plays = np.asarray(plays, dtype=np.int64)
+
+        if self.resolution is None:
+            return self._lookup(function, fingerprint, successes, plays, int(total))
+
+        # Puntos de la rejilla que rodean a la tirada actual, que se
+        # consultan juntos
+        position = np.log2(max(total, 1)) * self.resolution
+        low = int(np.floor(position))
+        weight = position - low
+
+        if weight == 0:
+            return self._lookup(function, fingerprint, successes, plays, low)
+
+        size = len(plays)
+        bounds = self._lookup(function, fingerprint, np.tile(successes, 2), np.tile(plays, 2),
+                              np.repeat([low, low + 1], size))
+
+        return (1 - weight) * bounds[:size] + weight * bounds[size:]
+
+
+    def save(self, path=None):
+        path = self.path if path is None else path
+
+        fingerprints = np.array([key[0] for key in self._values], dtype=str)
+        keys = np.array([key[1:] for key in self._values], dtype=np.int64).reshape(-1, 3)
+        values = np.array(list(self._values.values()), dtype=float)
+
+        # Escritura atómica para que otros procesos no lean un fichero a medias
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            np.savez(f, fingerprints=fingerprints, keys=keys, values=values)
+        os.replace(temporary, path)
+
+
+    def _lookup(self, function, fingerprint, successes, plays, level):
+        values = self._values
+        level = np.broadcast_to(level, plays.shape)
+        keys = [(fingerprint, *key) for key in zip(successes.tolist(), plays.tolist(), level.tolist())]
+        bounds = np.empty(len(keys))
+        missing = []
+
+        for i, key in enumerate(keys):
+            value = values.get(key)
+
+            if value is None:
+                missing.append(i)
+            else:
+                values.move_to_end(key)
+                bounds[i] = value
+
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            missing = np.array(missing)
+            total = level[missing] if self.resolution is None else 2 ** (level[missing] / self.resolution)
+            bounds[missing] = function(successes[missing], plays[missing], total)
+
+            for i in missing.tolist():
+                values[keys[i]] = bounds[i]
+
+            while len(values) > self.maxsize:
+                values.popitem(last=False)
+
+        return bounds
@@ -0,0 +1,394 @@
+import math
+
+import numpy as np
+
+from ._IndexPolicy import IndexPolicy
+from ._KLUCB import klBin
+
+
+class ChangeDetection(IndexPolicy):
+    """
+    Base de los agentes que solucionan el problema del el Bandido
+    Multibrazo (Multi-Armed Bandit) no estacionario combinando un índice
+    UCB con un detector de cambios en cada bandido
+
+    Tras cada tirada el detector del bandido jugado se actualiza con un
+    coste constante amortizado. Cuando detecta un cambio se reinician
+    únicamente los estadísticos de ese bandido, que vuelve a jugarse
+    como si fuese nuevo. Para detectar los cambios en los bandidos poco
+    jugados, con probabilidad alpha se juega un bandido al azar.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    alpha : float
+        Probabilidad de jugar un bandido al azar
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos seleccionados
+        por el algoritmo
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
+    average_reward :
+        Obtención de la recompensa promedio
+    plot :
+        Representación gráfica del histórico de tiradas
+    """
+
+    def __init__(self, bandits, alpha=0.01):
+        self.alpha = alpha
+
+        super(ChangeDetection, self).__init__(bandits)
+
+        # Tirada del último reinicio de cada bandido y cambios detectados
+        self._restarts = np.zeros(self._num_bandits, dtype=np.int64)
+        self.changes = []
+
+
+    def update(self, bandit, reward):
+        if self._detect(bandit, reward):
+            total = len(self._rewards)
+
+            self._stats.reset(bandit)
+            self._restarts[bandit] = total
+            self._reset(bandit)
+
+            self.changes.append((total, bandit))
+
+
+    def _fit(self, arms, rewards):
+        # Los detectores dependen del orden, por lo que los registros se
+        # incorporan uno a uno
+        for bandit, reward in zip(arms.tolist(), rewards.tolist()):
+            self.record(bandit, reward)
+
+
+    def _forced(self, total):
+        # Los bandidos sin tiradas, nuevos o reiniciados, se juegan primero
+        unplayed = np.flatnonzero(self._plays == 0)
+
+        if len(unplayed) > 0:
+            return unplayed[0]
+
+        if np.random.random() < self.alpha:
+            return np.random.choice(self._num_bandits)
+
+        return None
+
+
+    def _width(self, total, active):
+        # El tiempo de la exploración es el número de tiradas desde los
+        # reinicios, no el total
+        plays = self._plays[active]
+
+        return np.sqrt(2 * np.log(max(np.sum(self._plays), 1)) / plays)
+
+
+    def _detect(self, bandit, reward):
+        raise NotImplementedError
+
+
+    def _reset(self, bandit):
+        pass
+
+
+class CUSUMUCB(ChangeDetection):
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    (Multi-Armed Bandit) no estacionario mediante el uso de una
+    estrategia CUSUM-UCB
+
+    Las primeras warmup recompensas tras cada reinicio fijan la media de
+    referencia del bandido y, a partir de ahí, se acumulan las
+    desviaciones por encima y por debajo de ella que superan drift. Se
+    detecta un cambio cuando alguna de las dos sumas supera threshold.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    threshold : float
+        Umbral de las sumas acumuladas
+    drift : float
+        Desviación mínima que se acumula en cada tirada
+    warmup : integer
+        Número de tiradas con las que se estima la media de referencia
+    alpha : float
+        Probabilidad de jugar un bandido al azar
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos seleccionados
+        por el algoritmo
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
+    average_reward :
+        Obtención de la recompensa promedio
+    plot :
+        Representación gráfica del histórico de tiradas
+
+    References
+    ----------
+    Fang Liu, Joohyun Lee, and Ness Shroff. "A Change-Detection based
+    Framework for Piecewise-stationary Multi-Armed Bandit Problem." AAAI
+    Conference on Artificial Intelligence, 2018.
+    """
+
+    def __init__(self, bandits, threshold=20, drift=0.05, warmup=100, alpha=0.01):
+        self.threshold = threshold
+        self.drift = drift
+        self.warmup = warmup
+
+        super(CUSUMUCB, self).__init__(bandits, alpha)
+
+        self._reference = np.zeros(self._num_bandits)
+        self._positive = np.zeros(self._num_bandits)
+        self._negative = np.zeros(self._num_bandits)
+
+
+    def _detect(self, bandit, reward):
+        # Durante el calentamiento la referencia es la media desde el reinicio
+        if self._plays[bandit] <= self.warmup:
+            self._reference[bandit] = self._mean[bandit]
+            return False
+
+        deviation = reward - self._reference[bandit]
+
+        self._positive[bandit] = max(0, self._positive[bandit] + deviation - self.drift)
+        self._negative[bandit] = max(0, self._negative[bandit] - deviation - self.drift)
+
+        return max(self._positive[bandit], self._negative[bandit]) > self.threshold
+
+
+    def _reset(self, bandit):
+        self._positive[bandit] = 0
+        self._negative[bandit] = 0
+
+
+class MonitoredUCB(ChangeDetection):
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    (Multi-Armed Bandit) no estacionario mediante el uso de una
+    estrategia Monitored-UCB
+
+    Las últimas window recompensas de cada bandido se guardan en un
+    vector circular junto a la suma de cada mitad, que se actualizan en
+    tiempo constante con cada tirada. Se detecta un cambio cuando la
+    diferencia entre ambas sumas supera threshold. A diferencia del
+    algoritmo original, que reinicia todos los bandidos, únicamente se
+    reinicia el bandido en el que se detecta el cambio.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    window : integer
+        Número de recompensas de la ventana, debe ser par
+    threshold : float
+        Umbral de la diferencia entre las dos mitades de la ventana. Si
+        es None se usa la cota del algoritmo original con un horizonte
+        igual a la ventana
+    alpha : float
+        Probabilidad de jugar un bandido al azar
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos seleccionados
+        por el algoritmo
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
+    average_reward :
+        Obtención de la recompensa promedio
+    plot :
+        Representación gráfica del histórico de tiradas
+
+    References
+    ----------
+    Yang Cao, Zheng Wen, Branislav Kveton, and Yao Xie. "Nearly Optimal
+    Adaptive Procedure with Change Detection for Piecewise-Stationary
+    Bandit." Proceedings of the Twenty-Second International Conference on
+    Artificial Intelligence and Statistics, PMLR 89:418-427, 2019.
+    """
+
+    def __init__(self, bandits, window=200, threshold=None, alpha=0.01):
+        if window % 2 != 0:
+            raise ValueError(f'window must be even, got {window}')
+
+        if threshold is None:
+            threshold = math.sqrt(window / 2 * math.log(2 * len(bandits) * window**2))
+
+        self.window = window
+        self.threshold = threshold
+
+        super(MonitoredUCB, self).__init__(bandits, alpha)
+
+        self._buffer = np.zeros((self._num_bandits, window))
+        self._halves = np.zeros((self._num_bandits, 2))
+
+
+    def _detect(self, bandit, reward):
+        n = int(self._plays[bandit])
+        half = self.window // 2
+        position = (n - 1) % self.window
+        halves = self._halves[bandit]
+
+        # Sale de la ventana la recompensa más antigua y la del centro
+        # pasa de la segunda mitad a la primera
+        if n > self.window:
+            halves[0] -= self._buffer[bandit, position]
+
+        if n > half:
+            middle = self._buffer[bandit, (n - 1 - half) % self.window]
+            halves[0] += middle
+            halves[1] -= middle
+
+        self._buffer[bandit, position] = reward
+        halves[1] += reward
+
+        return n >= self.window and abs(halves[0] - halves[1]) > self.threshold
+
+
+    def _reset(self, bandit):
+        self._halves[bandit] = 0
+
+
+class GLRklUCB(ChangeDetection):
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    (Multi-Armed Bandit) no estacionario mediante el uso de una
+    estrategia GLR-klUCB con reinicios locales
+
+    Se detecta un cambio cuando el test de razón de verosimilitudes
+    generalizado de Bernoulli entre las recompensas anteriores y
+    posteriores a algún punto supera el umbral. Para que el coste por
+    tirada sea constante amortizado, tras n tiradas el test se repite
+    cada raíz de n tiradas y solamente sobre los puntos múltiplos de
+    ese paso, lo que retrasa la detección como mucho en ese número de
+    tiradas.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    delta : float
+        Nivel de confianza del test
+    alpha : float
+        Probabilidad de jugar un bandido al azar
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos seleccionados
+        por el algoritmo
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
+    average_reward :
+        Obtención de la recompensa promedio
+    plot :
+        Representación gráfica del histórico de tiradas
+
+    References
+    ----------
+    Lilian Besson, Emilie Kaufmann, Odalric-Ambrym Maillard, and Julien
+    Seznec. "Efficient Change-Point Detection for Tackling
+    Piecewise-Stationary Bandits." Journal of Machine Learning Research
+    23(77):1-40, 2022.
+    """
+
+    def __init__(self, bandits, delta=0.01, alpha=0.01):
+        self.delta = delta
+
+        super(GLRklUCB, self).__init__(bandits, alpha)
+
+        # Sumas acumuladas de las recompensas desde el reinicio, en un
+        # vector por bandido cuya capacidad se duplica al llenarse, número
+        # de recompensas y tirada en la que se realiza el próximo test
+        self._cumsum = [np.zeros(64) for _ in range(self._num_bandits)]
+        self._length = np.zeros(self._num_bandits, dtype=np.int64)
+        self._next_test = np.ones(self._num_bandits, dtype=np.int64)
+
+
+    def _detect(self, bandit, reward):
+        n = int(self._length[bandit]) + 1
+        cumsum = self._cumsum[bandit]
+
+        if n == len(cumsum):
+            cumsum = self._cumsum[bandit] = np.concatenate([cumsum, np.zeros(len(cumsum))])
+
+        cumsum[n] = cumsum[n - 1] + reward
+        self._length[bandit] = n
+
+        if n < self._next_test[bandit]:
+            return False
+
+        step = max(1, math.isqrt(n))
+        self._next_test[bandit] = n + step
+
+        splits = np.arange(step, n, step)
+
+        if len(splits) == 0:
+            return False
+
+        before = cumsum[step:n:step]
+        mean = cumsum[n] / n
+
+        statistic = klBin(before / splits, mean, splits) \
+                    + klBin((cumsum[n] - before) / (n - splits), mean, n - splits)
+
+        return np.max(statistic) > math.log(3 * n**1.5 / self.delta)
+
+
+    def _reset(self, bandit):
+        # Se conserva la capacidad del vector
+        self._length[bandit] = 0
+        self._next_test[bandit] = 1
+
+
+    def _index(self, total, active):
+        # Cota superior kl-UCB con el tiempo desde el reinicio de cada
+        # bandido, obtenida por bisección. Los términos que solo dependen
+        # de la media se calculan una vez
+        mean = np.clip(self._mean[active], 1e-15, 1 - 1e-15)
+        plays = self._plays[active]
+        level = np.log(np.maximum(total - self._restarts[active], 1)) / plays
+        level -= mean * np.log(mean) + (1 - mean) * np.log(1 - mean)
+
+        low = mean.copy()
+        high = np.full(len(active), 1 - 1e-15)
+
+        for _ in range(20):
+            q = (low + high) / 2
+            above = -mean * np.log(q) - (1 - mean) * np.log1p(-q) > level
+            high = np.where(above, q, high)
+            low = np.where(above, low, q)
+
+        return low
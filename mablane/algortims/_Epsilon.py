@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from .._SufficientStatistics import SufficientStatistics
+from ..evaluation import LoggedData
+
 
 class Epsilon:
     """
@@ -27,6 +30,13 @@ class Epsilon:
     run :
         Realiza una serie de tiradas con los bandidos seleccionados
         por el algoritmo
+    record :
+        Registra la recompensa obtenida con un bandido, ya sea en una
+        tirada propia o en una procedente de un registro histórico
+    record_batch :
+        Registra un lote de recompensas de varios bandidos
+    fit_from_logs :
+        Inicializa el agente con un registro histórico de tiradas
     update:
         Actualiza los valores adicionales después de una tirada
     select :
@@ -43,6 +53,9 @@ class Epsilon:
     arXiv:1510.00757 (2015).
     """
     
+    # Número de momentos de las recompensas que necesita el algoritmo
+    _moments = 1
+    
     def __init__(self, bandits, epsilon=0.05, decay=1, initial=None):
         self.bandits = bandits
         self.epsilon = epsilon
@@ -51,17 +64,25 @@ class Epsilon:
         self._num_bandits = len(bandits)
         self._rewards = []
         
+        # Las tiradas y las medias son vistas de los estadísticos suficientes
+        self._stats = SufficientStatistics(self._num_bandits, self._moments)
+        self._plays = self._stats.count
+        self._mean = self._stats.mean
+        
         if initial is None:
             self._epsilon = self.epsilon
-            self._plays = [0] * self._num_bandits
-            self._mean = [0] * self._num_bandits
         else:
             self._epsilon = 0
-            self._plays = [1] * self._num_bandits
-            self._mean = initial
+            self._plays[:] = 1
+            self._mean[:] = initial
         
         
     def run(self, episodes=1):
+        # Relojes de los bandidos no estacionarios, que avanzan una ronda
+        # en cada tirada aunque se juegue otro bandido, como en reward_tape
+        clocks = {id(bandit.clock): bandit.clock for bandit in self.bandits
+                  if getattr(bandit, 'clock', None) is not None}
+        
         for i in range(episodes):
             # Selección del bandido
             bandit = self.select()
@@ -69,20 +90,115 @@ class Epsilon:
             # Obtención de una nueva recompensa
             reward = self.bandits[bandit].pull()
             
-            # Agregación de la recompensa al listado
-            self._rewards.append(reward)
+            # Registro de la recompensa obtenida
+            self.record(bandit, reward)
             
-            # Actualización de la media
-            self._plays[bandit] += 1
-            self._mean[bandit] = (1 - 1.0/self._plays[bandit]) * self._mean[bandit] \
-                                 + 1.0/self._plays[bandit] * reward
-            
-            # Actualiza otros valores
-            self.update(bandit, reward)
+            # El reloj del bandido jugado ya ha avanzado con la tirada
+            if clocks:
+                pulled = id(getattr(self.bandits[bandit], 'clock', None))
+                
+                for key, clock in clocks.items():
+                    if key != pulled:
+                        clock.advance()
         
         return self.average_reward()
     
     
+    def record(self, bandit, reward):
+        # Agregación de la recompensa al listado
+        self._rewards.append(reward)
+        
+        # Actualización de las tiradas, la media y los momentos
+        self._stats.update(bandit, reward)
+        
+        # Actualiza otros valores
+        self.update(bandit, reward)
+    
+    
+    def record_batch(self, bandits, rewards):
+        """ Registra un lote de recompensas
+
+        Si el algoritmo no mantiene valores adicionales el lote se
+        incorpora a los estadísticos en una única operación vectorizada.
+        En caso contrario se registra tirada a tirada en el orden dado
+
+        Parámetros
+        ----------
+        bandits : array of integer
+            Bandido de cada una de las recompensas
+        rewards : array of float
+            Recompensas obtenidas
+        """
+        bandits = np.asarray(bandits, dtype=int)
+        rewards = np.asarray(rewards, dtype=float)
+
+        if type(self).update is not Epsilon.update:
+            for bandit, reward in zip(bandits.tolist(), rewards.tolist()):
+                self.record(bandit, reward)
+            
+            return
+        
+        if len(bandits) > 0:
+            self._rewards.extend(rewards.tolist())
+            self._stats.update_batch(bandits, rewards)
+    
+    
+    def fit_from_logs(self, arms, rewards=None):
+        """ Inicializa el agente con un registro histórico de tiradas
+
+        A diferencia del parámetro initial, el agente conserva la
+        exploración, y a diferencia de registrar las tiradas una a una
+        cada bloque de registros se incorpora con operaciones
+        vectorizadas. El estado resultante es el mismo que se obtendría
+        con record salvo en Pursuit, donde se aproxima, y en HOO, donde
+        todos los valores B se recalculan con el total de tiradas.
+
+        Parámetros
+        ----------
+        arms : array of integer or LoggedData or string
+            Bandido de cada registro. Si rewards es None, registros con
+            las columnas (bandido, recompensa[, propensión]) como
+            LoggedData, ruta a un fichero o matriz, que se leen por
+            bloques
+        rewards : array of float
+            Recompensa de cada registro
+
+        Retorna
+        -------
+        agent: Epsilon
+            El propio agente
+        """
+        if rewards is not None:
+            chunks = [(arms, rewards)]
+        else:
+            if not isinstance(arms, LoggedData):
+                arms = LoggedData(arms)
+
+            chunks = ((bandits, values) for bandits, values, _ in arms)
+
+        for bandits, values in chunks:
+            bandits = np.asarray(bandits, dtype=int)
+            values = np.asarray(values, dtype=float)
+
+            if len(bandits) > 0:
+                self._fit(bandits, values)
+
+        return self
+
+
+    def _fit(self, arms, rewards):
+        # Los valores adicionales de cada algoritmo se calculan antes de
+        # actualizar los estadísticos, ya que pueden depender de ellos
+        self._stats.update_batch(arms, rewards)
+        self._rewards.extend(rewards.tolist())
+
+
+    def _refresh(self):
+        # Recalcula los valores derivados de los estadísticos cuando estos
+        # se modifican sin pasar por record, como en los núcleos compilados
+        pass
+
+
     def update(self, bandit, reward):
         pass
     
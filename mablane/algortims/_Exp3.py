@@ -1,5 +1,6 @@
 import numpy as np
 
+from .._utils import grouped_cumsum
 from ._Epsilon import Epsilon
 
 
@@ -49,6 +50,19 @@ class Exp3(Epsilon):
         self._weights[bandit] *= np.exp(self._mean[bandit] * self.gamma / self._num_bandits)
         
         
+    def _fit(self, arms, rewards):
+        # Cada tirada multiplica el peso por la exponencial de la media
+        # tras ella, por lo que el logaritmo del peso crece con la suma de
+        # las medias acumuladas de cada bandido
+        cumsum, position = grouped_cumsum(arms, rewards)
+        running = (self._stats.sum(arms) + cumsum) / (self._plays[arms] + position)
+        growth = np.bincount(arms, running, minlength=self._num_bandits)
+        
+        self._weights = (np.asarray(self._weights) * np.exp(growth * self.gamma / self._num_bandits)).tolist()
+        
+        super(Exp3, self)._fit(arms, rewards)
+        
+        
     def select(self):
         total = len(self._rewards)
         
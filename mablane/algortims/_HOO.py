@@ -0,0 +1,143 @@
+import numpy as np
+
+from .._SufficientStatistics import SufficientStatistics
+from ._Epsilon import Epsilon
+
+
+class HOO(Epsilon):
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    (Multi-Armed Bandit) con muchos bandidos ordenados, como precios o
+    pujas discretizadas, mediante el uso de una estrategia HOO
+    (Hierarchical Optimistic Optimization)
+
+    Los bandidos son las hojas de un árbol binario completo guardado en
+    vectores, en el que el nodo i tiene como hijos a 2i y 2i + 1 y
+    representa el intervalo de bandidos de sus hojas. Cada nodo acumula
+    las recompensas de todos los bandidos de su intervalo, por lo que
+    los bandidos vecinos comparten información. La selección desciende
+    por el hijo con mayor valor B hasta llegar a una hoja o a un nodo sin
+    tiradas, en cuyo caso se juega un bandido al azar de su intervalo, y
+    la actualización solamente recalcula los valores B del camino de la
+    hoja a la raíz, así que el coste de cada tirada es proporcional a la
+    profundidad del árbol y no al número de bandidos.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar, ordenados de
+        forma que los bandidos cercanos tengan recompensas parecidas
+    nu : float
+        Variación máxima de la recompensa esperada dentro del intervalo
+        de la raíz
+    rho : float
+        Factor con el que se reduce la variación en cada nivel del árbol
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos seleccionados
+        por el algoritmo
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    average_reward :
+        Obtención de la recompensa promedio
+    plot :
+        Representación gráfica del histórico de tiradas
+
+    References
+    ----------
+    Sébastien Bubeck, Rémi Munos, Gilles Stoltz and Csaba Szepesvári.
+    "X-Armed Bandits." Journal of Machine Learning Research 12:1655-1695,
+    2011.
+    """
+
+    def __init__(self, bandits, nu=1, rho=0.5):
+        self.nu = nu
+        self.rho = rho
+
+        super(HOO, self).__init__(bandits)
+
+        # Número de hojas, potencia de dos, y profundidad del árbol
+        self._leaves = 1 << max(self._num_bandits - 1, 0).bit_length()
+        self._depth = self._leaves.bit_length() - 1
+
+        nodes = np.arange(2 * self._leaves)
+        depth = np.zeros(2 * self._leaves, dtype=int)
+        depth[1:] = np.log2(nodes[1:]).astype(int)
+
+        # Intervalo [first, last) de bandidos de cada nodo
+        width = self._leaves >> depth
+        self._first = (nodes - (1 << depth)) * width
+        self._last = np.minimum(self._first + width, self._num_bandits)
+
+        self._tree = SufficientStatistics(2 * self._leaves, moments=1)
+        self._variation = nu * rho ** depth.astype(float)
+
+        # Los nodos sin tiradas tienen valor infinito, salvo los que solo
+        # cubren hojas de relleno, que nunca se seleccionan
+        self._b = np.where(self._first < self._num_bandits, np.inf, -np.inf)
+        self._b[0] = -np.inf
+
+
+    def update(self, bandit, reward):
+        # Camino desde la hoja del bandido hasta la raíz
+        path = (self._leaves + bandit) >> np.arange(self._depth + 1)
+
+        self._tree.update(path, reward)
+
+        total = max(len(self._rewards), 1)
+        plays = self._tree.count[path]
+        u = self._tree.mean[path] + np.sqrt(2 * np.log(total) / plays) + self._variation[path]
+
+        # Los valores B se recalculan de abajo arriba, ya que dependen de
+        # los de los hijos
+        b = self._b
+        b[path[0]] = u[0]
+
+        for node, value in zip(path[1:].tolist(), u[1:].tolist()):
+            b[node] = min(value, max(b[2 * node], b[2 * node + 1]))
+
+
+    def _fit(self, arms, rewards):
+        super(HOO, self)._fit(arms, rewards)
+
+        # Cada registro se acumula en un nodo de cada nivel
+        for level in range(self._depth + 1):
+            self._tree.update_batch((self._leaves + arms) >> level, rewards)
+
+        total = len(self._rewards)
+        count = self._tree.count
+        u = self._tree.mean + np.sqrt(2 * np.log(total) / np.maximum(count, 1)) + self._variation
+
+        # Valores B de todos los nodos con tiradas, nivel a nivel de las
+        # hojas a la raíz
+        b = self._b
+        leaves = np.arange(self._leaves, 2 * self._leaves)
+        b[leaves] = np.where(count[leaves] > 0, u[leaves], b[leaves])
+
+        for level in range(self._depth - 1, -1, -1):
+            nodes = np.arange(1 << level, 2 << level)
+            children = np.minimum(u[nodes], np.maximum(b[2 * nodes], b[2 * nodes + 1]))
+            b[nodes] = np.where(count[nodes] > 0, children, b[nodes])
+
+
+    def select(self):
+        b = self._b
+        count = self._tree.count
+        node = 1
+
+        while node < self._leaves:
+            if count[node] == 0:
+                return np.random.randint(self._first[node], self._last[node])
+
+            left, right = b[2 * node], b[2 * node + 1]
+
+            if left > right or (left == right and np.random.random() < 0.5):
+                node = 2 * node
+            else:
+                node = 2 * node + 1
+
+        return node - self._leaves
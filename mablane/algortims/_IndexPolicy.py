@@ -0,0 +1,331 @@
+import numpy as np
+
+from ._Epsilon import Epsilon
+
+
+class IndexPolicy(Epsilon):
+    """
+    Base de los agentes que solucionan el problema del el Bandido
+    Multibrazo (Multi-Armed Bandit) seleccionando el bandido con mayor
+    índice, formado por la recompensa promedio más un término de
+    exploración
+
+    El índice se calcula de forma vectorizada únicamente sobre el
+    conjunto de bandidos activos. Con la eliminación activada, los
+    bandidos cuya cota superior queda por debajo de la mayor de las
+    cotas inferiores se retiran del conjunto, por lo que el coste de
+    cada tirada se reduce a medida que el experimento converge.
+
+    Para mostrar varios bandidos a la vez se puede seleccionar una
+    lista ordenada con los k de mayor índice y registrar después la
+    respuesta según un modelo en cascada, de posición o de
+    realimentación completa.
+
+    En el modo perezoso los índices se guardan y en cada tirada
+    solamente se recalculan los de los bandidos jugados. Todos los
+    índices se actualizan cuando el número de tiradas cruza una rejilla
+    geométrica de razón staleness o cuando las tiradas de un bandido se
+    multiplican por ese factor desde la última actualización completa,
+    por lo que el número de cálculos completos crece con el logaritmo
+    del horizonte.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    elimination : string
+        Modo de eliminación de bandidos: None para no eliminar,
+        'permanent' para eliminarlos de forma definitiva o 'periodic'
+        para volver a considerar todos los bandidos cada period tiradas
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Activa el modo perezoso de cálculo de los índices
+    staleness : float
+        Razón de la rejilla geométrica con la que se actualizan todos
+        los índices en el modo perezoso
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos seleccionados
+        por el algoritmo
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
+    average_reward :
+        Obtención de la recompensa promedio
+    plot :
+        Representación gráfica del histórico de tiradas
+    """
+
+    # Caché de las cotas de los algoritmos que la admiten
+    _bounds = None
+
+    # Parámetros de los que dependen las cotas guardadas en la caché
+    _bound_params = ()
+
+    def __init__(self, bandits, elimination=None, period=1000, scale=None, lazy=False, staleness=2):
+        if elimination not in (None, 'permanent', 'periodic'):
+            raise ValueError(f'Unknown elimination mode: {elimination}')
+
+        if staleness <= 1:
+            raise ValueError(f'staleness must be greater than 1, got {staleness}')
+
+        self.elimination = elimination
+        self.period = period
+        self.scale = scale
+        self.lazy = lazy
+        self.staleness = staleness
+
+        super(IndexPolicy, self).__init__(bandits)
+
+        self._active = np.arange(self._num_bandits)
+        self._last_restore = 0
+
+        # Menor y mayor recompensa observadas, con las que se estima la
+        # amplitud del rango si no se indica scale
+        self._low = np.inf
+        self._high = -np.inf
+
+        # Índices guardados en el modo perezoso, bandidos jugados desde
+        # el último cálculo y tiradas en la última actualización completa
+        self._cache = np.zeros(self._num_bandits)
+        self._pending = []
+        self._refresh_plays = np.zeros(self._num_bandits)
+        self._next_refresh = 0
+
+
+    def record(self, bandit, reward):
+        super(IndexPolicy, self).record(bandit, reward)
+
+        if self.elimination is not None:
+            self._low = min(self._low, reward)
+            self._high = max(self._high, reward)
+
+        if self.lazy:
+            self._pending.append(bandit)
+
+
+    def record_batch(self, bandits, rewards):
+        super(IndexPolicy, self).record_batch(bandits, rewards)
+
+        if self.elimination is not None and len(rewards) > 0:
+            self._low = min(self._low, np.min(rewards))
+            self._high = max(self._high, np.max(rewards))
+
+        if self.lazy:
+            self._pending.extend(np.asarray(bandits, dtype=int).tolist())
+
+
+    def select(self):
+        total = len(self._rewards)
+
+        bandit = self._forced(total)
+
+        if bandit is None:
+            if self.elimination is not None:
+                self._eliminate(total)
+
+            if self.lazy:
+                index = self._lazy_index(total)[self._active]
+            else:
+                index = self._index(total, self._active)
+
+            max_bandits = np.where(index == np.max(index))[0]
+            bandit = self._active[np.random.choice(max_bandits)]
+
+        return bandit
+
+
+    def select_slate(self, k):
+        """ Selecciona los k bandidos con mayor índice
+
+        Parámetros
+        ----------
+        k : integer
+            Número de bandidos de la lista
+
+        Retorna
+        -------
+        slate: array of integer
+            Bandidos ordenados de mayor a menor índice. Los bandidos que
+            se deben jugar de forma forzada se colocan al principio
+        """
+        total = len(self._rewards)
+        forced = self._forced(total)
+
+        if self.elimination is not None and forced is None:
+            self._eliminate(total)
+
+        # Orden aleatorio de los bandidos para romper los empates
+        active = np.random.permutation(self._active)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index = np.asarray(self._index(total, active), dtype=float)
+
+        # Se ordena de menor a mayor prioridad. El bandido forzado va
+        # primero, seguido de los que no tienen tiradas
+        priority = np.where(np.isnan(index), np.inf, -index)
+        priority[self._plays[active] == 0] = -np.finfo(float).max
+
+        if forced is not None:
+            priority[active == forced] = -np.inf
+
+        k = min(k, len(active))
+
+        if k < len(active):
+            top = np.argpartition(priority, k - 1)[:k]
+        else:
+            top = np.arange(len(active))
+
+        # Solamente se ordenan los k seleccionados
+        top = top[np.argsort(priority[top], kind='stable')]
+
+        return active[top]
+
+
+    def record_slate(self, slate, rewards, model='cascade', examination=None):
+        """ Registra la respuesta obtenida con una lista de bandidos
+
+        Parámetros
+        ----------
+        slate : array of integer
+            Bandidos mostrados, en el orden de la lista
+        rewards : array of float
+            Recompensa de cada posición de la lista
+        model : string
+            Modelo de la respuesta. Con 'cascade' se supone que se
+            examinan las posiciones en orden hasta la primera con
+            recompensa, por lo que las siguientes no se registran. Con
+            'position' se examina cada posición con la probabilidad
+            indicada en examination y las recompensas se corrigen
+            dividiendo entre esa probabilidad. Con 'full' se registran
+            todas las posiciones
+        examination : array of float
+            Probabilidad de examinar cada posición en el modelo
+            'position'
+        """
+        rewards = np.asarray(rewards, dtype=float)
+
+        if model == 'cascade':
+            clicked = np.flatnonzero(rewards > 0)
+            observed = len(slate) if len(clicked) == 0 else clicked[0] + 1
+        elif model == 'position':
+            if examination is None:
+                raise ValueError("The 'position' model requires the examination probabilities")
+
+            rewards = rewards / np.asarray(examination, dtype=float)[:len(slate)]
+            observed = len(slate)
+        elif model == 'full':
+            observed = len(slate)
+        else:
+            raise ValueError(f'Unknown feedback model: {model}')
+
+        for bandit, reward in zip(slate[:observed], rewards[:observed]):
+            self.record(bandit, reward)
+
+
+    def _fit(self, arms, rewards):
+        super(IndexPolicy, self)._fit(arms, rewards)
+
+        self._low = min(self._low, np.min(rewards))
+        self._high = max(self._high, np.max(rewards))
+
+        self._refresh()
+
+
+    def _refresh(self):
+        # Los índices guardados se recalculan en la próxima selección
+        self._pending = []
+        self._next_refresh = 0
+
+
+    def _lazy_index(self, total):
+        changed = np.unique(np.asarray(self._pending, dtype=np.int64))
+        self._pending = []
+
+        grown = self._plays[changed] >= self.staleness * np.maximum(self._refresh_plays[changed], 1)
+
+        if total >= self._next_refresh or np.any(grown):
+            changed = self._active
+            self._refresh_plays = self._plays.astype(float)
+            self._next_refresh = max(total + 1, int(np.ceil(total * self.staleness)))
+
+        if len(changed) > 0:
+            self._cache[changed] = self._index(total, changed)
+
+        return self._cache
+
+
+    def _bounded_index(self, total, active):
+        # Índice a partir de los éxitos y las tiradas, consultando la
+        # caché de cotas si el agente dispone de ella
+        successes = self._stats.sum(active)
+        plays = self._plays[active]
+
+        if self._bounds is None:
+            return self._bound(successes, plays, total)
+
+        return self._bounds.lookup(self._bound, successes, plays, total, self._fingerprint())
+
+
+    def _fingerprint(self):
+        # Huella de la función de cotas y de los parámetros de los que
+        # depende, con la que se separan en una caché compartida
+        params = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._bound_params)
+
+        return f'{type(self).__qualname__}({params})'
+
+
+    def _forced(self, total):
+        # Bandido que se debe jugar antes de calcular los índices
+        if total < self._num_bandits:
+            return total
+
+        return None
+
+
+    def _index(self, total, active):
+        return self._mean[active] + self._width(total, active)
+
+
+    def _width(self, total, active):
+        raise NotImplementedError
+
+
+    def _radius(self, total, active):
+        # Intervalo de Hoeffding con nivel 2 / total^2 para recompensas
+        # en un rango de amplitud scale. Es más estrecho que el término de
+        # exploración de UCB1, ya que con la misma amplitud el índice
+        # mantiene las cotas superiores a la altura del mejor y nunca se
+        # eliminaría nada
+        plays = self._plays[active]
+        scale = self.scale if self.scale is not None else max(self._high - self._low, 0)
+
+        return np.where(plays > 0, scale * np.sqrt(np.log(max(total, 1)) / np.maximum(plays, 1)), np.inf)
+
+
+    def _eliminate(self, total):
+        # Las listas y los lotes avanzan varias tiradas entre selecciones,
+        # por lo que se compara con la última restauración
+        if self.elimination == 'periodic' and total - self._last_restore >= self.period:
+            self._active = np.arange(self._num_bandits)
+            self._last_restore = total
+            self._next_refresh = 0
+
+        active = self._active
+        mean = self._mean[active]
+        radius = self._radius(total, active)
+
+        # Se conservan los bandidos no dominados por la mejor cota inferior
+        self._active = active[mean + radius >= np.max(mean - radius)]
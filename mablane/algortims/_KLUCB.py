@@ -2,17 +2,18 @@ import numpy as np
 
 from statsmodels.stats.proportion import proportion_confint
 
-from ._Epsilon import Epsilon
+from ._BoundCache import BoundCache
+from ._IndexPolicy import IndexPolicy
 
 
 def klBin(p, q, n=1, eps=1e-15):
-    p = min(max(p, eps), 1 - eps)
-    q = min(max(q, eps), 1 - eps)
+    p = np.clip(p, eps, 1 - eps)
+    q = np.clip(q, eps, 1 - eps)
     
     return n * (p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q)))
 
 
-class KLUCB(Epsilon):
+class KLUCB(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia KL-UCB
@@ -25,6 +26,23 @@ class KLUCB(Epsilon):
         El número de pruebas de la distribución binomial
     c : float
         Parámetro con el que se puede modificar la velocidad de aprendizaje
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
+    cache : boolean or BoundCache
+        Caché de las cotas para recompensas enteras. Con True se crea
+        una nueva
         
     Métodos
     -------
@@ -35,6 +53,10 @@ class KLUCB(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -50,32 +72,30 @@ class KLUCB(Epsilon):
     arXiv:1510.00757 (2015).
     """
 
-    def __init__(self, bandits, n=1, c=0):
+    _bound_params = ('n', 'c')
+
+    def __init__(self, bandits, n=1, c=0, elimination=None, period=1000, scale=None, lazy=False,
+                 staleness=2, cache=None):
         self.n = n
         self.c = c
+        self.cache = cache
         
-        super(KLUCB, self).__init__(bandits)
+        super(KLUCB, self).__init__(bandits, elimination, period, scale, lazy, staleness)
         
-    
-    def select(self):
-        total = len(self._rewards)
+        self._bounds = BoundCache() if cache is True else cache or None
         
-        if total < self._num_bandits:
-            bandit = total
-        else:
-            ucb = [0] * self._num_bandits
-            d = np.log(total) + self.c * np.log((total + 1))
-                
-            for i in range(self._num_bandits):
-                ucb[i] = klBin(self._mean[i], d / self._plays[i], self.n)
+    
+    def _index(self, total, active):
+        return self._bounded_index(total, active)
+    
+    
+    def _bound(self, successes, plays, total):
+        d = np.log(total) + self.c * np.log((total + 1))
         
-            max_bandits = np.where(ucb == np.max(ucb))[0]
-            bandit = np.random.choice(max_bandits)
-            
-        return bandit
+        return klBin(successes / plays, d / plays, self.n)
 
 
-class CPUCB(Epsilon):
+class CPUCB(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia CP-UCB
@@ -89,6 +109,23 @@ class CPUCB(Epsilon):
     method : string
         Método empleado para calcular el intervalo de confianza con la función
         proportion_confint de statsmodels
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
+    cache : boolean or BoundCache
+        Caché de las cotas para recompensas enteras. Con True se crea
+        una nueva
         
     Métodos
     -------
@@ -99,6 +136,10 @@ class CPUCB(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -110,32 +151,32 @@ class CPUCB(Epsilon):
     Stochastic Bandits and Beyond." arXiv preprint arXiv:1102.2490 (2011).
     """
 
-    def __init__(self, bandits, c=1, method='beta'):
+    _bound_params = ('c', 'method')
+
+    def __init__(self, bandits, c=1, method='beta', elimination=None, period=1000, scale=None,
+                 lazy=False, staleness=2, cache=None):
         self.c = c
         self.method = method
+        self.cache = cache
         
-        self._reward = [0] * len(bandits)
+        super(CPUCB, self).__init__(bandits, elimination, period, scale, lazy, staleness)
         
-        super(CPUCB, self).__init__(bandits)
+        self._bounds = BoundCache() if cache is True else cache or None
         
     
-    def update(self, bandit, reward):
-        self._reward[bandit] += reward
+    def _forced(self, total):
+        # Cada bandido se juega una vez en orden antes de usar el índice
+        if total < self._num_bandits:
+            return total
         
+        return None
         
-    def select(self):
-        total = len(self._rewards)
         
-        if total < self._num_bandits:
-            bandit = total
-        else:
-            ucb = [0] * self._num_bandits
-                
-            for i in range(self._num_bandits):
-                confidence = 1 / (total * np.log(total) ** self.c)
-                ucb[i] = proportion_confint(self._reward[i], self._plays[i], confidence, method=self.method)[1]            
-            
-            max_bandits = np.where(ucb == np.max(ucb))[0]
-            bandit = np.random.choice(max_bandits)
-            
-        return bandit
\ No newline at end of file
+    def _index(self, total, active):
+        return self._bounded_index(total, active)
+    
+    
+    def _bound(self, successes, plays, total):
+        confidence = 1 / (total * np.log(total) ** self.c)
+        
+        return proportion_confint(successes, plays, confidence, method=self.method)[1]
@@ -1,9 +1,9 @@
 import numpy as np
 
-from ._Epsilon import Epsilon
+from ._IndexPolicy import IndexPolicy
 
 
-class MOSS(Epsilon):
+class MOSS(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia MOSS
@@ -12,6 +12,17 @@ class MOSS(Epsilon):
     ----------
     bandits : array of Bandit
         Vector con los bandidos con los que se debe jugar
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
         
     Métodos
     -------
@@ -22,6 +33,10 @@ class MOSS(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -34,18 +49,8 @@ class MOSS(Epsilon):
     arXiv:1510.00757 (2015).
     """
 
-    def select(self):
-        total = len(self._rewards)
+    def _width(self, total, active):
+        plays = self._plays[active]
         
-        if total < self._num_bandits:
-            bandit = total
-        else:
-            moss = [0] * self._num_bandits
-            
-            for i in range(self._num_bandits):
-                moss[i] = self._mean[i] + np.sqrt(max(0, np.log(total/(self._num_bandits * self._plays[i]))) / self._plays[i])
-        
-            max_bandits = np.where(moss == np.max(moss))[0]
-            bandit = np.random.choice(max_bandits)
-            
-        return bandit
\ No newline at end of file
+        return np.sqrt(np.maximum(0, np.log(total / (self._num_bandits * plays))) / plays)
+
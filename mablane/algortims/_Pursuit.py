@@ -52,6 +52,20 @@ class Pursuit(Epsilon):
                 self._p[i] += self.beta * (1 - self._p[i])
             else:
                 self._p[i] -= self.beta * self._p[i]
+                
+                
+    def _fit(self, arms, rewards):
+        super(Pursuit, self)._fit(arms, rewards)
+        
+        # Aproximación: se supone que el bandido con mayor media al final
+        # del bloque lo fue durante todo él. Como cada paso reduce el peso
+        # de los anteriores en 1 - beta, solo influyen las últimas tiradas
+        decay = (1 - self.beta) ** len(arms)
+        
+        p = decay * np.asarray(self._p)
+        p[np.argmax(self._mean)] += 1 - decay
+        
+        self._p = p.tolist()
     
     
     def select(self):
@@ -1,5 +1,7 @@
 import numpy as np
 
+from scipy.signal import lfilter
+
 from ._Epsilon import Epsilon
 
 
@@ -51,6 +53,23 @@ class ReinforcementComparison(Epsilon):
     def update(self, bandit, reward):
         self._r[bandit] = (1 - self.alpha) * self._r[bandit] + self.alpha * reward
         self._pi[bandit] += self.beta * (reward - self._r[bandit])
+        
+        
+    def _fit(self, arms, rewards):
+        order = np.argsort(arms, kind='stable')
+        bounds = np.searchsorted(arms[order], np.arange(self._num_bandits + 1))
+        values = rewards[order]
+        
+        # La recompensa de referencia de cada bandido es un filtro de
+        # primer orden sobre sus recompensas, que se aplica de una vez
+        for bandit in np.flatnonzero(np.diff(bounds)):
+            x = values[bounds[bandit]:bounds[bandit + 1]]
+            r, _ = lfilter([self.alpha], [1, self.alpha - 1], x, zi=[(1 - self.alpha) * self._r[bandit]])
+            
+            self._pi[bandit] += self.beta * (np.sum(x) - np.sum(r))
+            self._r[bandit] = r[-1]
+        
+        super(ReinforcementComparison, self)._fit(arms, rewards)
 
     
     def select(self):
@@ -1,11 +1,10 @@
 import numpy as np
 
-from scipy.stats import beta
+from ._BoundCache import BoundCache
+from ._IndexPolicy import IndexPolicy
 
-from ._Epsilon import Epsilon
 
-
-class ThompsonSampling(Epsilon):
+class ThompsonSampling(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso del Muestreo de Thompson
@@ -26,6 +25,10 @@ class ThompsonSampling(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -41,28 +44,32 @@ class ThompsonSampling(Epsilon):
     def __init__(self, bandits, N=1):
         self.N = N
         
-        self._alpha = [1] * len(bandits)
-        self._beta = [1] * len(bandits)
+        self._alpha = np.ones(len(bandits))
+        self._beta = np.ones(len(bandits))
             
         super(ThompsonSampling, self).__init__(bandits)
         
         
     def update(self, bandit, reward):
-        # Guardado de valores intermedos
+        # Guardado de valores intermedos. Las recompensas corregidas del
+        # modelo de posición pueden superar N y no restan fracasos
         self._alpha[bandit] += reward
-        self._beta[bandit] += (self.N - reward)
-            
-            
-    def select(self):
-        bayes = [0] * self._num_bandits
+        self._beta[bandit] += max(self.N - reward, 0)
         
-        for i in range(self._num_bandits):
-            bayes[i] = beta.rvs(self._alpha[i], self._beta[i])
-            
-        max_bandits = np.where(bayes == np.max(bayes))[0]
-        bandit = np.random.choice(max_bandits)
         
-        return bandit
+    def _fit(self, arms, rewards):
+        self._alpha += np.bincount(arms, rewards, minlength=self._num_bandits)
+        self._beta += np.bincount(arms, np.maximum(self.N - rewards, 0), minlength=self._num_bandits)
+        
+        super(ThompsonSampling, self)._fit(arms, rewards)
+    
+    
+    def _forced(self, total):
+        return None
+            
+            
+    def _index(self, total, active):
+        return np.random.beta(self._alpha[active], self._beta[active])
 
 
 class BayesUCB(ThompsonSampling):
@@ -79,6 +86,9 @@ class BayesUCB(ThompsonSampling):
     gamma : float
         Parámetro con el que se indica cuántas desviaciones
         estándar queremos para el nivel de confianza
+    cache : boolean or BoundCache
+        Caché de las cotas para recompensas enteras entre 0 y N. Con
+        True se crea una nueva
         
     Métodos
     -------
@@ -89,6 +99,10 @@ class BayesUCB(ThompsonSampling):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -106,19 +120,36 @@ class BayesUCB(ThompsonSampling):
     22:592-600, 2012.
     """
 
-    def __init__(self, bandits, N=1, gamma=3):
+    _bound_params = ('N', 'gamma')
+
+    def __init__(self, bandits, N=1, gamma=3, cache=None):
         self.gamma = gamma
+        self.cache = cache
         
         super(BayesUCB, self).__init__(bandits, N)
+        
+        self._bounds = BoundCache() if cache is True else cache or None
 
     
-    def select(self):
-        bayes = [0] * self._num_bandits
+    def _width(self, total, active):
+        # Desviación estándar de la distribución beta
+        a = self._alpha[active]
+        b = self._beta[active]
         
-        for i in range(self._num_bandits):
-            bayes[i] = self._mean[i] + beta.std(self._alpha[i], self._beta[i]) * self.gamma
-            
-        max_bandits = np.where(bayes == np.max(bayes))[0]
-        bandit = np.random.choice(max_bandits)
-            
-        return bandit
\ No newline at end of file
+        return np.sqrt(a * b / ((a + b)**2 * (a + b + 1))) * self.gamma
+    
+    
+    def _index(self, total, active):
+        if self._bounds is not None:
+            return self._bounded_index(total, active)
+        
+        return self._mean[active] + self._width(total, active)
+    
+    
+    def _bound(self, successes, plays, total):
+        # Con recompensas enteras los parámetros de la distribución beta
+        # dependen solamente de los éxitos y las tiradas
+        a = 1 + successes
+        b = 1 + self.N * plays - successes
+        
+        return successes / np.maximum(plays, 1) + np.sqrt(a * b / ((a + b)**2 * (a + b + 1))) * self.gamma
\ No newline at end of file
@@ -1,9 +1,13 @@
+import heapq
+import math
+
 import numpy as np
 
 from ._Epsilon import Epsilon
+from ._IndexPolicy import IndexPolicy
 
 
-class UCB1(Epsilon):
+class UCB1(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia UCB1
@@ -12,6 +16,20 @@ class UCB1(Epsilon):
     ----------
     bandits : array of Bandit
         Vector con los bandidos con los que se debe jugar
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
         
     Métodos
     -------
@@ -22,6 +40,10 @@ class UCB1(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -33,21 +55,8 @@ class UCB1(Epsilon):
     experiment design with the stochastic multi-armed bandit." arXiv preprint
     arXiv:1510.00757 (2015).
     """
-    def select(self):
-        total = len(self._rewards)
-        
-        if total < self._num_bandits:
-            bandit = total
-        else:
-            ucb = [0] * self._num_bandits
-            
-            for i in range(self._num_bandits):
-                ucb[i] = self._mean[i] + np.sqrt(2 * np.log(total) / self._plays[i])
-        
-            max_bandits = np.where(ucb == np.max(ucb))[0]
-            bandit = np.random.choice(max_bandits)
-            
-        return bandit
+    def _width(self, total, active):
+        return np.sqrt(2 * np.log(total) / self._plays[active])
 
 
 class UCB2(Epsilon):
@@ -85,8 +94,6 @@ class UCB2(Epsilon):
 
     def __init__(self, bandits, alpha=0.1):
         self.alpha = alpha
-            
-        self._mean = [0] * len(bandits)
         
         super(UCB2, self).__init__(bandits)
     
@@ -97,9 +104,9 @@ class UCB2(Epsilon):
         if total == 0:
             bandit = np.random.choice(self._num_bandits)
         else:
-            ucb = [0] * num_bandits
+            ucb = [0] * self._num_bandits
             
-            for i in range(num_bandits):
+            for i in range(self._num_bandits):
                 try:
                     tau = int(np.ceil((1 + self.alpha) ** self._plays[i]))
                     if np.log(np.e * total / tau) > 0:
@@ -120,7 +127,7 @@ class UCB2(Epsilon):
         return bandit
 
 
-class UCB1Tuned(Epsilon):
+class UCB1Tuned(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia UCB1-Tuned
@@ -129,6 +136,20 @@ class UCB1Tuned(Epsilon):
     ----------
     bandits : array of Bandit
         Vector con los bandidos con los que se debe jugar
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
     
     Métodos
     -------
@@ -139,6 +160,10 @@ class UCB1Tuned(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -151,49 +176,55 @@ class UCB1Tuned(Epsilon):
     arXiv:1510.00757 (2015).
     """
 
-    def __init__(self, bandits):
-        self._mean2 = [0] * len(bandits)
+    _moments = 2
+    
+    
+    def _forced(self, total):
+        # Únicamente la primera tirada se realiza al azar
+        if total == 0:
+            return np.random.choice(self._num_bandits)
         
-        super(UCB1Tuned, self).__init__(bandits)
+        return None
     
     
-    def update(self, bandit, reward):
-        # Actualización de la media de los cuadrados
-        self._mean2[bandit] = (1 - 1.0/self._plays[bandit]) * self._mean2[bandit] \
-                              + 1.0/self._plays[bandit] * reward ** 2
-            
-            
-    def select(self):
-        total = len(self._rewards)
+    def _width(self, total, active):
+        plays = self._plays[active]
+        log_total = np.log(total)
         
-        if total == 0:
-            bandit = np.random.choice(self._num_bandits)
-        else:
-            ucb = [0] * self._num_bandits
-            
-            for i in range(self._num_bandits):
-                if self._plays[i] == 0:
-                    v = self._mean2[i] - self._mean[i] ** 2 + np.sqrt(2 * np.log(total))
-                else:
-                    v = self._mean2[i] - self._mean[i] ** 2 + np.sqrt(2 * np.log(total) / self._plays[i])
+        # Los bandidos sin tiradas usan el término de una única tirada
+        v = self._stats.variance(active) + np.sqrt(2 * log_total / np.maximum(plays, 1))
         
-                ucb[i] = self._mean[i] + np.sqrt(np.log(total) * np.min([1/4, v]))
-            
-            max_bandits = np.where(ucb == np.max(ucb))[0]
-            bandit = np.random.choice(max_bandits)
-            
-        return bandit
+        return np.sqrt(log_total * np.minimum(1/4, v))
 
 
-class UCBNormal(Epsilon):
+class UCBNormal(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia UCB-Normal
     
+    Los bandidos activos se guardan en un montículo ordenado por tiradas
+    para encontrar sin recorrerlos todos los que no alcanzan el mínimo.
+    De ellos se juega el que menos tiradas tiene y, en caso de empate,
+    el de menor índice.
+    
     Parámetros
     ----------
     bandits : array of Bandit
         Vector con los bandidos con los que se debe jugar
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
     
     Métodos
     -------
@@ -204,6 +235,10 @@ class UCBNormal(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -216,48 +251,105 @@ class UCBNormal(Epsilon):
     arXiv:1510.00757 (2015).
     """
 
-    def __init__(self, bandits):
-        self._rewards2 = [0] * len(bandits)
+    _moments = 2
+    
+    def __init__(self, bandits, elimination=None, period=1000, scale=None, lazy=False, staleness=2):
+        super(UCBNormal, self).__init__(bandits, elimination, period, scale, lazy, staleness)
         
-        super(UCBNormal, self).__init__(bandits)
+        self._build_heap()
         
         
     def update(self, bandit, reward):
-        self._rewards2[bandit] += reward ** 2
-        
+        # Nueva entrada del bandido en el montículo, la anterior queda obsoleta
+        if self._in_heap[bandit]:
+            heapq.heappush(self._heap, (int(self._plays[bandit]), bandit))
+            
+            if len(self._heap) > 4 * self._num_bandits:
+                self._build_heap()
         
-    def select(self):
-        total = len(self._rewards)
         
+    def _forced(self, total):
         # Número de veces mínimo que debe jugar cada bandido
         if total > 0:
-            min_plays = np.ceil(8 * np.log(total))
+            min_plays = math.ceil(8 * math.log(total))
         else:
             min_plays = 1
         
-        # En caso de que algún bandido no jugase el mínimo de veces se selecciona ese
-        if np.any(np.array(self._plays) < min_plays):
-            min_bandit = np.where(np.array(self._plays) < min_plays)[0]
-            bandit = np.random.choice(min_bandit)
-        else:
-            ucb = [0] * self._num_bandits
+        # Las tiradas solamente aumentan, por lo que si todos los bandidos
+        # alcanzaron el mínimo no hace falta revisar hasta que este cambie
+        if min_plays <= self._satisfied:
+            return None
+        
+        # En caso de que algún bandido no jugase el mínimo de veces se
+        # selecciona el que menos ha jugado y, en caso de empate, el de
+        # menor índice, por lo que no se consumen números aleatorios
+        heap = self._heap
+        
+        while True:
+            if not heap:
+                self._build_heap()
+                heap = self._heap
             
-            for i in range(self._num_bandits):
-                if self._plays[i] > 1:
-                    bonus = 16 * (self._rewards2[i] - self._plays[i] * self._mean[i]**2) / (self._plays[i] - 1)
-                    bonus *= np.log(total - 1) / self._plays[i]
-                    bonus = np.sqrt(bonus)
-                    ucb[i] = self._mean[i] + bonus
-                else:
-                    ucb[i] = self._mean[i]
-                    
-            max_bandits = np.where(ucb == np.max(ucb))[0]
-            bandit = np.random.choice(max_bandits)
+            plays, bandit = heap[0]
             
-        return bandit
+            if plays != self._plays[bandit]:
+                heapq.heappop(heap)
+            elif plays < min_plays:
+                return bandit
+            else:
+                break
+        
+        self._satisfied = min_plays
+        
+        return None
+    
+    
+    def _refresh(self):
+        super(UCBNormal, self)._refresh()
+        
+        self._build_heap()
+        
+        
+    def _eliminate(self, total):
+        active = self._active
+        
+        super(UCBNormal, self)._eliminate(total)
+        
+        if not np.array_equal(active, self._active):
+            self._build_heap()
+            
+            
+    def _build_heap(self):
+        # Montículo de mínimos con las tiradas de los bandidos activos. Las
+        # entradas obsoletas se descartan al llegar a la cima
+        active = self._active
+        
+        self._heap = list(zip(self._plays[active].tolist(), active.tolist()))
+        heapq.heapify(self._heap)
+        
+        self._in_heap = np.zeros(self._num_bandits, dtype=bool)
+        self._in_heap[active] = True
+        self._satisfied = 0
+    
+    
+    def _width(self, total, active):
+        plays = self._plays[active]
+        width = np.zeros(len(active))
+        
+        played = plays > 1
+        plays = plays[played]
+        
+        if len(plays) == 0:
+            return width
+        
+        bonus = 16 * self._stats.variance(active[played], ddof=1)
+        bonus *= np.log(total - 1) / plays
+        width[played] = np.sqrt(bonus)
+        
+        return width
 
 
-class UCBV(Epsilon):
+class UCBV(IndexPolicy):
     """
     Agente que soluciona el problema del el Bandido Multibrazo
     (Multi-Armed Bandit) mediante el uso de una estrategia UCBV
@@ -268,6 +360,20 @@ class UCBV(Epsilon):
         Vector con los bandidos con los que se debe jugar
     b : float
         Hiperparámetro para seleccionar el ration de aprendizaje
+    elimination : string
+        Modo de eliminación de bandidos dominados: None, 'permanent' o
+        'periodic'
+    period : integer
+        Número de tiradas tras el que se restauran los bandidos
+        eliminados en el modo 'periodic'
+    scale : float
+        Amplitud del rango de las recompensas con la que se eliminan los
+        bandidos. Si es None se usa la amplitud observada
+    lazy : boolean
+        Recalcula en cada tirada solamente el índice de los bandidos
+        jugados y el resto en una rejilla geométrica de tiradas
+    staleness : float
+        Razón de la rejilla geométrica del modo perezoso
         
     Métodos
     -------
@@ -278,6 +384,10 @@ class UCBV(Epsilon):
         Actualiza los valores adicionales después de una tirada
     select :
         Selecciona un bandido para jugar en la próxima tirada
+    select_slate :
+        Selecciona una lista ordenada de bandidos para la próxima tirada
+    record_slate :
+        Registra la respuesta obtenida con una lista de bandidos
     average_reward :
         Obtención de la recompensa promedio
     plot :
@@ -291,33 +401,19 @@ class UCBV(Epsilon):
     Pages 1876-1902 (https://doi.org/10.1016/j.tcs.2009.01.016)
     """
 
-    def __init__(self, bandits, b=3):
+    _moments = 2
+    
+    def __init__(self, bandits, b=3, elimination=None, period=1000, scale=None, lazy=False, staleness=2):
         self.b = b
         
-        self._mean2 = [0] * len(bandits)
-        
-        super(UCBV, self).__init__(bandits)
-        
-    
-    def update(self, bandit, reward):
-        self._mean2[bandit] += reward**2
+        super(UCBV, self).__init__(bandits, elimination, period, scale, lazy, staleness)
         
         
-    def select(self):
-        num_bandits = len(self.bandits)
-        total = len(self._rewards)
+    def _width(self, total, active):
+        plays = self._plays[active]
+        var = self._stats.variance(active)
         
-        if total < num_bandits:
-            bandit = total
-        else:
-            ucb = [0] * num_bandits
-                
-            for i in range(num_bandits):
-                var = self._mean2[i] / self._plays[i] - self._mean[i]**2
-                ucb[i] = self._mean[i]
-                ucb[i] += np.sqrt(2 * var * np.log(total) / self._plays[i])
-                ucb[i] += self.b * np.log(total) / self._plays[i]             
+        width = np.sqrt(2 * var * np.log(total) / plays)
+        width += self.b * np.log(total) / plays
             
-            max_bandits = np.where(ucb == np.max(ucb))[0]
-            bandit = np.random.choice(max_bandits)
-            
\ No newline at end of file
+        return width
\ No newline at end of file
@@ -65,4 +65,5 @@ class UCBV(Epsilon):
             
             max_bandits = np.where(ucb == np.max(ucb))[0]
             bandit = np.random.choice(max_bandits)
-            
\ No newline at end of file
+            
+        return bandit
\ No newline at end of file
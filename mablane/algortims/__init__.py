@@ -1,5 +1,9 @@
+from ._BoundCache import BoundCache
+from ._ChangeDetection import ChangeDetection, CUSUMUCB, GLRklUCB, MonitoredUCB
 from ._Epsilon import Epsilon
 from ._Exp3 import Exp3
+from ._HOO import HOO
+from ._IndexPolicy import IndexPolicy
 from ._KLUCB import CPUCB, KLUCB
 from ._MOSS import MOSS
 from ._Pursuit import Pursuit
@@ -9,6 +13,6 @@ from ._ThompsonSampling import ThompsonSampling, BayesUCB
 from ._UCB import UCB1, UCB1Tuned, UCB2, UCBNormal, UCBV
 
 
-__all__ = ['CPUCB', 'Epsilon', 'Exp3', 'KLUCB', 'MOSS', 'Pursuit', 'ReinforcementComparison',
-           'Softmax', 'ThompsonSampling', 'BayesUCB', 'UCB1', 'UCB1Tuned', 'UCB2', 'UCBNormal',
-           'UCBV']
\ No newline at end of file
+__all__ = ['BayesUCB', 'BoundCache', 'ChangeDetection', 'CPUCB', 'CUSUMUCB', 'Epsilon', 'Exp3', 'GLRklUCB',
+           'HOO', 'IndexPolicy', 'KLUCB', 'MonitoredUCB', 'MOSS', 'Pursuit', 'ReinforcementComparison',
+           'Softmax', 'ThompsonSampling', 'UCB1', 'UCB1Tuned', 'UCB2', 'UCBNormal', 'UCBV']
@@ -16,7 +16,7 @@ class BinomialBandit:
     Métodos
     -------
     pull :
-        Realiza una tirada en el bandido
+        Realiza una o varias tiradas en el bandido
         
     """
     def __init__(self, probability, number=1):
@@ -26,12 +26,27 @@ class BinomialBandit:
         self.reward = self.number * self.probability
         
         
-    def pull(self):
+    def pull(self, size=None, random_state=None):
         """ Realiza una tirada en el bandido
 
+        Parámetros
+        ----------
+        size : integer
+            Número de tiradas a realizar. Si es None se realiza una
+            única tirada
+        random_state : numpy.random.Generator
+            Generador de números aleatorios. Si es None se usa el
+            generador global de numpy
+
         Retorna
         -------
-        reward: float
-            Recompensa obtenida en la tirada
-        """  
-        return binomial(self.number, self.probability)
\ No newline at end of file
+        reward: float or array of float
+            Recompensa obtenida en la tirada o vector con las
+            recompensas de cada una de las tiradas
+        """
+        if random_state is not None:
+            return random_state.binomial(self.number, self.probability, size)
+        elif size is None:
+            return binomial(self.number, self.probability)
+        else:
+            return binomial(self.number, self.probability, size)
\ No newline at end of file
@@ -0,0 +1,206 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+class EmpiricalBandit:
+    """
+    Implementación de un Bandido Multibrazo (Multi-Armed Bandit) que
+    devuelve recompensas observadas en lugar de generarlas con una
+    distribución paramétrica
+
+    Las recompensas se toman, con o sin reemplazo, de una bolsa de
+    valores guardada en un fichero NPY que se abre mapeado en memoria,
+    por lo que solamente se leen del disco los valores extraídos y
+    varios procesos comparten las mismas páginas sin copiarlas. Las
+    bolsas de varios bandidos pueden ser tramos de un mismo fichero. Al
+    serializar el bandido se guarda la ruta y no los datos.
+
+    Sin reemplazo se recorre una permutación aleatoria de la bolsa y,
+    al agotarla, se genera una nueva.
+
+    Parámetros
+    ----------
+    source : string or array of float
+        Ruta a un fichero NPY o vector con las recompensas
+    start : integer
+        Primera posición de la bolsa del bandido
+    stop : integer
+        Posición siguiente a la última de la bolsa. Si es None hasta el
+        final
+    replace : boolean
+        Indica si las recompensas se toman con reemplazo
+
+    Métodos
+    -------
+    pull :
+        Realiza una o varias tiradas en el bandido
+    from_pools :
+        Crea los bandidos de varias bolsas consecutivas de un fichero
+    digest :
+        Resumen SHA-256 de las recompensas de la bolsa
+    """
+    def __init__(self, source, start=0, stop=None, replace=True):
+        self.source = source
+        self.start = start
+        self.stop = stop
+        self.replace = replace
+
+        self._open()
+
+        self._order = None
+        self._position = 0
+        self._reward = None
+        self._digest = None
+
+
+    @classmethod
+    def from_pools(cls, source, sizes, replace=True):
+        """ Crea un bandido por cada tramo consecutivo de un fichero
+
+        Parámetros
+        ----------
+        source : string or array of float
+            Ruta a un fichero NPY o vector con las bolsas de todos los
+            bandidos, una tras otra
+        sizes : array of integer
+            Número de recompensas de la bolsa de cada bandido
+        replace : boolean
+            Indica si las recompensas se toman con reemplazo
+
+        Retorna
+        -------
+        bandits: list of EmpiricalBandit
+            Bandidos que comparten el mismo fichero
+        """
+        bounds = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+
+        return [cls(source, start, stop, replace) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+    @property
+    def reward(self):
+        # La media se calcula por bloques la primera vez que se necesita
+        if self._reward is None:
+            total = 0.0
+
+            for block in range(0, len(self._pool), 1 << 20):
+                total += float(np.sum(self._pool[block:block + (1 << 20)], dtype=float))
+
+            self._reward = total / len(self._pool)
+
+        return self._reward
+
+
+    @property
+    def digest(self):
+        # Si el fichero ha cambiado desde el último cálculo se vuelve a
+        # abrir y se recalcula el resumen
+        version = self._version()
+
+        if self._digest is not None and self._digest[0] != version:
+            self._open()
+            self._order = None
+            self._reward = None
+
+        if self._digest is None or self._digest[0] != version:
+            digest = hashlib.sha256(str(self._pool.dtype).encode())
+
+            for block in range(0, len(self._pool), 1 << 20):
+                digest.update(np.ascontiguousarray(self._pool[block:block + (1 << 20)]).tobytes())
+
+            self._digest = (version, digest.hexdigest())
+
+        return self._digest[1]
+
+
+    def pull(self, size=None, random_state=None):
+        """ Realiza una tirada en el bandido
+
+        Parámetros
+        ----------
+        size : integer
+            Número de tiradas a realizar. Si es None se realiza una
+            única tirada
+        random_state : numpy.random.Generator
+            Generador de números aleatorios. Si es None se usa el
+            generador global de numpy
+
+        Retorna
+        -------
+        reward: float or array of float
+            Recompensa obtenida en la tirada o vector con las
+            recompensas de cada una de las tiradas
+        """
+        count = 1 if size is None else size
+
+        if self.replace:
+            if random_state is None:
+                index = np.random.randint(0, len(self._pool), count)
+            else:
+                index = random_state.integers(0, len(self._pool), count)
+        else:
+            index = self._without_replacement(count, random_state)
+
+        rewards = np.asarray(self._pool[index], dtype=float)
+
+        return rewards[0] if size is None else rewards
+
+
+    def _without_replacement(self, count, random_state):
+        parts = []
+
+        while count > 0:
+            if self._order is None or self._position == len(self._order):
+                if random_state is None:
+                    self._order = np.random.permutation(len(self._pool))
+                else:
+                    self._order = random_state.permutation(len(self._pool))
+
+                self._position = 0
+
+            taken = self._order[self._position:self._position + count]
+            self._position += len(taken)
+            count -= len(taken)
+            parts.append(taken)
+
+        return np.concatenate(parts)
+
+
+    def _open(self):
+        if isinstance(self.source, (str, os.PathLike)):
+            data = np.load(self.source, mmap_mode='r')
+        else:
+            data = np.asarray(self.source)
+
+        self._pool = data[self.start:self.stop]
+
+        if len(self._pool) == 0:
+            raise ValueError('The reward pool is empty')
+
+
+    def _version(self):
+        if isinstance(self.source, (str, os.PathLike)):
+            status = os.stat(self.source)
+            return status.st_size, status.st_mtime_ns
+
+        return None
+
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Con un fichero solamente se guarda la ruta, que se vuelve a
+        # mapear al restaurar el bandido
+        if isinstance(self.source, (str, os.PathLike)):
+            del state['_pool']
+
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        if '_pool' not in state:
+            self._open()
@@ -0,0 +1,212 @@
+import numpy as np
+
+
+class Clock:
+    """
+    Contador de rondas compartido por varios bandidos no estacionarios
+
+    Parámetros
+    ----------
+    step : integer
+        Ronda actual
+
+    Métodos
+    -------
+    advance :
+        Avanza el contador varias rondas
+    reset :
+        Vuelve a la primera ronda
+    """
+    def __init__(self, step=0):
+        self.step = step
+
+
+    def advance(self, rounds=1):
+        self.step += rounds
+
+
+    def reset(self):
+        self.step = 0
+
+
+class NonStationaryBandit:
+    """
+    Base de los bandidos binomiales cuya probabilidad de recompensa
+    cambia con el tiempo
+
+    La probabilidad de cada tirada se obtiene con probability_at a
+    partir de la ronda de un reloj, por lo que un bloque de tiradas se
+    genera con una única llamada vectorizada y varios bloques seguidos
+    equivalen a uno solo. Los cambios dependen de las rondas jugadas y
+    no de las tiradas de cada bandido: el run de los agentes avanza
+    todos los relojes una ronda por tirada y reward_tape una ronda por
+    fila de la cinta. Sin un reloj común cada bandido usa el suyo, que
+    fuera de los agentes solo avanza con sus propias tiradas, por lo
+    que los bandidos que se juegan directamente deben compartir un
+    Clock.
+
+    Parámetros
+    ----------
+    number: integer
+        Número de recompensas que puede devolver el agente
+    clock: Clock
+        Reloj compartido con el resto de bandidos del entorno
+
+    Métodos
+    -------
+    pull :
+        Realiza una o varias tiradas en el bandido
+    probability_at :
+        Obtención de la probabilidad de recompensa en varias tiradas
+    reset :
+        Vuelve a la primera tirada
+    """
+    def __init__(self, number=1, clock=None):
+        self.number = number
+
+        self._clock = Clock() if clock is None else clock
+
+
+    @property
+    def clock(self):
+        return self._clock
+
+
+    @property
+    def step(self):
+        return self._clock.step
+
+
+    @property
+    def probability(self):
+        return float(self.probability_at(np.array([self.step]))[0])
+
+
+    @property
+    def reward(self):
+        return self.number * self.probability
+
+
+    def pull(self, size=None, random_state=None):
+        """ Realiza una o varias tiradas consecutivas en el bandido
+
+        Parámetros
+        ----------
+        size : integer
+            Número de tiradas a realizar. Si es None se realiza una
+            única tirada
+        random_state : numpy.random.Generator
+            Generador de números aleatorios. Si es None se usa el
+            generador global de numpy
+
+        Retorna
+        -------
+        reward: float or array of float
+            Recompensa obtenida en la tirada o vector con las
+            recompensas de cada una de las tiradas
+        """
+        steps = self.step + np.arange(1 if size is None else size)
+        self._clock.advance(len(steps))
+
+        generator = np.random if random_state is None else random_state
+        rewards = generator.binomial(self.number, self.probability_at(steps))
+
+        return rewards[0] if size is None else rewards
+
+
+    def probability_at(self, steps):
+        raise NotImplementedError
+
+
+    def reset(self):
+        self._clock.reset()
+
+
+class PiecewiseBinomialBandit(NonStationaryBandit):
+    """
+    Bandido binomial con cambios abruptos de la probabilidad de
+    recompensa
+
+    Parámetros
+    ----------
+    probabilities : array of float
+        Probabilidad de recompensa en cada uno de los tramos
+    change_points : array of integer
+        Tirada en la que comienza cada tramo a partir del segundo
+    number: integer
+        Número de recompensas que puede devolver el agente
+    clock: Clock
+        Reloj compartido con el resto de bandidos del entorno
+
+    Métodos
+    -------
+    pull :
+        Realiza una o varias tiradas en el bandido
+    probability_at :
+        Obtención de la probabilidad de recompensa en varias tiradas
+    reset :
+        Vuelve a la primera tirada
+    """
+    def __init__(self, probabilities, change_points, number=1, clock=None):
+        if len(change_points) != len(probabilities) - 1:
+            raise ValueError('There must be one change point less than probabilities')
+
+        self.probabilities = np.asarray(probabilities, dtype=float)
+        self.change_points = np.asarray(change_points)
+
+        super(PiecewiseBinomialBandit, self).__init__(number, clock)
+
+
+    def probability_at(self, steps):
+        return self.probabilities[np.searchsorted(self.change_points, steps, side='right')]
+
+
+class DriftingBinomialBandit(NonStationaryBandit):
+    """
+    Bandido binomial con cambios graduales de la probabilidad de
+    recompensa
+
+    La probabilidad varía de forma lineal entre start y end durante
+    horizon tiradas y se mantiene después o, si es periódica, oscila de
+    forma sinusoidal entre ambos valores con periodo horizon
+
+    Parámetros
+    ----------
+    start : float
+        Probabilidad de recompensa inicial
+    end : float
+        Probabilidad de recompensa final, o en el medio del periodo
+    horizon : integer
+        Número de tiradas de la deriva o del periodo
+    periodic : boolean
+        Indica si la deriva es periódica
+    number: integer
+        Número de recompensas que puede devolver el agente
+    clock: Clock
+        Reloj compartido con el resto de bandidos del entorno
+
+    Métodos
+    -------
+    pull :
+        Realiza una o varias tiradas en el bandido
+    probability_at :
+        Obtención de la probabilidad de recompensa en varias tiradas
+    reset :
+        Vuelve a la primera tirada
+    """
+    def __init__(self, start, end, horizon, periodic=False, number=1, clock=None):
+        self.start = start
+        self.end = end
+        self.horizon = horizon
+        self.periodic = periodic
+
+        super(DriftingBinomialBandit, self).__init__(number, clock)
+
+
+    def probability_at(self, steps):
+        if self.periodic:
+            weight = (1 - np.cos(2 * np.pi * np.asarray(steps) / self.horizon)) / 2
+        else:
+            weight = np.minimum(np.asarray(steps) / self.horizon, 1)
+
+        return self.start + (self.end - self.start) * weight
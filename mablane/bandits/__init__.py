@@ -1,4 +1,8 @@
 from ._BinomialBandit import BinomialBandit
+from ._EmpiricalBandit import EmpiricalBandit
 from ._NegativeBinomialBandit import NegativeBinomialBandit
+from ._NonStationaryBandit import Clock, DriftingBinomialBandit, NonStationaryBandit, PiecewiseBinomialBandit
+from ._tape import reward_tape
 
-__all__ = ['BinomialBandit', 'NegativeBinomialBandit']
\ No newline at end of file
+__all__ = ['BinomialBandit', 'Clock', 'DriftingBinomialBandit', 'EmpiricalBandit', 'NegativeBinomialBandit',
+           'NonStationaryBandit', 'PiecewiseBinomialBandit', 'reward_tape']
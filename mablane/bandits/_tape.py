@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def reward_tape(bandits, steps, random_state=None, out=None):
+    """ Genera una cinta de recompensas
+
+    La cinta contiene la recompensa que devolvería cada uno de los
+    bandidos en cada una de las tiradas, por lo que diferentes agentes
+    pueden jugar con los mismos resultados. Los bandidos con un reloj
+    compartido avanzan juntos una ronda por fila.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    steps : integer
+        Número de tiradas de la cinta
+    random_state : numpy.random.Generator or integer
+        Generador de números aleatorios o semilla con la que crearlo. Si
+        es None se usa el generador global de numpy
+    out : array of float
+        Matriz (steps, bandidos) en la que se escriben las recompensas,
+        por ejemplo un fichero mapeado en memoria
+
+    Retorna
+    -------
+    tape: array of float
+        Matriz (steps, bandidos) con las recompensas
+    """
+    if random_state is not None and not isinstance(random_state, np.random.Generator):
+        random_state = np.random.default_rng(random_state)
+
+    if out is None:
+        out = np.empty((steps, len(bandits)))
+
+    # Ronda inicial de cada reloj compartido, para que todos los bandidos
+    # que lo usan tiren en las mismas rondas y el reloj avance una vez
+    starts = {}
+
+    for i, bandit in enumerate(bandits):
+        clock = getattr(bandit, 'clock', None)
+
+        if clock is not None:
+            clock.step = starts.setdefault(id(clock), clock.step)
+
+        out[:, i] = bandit.pull(steps, random_state=random_state)
+
+    return out
@@ -0,0 +1,153 @@
+import numpy as np
+
+from .._utils import argmax_random
+from ._LinUCB import LinUCB
+
+
+class HybridLinUCB(LinUCB):
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    Contextual (Contextual Multi-Armed Bandit) mediante el uso de una
+    estrategia LinUCB con modelos lineales híbridos
+
+    Además de los coeficientes propios de cada bandido se estiman unos
+    coeficientes compartidos para las características comunes. Las
+    matrices de diseño de los bandidos se guardan como su inversa y se
+    actualizan con la fórmula de Sherman-Morrison. La matriz compartida
+    recibe una actualización de rango mayor que uno, por lo que su
+    inversa se recalcula, pero solamente tiene el tamaño de las
+    características compartidas.
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se debe jugar
+    dimension : integer
+        Número de características del contexto de cada bandido
+    shared_dimension : integer
+        Número de características compartidas. Si no se indica se
+        utilizan las mismas que en el contexto
+    alpha : float
+        Parámetro con el que se controla la amplitud del intervalo de
+        confianza
+    regularization : float
+        Valor de la diagonal con la que se inicializan las matrices de
+        diseño
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas a partir de una matriz de contextos
+        y recompensas
+    update:
+        Actualiza los modelos de los bandidos jugados
+    select :
+        Selecciona un bandido para cada uno de los contextos
+    scores :
+        Obtención del índice de todos los bandidos para un lote de
+        contextos
+    average_reward :
+        Obtención de la recompensa promedio
+
+    References
+    ----------
+    Lihong Li, Wei Chu, John Langford, and Robert E. Schapire. "A
+    Contextual-Bandit Approach to Personalized News Article
+    Recommendation." Proceedings of the 19th International Conference on
+    World Wide Web (2010).
+    """
+
+    def __init__(self, num_bandits, dimension, shared_dimension=None, alpha=1.0,
+                 regularization=1.0):
+        if shared_dimension is None:
+            shared_dimension = dimension
+
+        self.shared_dimension = shared_dimension
+
+        super(HybridLinUCB, self).__init__(num_bandits, dimension, alpha, regularization)
+
+        # Estadísticos de los coeficientes compartidos
+        self._shared_inverse = np.eye(shared_dimension) / regularization
+        self._shared_b = np.zeros(shared_dimension)
+        self._B = np.zeros((num_bandits, dimension, shared_dimension))
+
+
+    def run(self, contexts, rewards, shared=None, batch_size=1):
+        contexts = np.atleast_2d(contexts)
+        rewards = np.atleast_2d(rewards)
+        shared = contexts if shared is None else np.atleast_2d(shared)
+
+        for start in range(0, len(contexts), batch_size):
+            batch = contexts[start:start + batch_size]
+            shared_batch = shared[start:start + batch_size]
+
+            bandits = self.select(batch, shared_batch)
+            reward = rewards[start:start + batch_size][np.arange(len(batch)), bandits]
+
+            self._rewards.extend(reward.tolist())
+            self.update(bandits, batch, reward, shared_batch)
+
+        return self.average_reward()
+
+
+    def update(self, bandits, contexts, rewards, shared=None):
+        bandits = np.atleast_1d(bandits)
+        contexts = np.atleast_2d(contexts)
+        rewards = np.atleast_1d(rewards)
+        shared = contexts if shared is None else np.atleast_2d(shared)
+
+        shared_matrix = np.linalg.inv(self._shared_inverse)
+
+        for bandit, x, z, reward in zip(bandits, contexts, shared, rewards):
+            self._plays[bandit] += 1
+
+            # Se retira la contribución anterior del bandido
+            BA = self._B[bandit].T @ self._inverse[bandit]
+            shared_matrix += BA @ self._B[bandit]
+            self._shared_b += BA @ self._b[bandit]
+
+            # Actualización de rango uno de la inversa (Sherman-Morrison)
+            inverse_x = self._inverse[bandit] @ x
+            self._inverse[bandit] -= np.outer(inverse_x, inverse_x) / (1 + x @ inverse_x)
+            self._B[bandit] += np.outer(x, z)
+            self._b[bandit] += reward * x
+
+            # Se agrega la nueva contribución del bandido
+            BA = self._B[bandit].T @ self._inverse[bandit]
+            shared_matrix += np.outer(z, z) - BA @ self._B[bandit]
+            self._shared_b += reward * z - BA @ self._b[bandit]
+
+        self._shared_inverse = np.linalg.inv(shared_matrix)
+
+
+    def scores(self, contexts, shared=None):
+        contexts = np.atleast_2d(contexts)
+        shared = contexts if shared is None else np.atleast_2d(shared)
+
+        beta = self._shared_inverse @ self._shared_b
+        theta = np.matmul(self._inverse, (self._b - self._B @ beta)[:, :, np.newaxis])[:, :, 0]
+
+        # Términos de la varianza calculados en lote: (K, n, ...)
+        inverse_x = np.matmul(contexts[np.newaxis], self._inverse)
+        BAx = np.matmul(inverse_x, self._B)
+        CBAx = BAx @ self._shared_inverse
+
+        variance = np.einsum('ij,jk,ik->i', shared, self._shared_inverse, shared)[np.newaxis]
+        variance = variance - 2 * np.sum(CBAx * shared[np.newaxis], axis=2)
+        variance = variance + np.sum(inverse_x * contexts[np.newaxis], axis=2)
+        variance = variance + np.sum(CBAx * BAx, axis=2)
+
+        mean = (shared @ beta)[:, np.newaxis] + contexts @ theta.T
+
+        return mean + self.alpha * np.sqrt(np.maximum(variance.T, 0))
+
+
+    def select(self, contexts, shared=None):
+        contexts = np.asarray(contexts, dtype=float)
+        scores = self.scores(contexts, shared)
+        bandits = argmax_random(scores, axis=1)
+
+        if contexts.ndim == 1:
+            return bandits[0]
+
+        return bandits
@@ -0,0 +1,214 @@
+import numpy as np
+
+from .._utils import argmax_random
+
+
+class LinUCB:
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    Contextual (Contextual Multi-Armed Bandit) mediante el uso de una
+    estrategia LinUCB con modelos lineales disjuntos
+
+    Las matrices de diseño de cada uno de los bandidos se guardan como
+    su inversa, la cual se actualiza en cada tirada mediante la fórmula
+    de Sherman-Morrison, por lo que el coste de una actualización es
+    cuadrático en la dimensión del contexto en lugar de cúbico.
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se debe jugar
+    dimension : integer
+        Número de características del contexto
+    alpha : float
+        Parámetro con el que se controla la amplitud del intervalo de
+        confianza
+    regularization : float
+        Valor de la diagonal con la que se inicializan las matrices de
+        diseño
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas a partir de una matriz de contextos
+        y recompensas
+    update:
+        Actualiza los modelos de los bandidos jugados
+    select :
+        Selecciona un bandido para cada uno de los contextos
+    scores :
+        Obtención del índice de todos los bandidos para un lote de
+        contextos
+    average_reward :
+        Obtención de la recompensa promedio
+
+    References
+    ----------
+    Lihong Li, Wei Chu, John Langford, and Robert E. Schapire. "A
+    Contextual-Bandit Approach to Personalized News Article
+    Recommendation." Proceedings of the 19th International Conference on
+    World Wide Web (2010).
+    """
+
+    def __init__(self, num_bandits, dimension, alpha=1.0, regularization=1.0):
+        self.num_bandits = num_bandits
+        self.dimension = dimension
+        self.alpha = alpha
+        self.regularization = regularization
+
+        self._rewards = []
+        self._plays = np.zeros(num_bandits, dtype=int)
+
+        # Inversa de la matriz de diseño, vector de respuesta y coeficientes
+        self._inverse = np.tile(np.eye(dimension) / regularization, (num_bandits, 1, 1))
+        self._b = np.zeros((num_bandits, dimension))
+        self._theta = np.zeros((num_bandits, dimension))
+
+
+    def run(self, contexts, rewards, batch_size=1):
+        """ Realiza una tirada por cada contexto
+
+        Parámetros
+        ----------
+        contexts : array of float
+            Matriz (n, dimension) con los contextos de cada tirada
+        rewards : array of float
+            Matriz (n, num_bandits) con la recompensa que se obtendría
+            con cada uno de los bandidos
+        batch_size : integer
+            Número de contextos que se seleccionan con el mismo modelo
+            antes de actualizarlo
+
+        Retorna
+        -------
+        average: float
+            Recompensa promedio
+        """
+        contexts = np.atleast_2d(contexts)
+        rewards = np.atleast_2d(rewards)
+
+        for start in range(0, len(contexts), batch_size):
+            batch = contexts[start:start + batch_size]
+
+            # Selección de los bandidos para todo el lote
+            bandits = self.select(batch)
+            reward = rewards[start:start + batch_size][np.arange(len(batch)), bandits]
+
+            self._rewards.extend(reward.tolist())
+            self.update(bandits, batch, reward)
+
+        return self.average_reward()
+
+
+    def update(self, bandits, contexts, rewards):
+        bandits = np.atleast_1d(bandits)
+        contexts = np.atleast_2d(contexts)
+        rewards = np.atleast_1d(rewards)
+
+        for bandit, x, reward in zip(bandits, contexts, rewards):
+            self._plays[bandit] += 1
+
+            # Actualización de rango uno de la inversa (Sherman-Morrison)
+            inverse_x = self._inverse[bandit] @ x
+            self._inverse[bandit] -= np.outer(inverse_x, inverse_x) / (1 + x @ inverse_x)
+
+            self._b[bandit] += reward * x
+            self._theta[bandit] = self._inverse[bandit] @ self._b[bandit]
+
+
+    def scores(self, contexts):
+        """ Calcula el índice de todos los bandidos para un lote
+
+        Parámetros
+        ----------
+        contexts : array of float
+            Matriz (n, dimension) con los contextos
+
+        Retorna
+        -------
+        scores: array of float
+            Matriz (n, num_bandits) con el índice de cada bandido
+        """
+        contexts = np.atleast_2d(contexts)
+
+        return contexts @ self._theta.T + self.alpha * self._width(contexts)
+
+
+    def select(self, contexts):
+        contexts = np.asarray(contexts, dtype=float)
+        bandits = argmax_random(self.scores(contexts), axis=1)
+
+        if contexts.ndim == 1:
+            return bandits[0]
+
+        return bandits
+
+
+    def average_reward(self):
+        return np.mean(self._rewards)
+
+
+    def _width(self, contexts):
+        # Producto matricial por lotes: (1, n, d) @ (K, d, d) -> (K, n, d)
+        inverse_x = np.matmul(contexts[np.newaxis], self._inverse)
+        variance = np.sum(inverse_x * contexts[np.newaxis], axis=2).T
+
+        return np.sqrt(np.maximum(variance, 0))
+
+
+class LinTS(LinUCB):
+    """
+    Agente que soluciona el problema del el Bandido Multibrazo
+    Contextual (Contextual Multi-Armed Bandit) mediante el uso del
+    Muestreo de Thompson con modelos lineales
+
+    Para cada contexto la predicción de un bandido con los coeficientes
+    muestreados sigue una distribución normal, por lo que se muestrea
+    directamente esta sin necesidad de factorizar las matrices de
+    covarianza.
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se debe jugar
+    dimension : integer
+        Número de características del contexto
+    v : float
+        Escala de la varianza de la distribución a posteriori
+    regularization : float
+        Valor de la diagonal con la que se inicializan las matrices de
+        diseño
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas a partir de una matriz de contextos
+        y recompensas
+    update:
+        Actualiza los modelos de los bandidos jugados
+    select :
+        Selecciona un bandido para cada uno de los contextos
+    scores :
+        Obtención de una muestra del valor de todos los bandidos para un
+        lote de contextos
+    average_reward :
+        Obtención de la recompensa promedio
+
+    References
+    ----------
+    Shipra Agrawal and Navin Goyal. "Thompson Sampling for Contextual
+    Bandits with Linear Payoffs." Proceedings of the 30th International
+    Conference on Machine Learning, PMLR 28(3):127-135, 2013.
+    """
+
+    def __init__(self, num_bandits, dimension, v=1.0, regularization=1.0):
+        self.v = v
+
+        super(LinTS, self).__init__(num_bandits, dimension, regularization=regularization)
+
+
+    def scores(self, contexts):
+        contexts = np.atleast_2d(contexts)
+        noise = np.random.standard_normal((len(contexts), self.num_bandits))
+
+        return contexts @ self._theta.T + self.v * self._width(contexts) * noise
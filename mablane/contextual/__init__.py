@@ -0,0 +1,4 @@
+from ._HybridLinUCB import HybridLinUCB
+from ._LinUCB import LinUCB, LinTS
+
+__all__ = ['HybridLinUCB', 'LinTS', 'LinUCB']
@@ -0,0 +1,4 @@
+from ._fused import KERNELS, run_fused
+from ._numba import HAS_NUMBA
+
+__all__ = ['HAS_NUMBA', 'KERNELS', 'run_fused']
@@ -0,0 +1,168 @@
+from functools import reduce
+
+import numpy as np
+
+from ..algortims import (BayesUCB, Epsilon, Exp3, KLUCB, MOSS, Pursuit, ReinforcementComparison,
+                         Softmax, ThompsonSampling, UCB1, UCB1Tuned, UCBNormal, UCBV)
+from ..bandits import reward_tape
+from . import _kernels
+from ._numba import HAS_NUMBA
+
+
+# Núcleo, valores adicionales por bandido y parámetros escalares de cada
+# algoritmo. Los parámetros que cambian durante la simulación se indican
+# en el último elemento para devolverlos al agente. Los nombres pueden
+# hacer referencia a atributos de atributos separados por puntos.
+KERNELS = {
+    Epsilon: (_kernels.epsilon, [], ['_epsilon', 'decay'], ['_epsilon']),
+    UCB1: (_kernels.ucb1, [], [], []),
+    UCB1Tuned: (_kernels.ucb1_tuned, ['_stats.m2'], [], []),
+    UCBNormal: (_kernels.ucb_normal, ['_stats.m2'], [], []),
+    UCBV: (_kernels.ucbv, ['_stats.m2'], ['b'], []),
+    MOSS: (_kernels.moss, [], [], []),
+    KLUCB: (_kernels.klucb, [], ['n', 'c'], []),
+    Exp3: (_kernels.exp3, ['_weights'], ['gamma'], []),
+    Softmax: (_kernels.softmax, [], ['tau'], []),
+    Pursuit: (_kernels.pursuit, ['_p'], ['beta'], []),
+    ReinforcementComparison: (_kernels.reinforcement_comparison, ['_pi', '_r'], ['alpha', 'beta'], []),
+    ThompsonSampling: (_kernels.thompson_sampling, ['_alpha', '_beta'], ['N'], []),
+    BayesUCB: (_kernels.bayes_ucb, ['_alpha', '_beta'], ['N', 'gamma'], []),
+}
+
+
+def run_fused(agent, episodes=None, tape=None, chunksize=65536, random_state=None, seed=None, out=None):
+    """ Realiza una serie de tiradas con un núcleo compilado
+
+    El bucle completo de selección, tirada y actualización se ejecuta en
+    un núcleo compilado con numba sobre el estado del agente convertido
+    a vectores y sobre una cinta de recompensas generada previamente.
+    Al terminar el estado se devuelve al agente, por lo que este se
+    puede seguir usando como si se hubiese llamado a run. Si numba no
+    está instalado, o el algoritmo no dispone de núcleo, las tiradas se
+    realizan con los métodos select y record del agente leyendo las
+    recompensas de la misma cinta.
+
+    Parámetros
+    ----------
+    agent : Epsilon
+        Agente con el que se juega
+    episodes : integer
+        Número de tiradas. Si no se indica se usan todas las de la cinta
+    tape : array of float
+        Matriz (tiradas, bandidos) con las recompensas de cada bandido.
+        Si es None se genera por bloques a partir de agent.bandits
+    chunksize : integer
+        Número de tiradas de cada uno de los bloques de la cinta
+    random_state : numpy.random.Generator or integer
+        Generador o semilla con la que se genera la cinta
+    seed : integer
+        Semilla del generador usado por el agente para los empates y
+        las selecciones aleatorias. Si es None el generador continúa
+        desde su estado actual, por lo que varias llamadas seguidas
+        equivalen a una única llamada con todas las tiradas
+    out : array of integer
+        Vector en el que se escribe el bandido jugado en cada tirada
+
+    Retorna
+    -------
+    average: float
+        Recompensa promedio del agente
+    """
+    if tape is None:
+        if episodes is None:
+            raise ValueError('Either episodes or tape must be given')
+
+        if random_state is not None and not isinstance(random_state, np.random.Generator):
+            random_state = np.random.default_rng(random_state)
+
+        chunks = _generated_chunks(agent.bandits, episodes, chunksize, random_state)
+    else:
+        if episodes is None:
+            episodes = len(tape)
+
+        chunks = (tape[start:min(start + chunksize, episodes)]
+                  for start in range(0, episodes, chunksize))
+
+    spec = KERNELS.get(type(agent))
+
+    # Los núcleos no implementan la eliminación de bandidos ni el modo
+    # perezoso de cálculo de los índices
+    if getattr(agent, 'elimination', None) is not None or getattr(agent, 'lazy', False):
+        spec = None
+
+    if HAS_NUMBA and spec is not None:
+        _run_kernel(agent, spec, chunks, seed, out)
+    else:
+        if seed is not None:
+            np.random.seed(seed)
+
+        step = 0
+
+        for chunk in chunks:
+            for row in np.asarray(chunk):
+                bandit = agent.select()
+                agent.record(bandit, row[bandit])
+
+                if out is not None:
+                    out[step] = bandit
+
+                step += 1
+
+    return agent.average_reward()
+
+
+def _generated_chunks(bandits, episodes, chunksize, random_state):
+    for start in range(0, episodes, chunksize):
+        yield reward_tape(bandits, min(chunksize, episodes - start), random_state)
+
+
+def _run_kernel(agent, spec, chunks, seed, out=None):
+    kernel, extra_names, param_names, state_names = spec
+
+    plays = np.array(agent._plays, dtype=float)
+    mean = np.array(agent._mean, dtype=float)
+    extra = np.array([_attribute(agent, name) for name in extra_names], dtype=float).reshape(-1, len(plays))
+    params = np.array([getattr(agent, name) for name in param_names], dtype=float)
+    total = len(agent._rewards)
+
+    if seed is not None:
+        _kernels.seed(seed)
+
+    step = 0
+
+    for chunk in chunks:
+        chunk = np.ascontiguousarray(chunk, dtype=float)
+        rewards = np.empty(len(chunk))
+        bandits = np.empty(len(chunk), dtype=np.int64)
+
+        total = kernel(chunk, total, plays, mean, extra, params, rewards, bandits)
+        agent._rewards.extend(rewards.tolist())
+
+        if out is not None:
+            out[step:step + len(chunk)] = bandits
+
+        step += len(chunk)
+
+    # Devolución del estado al agente
+    _store(agent, '_plays', plays.astype(int))
+    _store(agent, '_mean', mean)
+
+    for name, values in zip(extra_names, extra):
+        _store(agent, name, values)
+
+    for name in state_names:
+        setattr(agent, name, params[param_names.index(name)])
+
+    # Valores derivados de los estadísticos, como el montículo de UCBNormal
+    agent._refresh()
+
+
+def _attribute(agent, name):
+    return reduce(getattr, name.split('.'), agent)
+
+
+def _store(agent, name, values):
+    if isinstance(_attribute(agent, name), list):
+        setattr(agent, name, values.tolist())
+    else:
+        _attribute(agent, name)[:] = values
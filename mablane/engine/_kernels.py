@@ -0,0 +1,418 @@
+"""
+Núcleos fusionados de los algoritmos del paquete
+
+Cada núcleo realiza en un único bucle compilado la selección del
+bandido, la lectura de la recompensa de la cinta, la actualización de la
+media y la del resto de valores del algoritmo. Todos comparten la misma
+firma:
+
+    kernel(tape, total, plays, mean, extra, params, rewards, bandits)
+
+donde extra es una matriz con los valores adicionales de cada bandido y
+params un vector con los hiperparámetros y los valores escalares del
+algoritmo. Los núcleos modifican los vectores de estado en el sitio y
+devuelven el número total de tiradas.
+"""
+
+import numpy as np
+
+from ._numba import njit
+
+
+@njit(cache=True)
+def seed(value):
+    np.random.seed(value)
+
+
+@njit(cache=True)
+def _argmax(values):
+    # Máximo con los empates resueltos como np.random.choice sobre los
+    # bandidos empatados, con un único número aleatorio
+    best = values[0]
+    ties = 1
+
+    for i in range(1, values.shape[0]):
+        if values[i] > best:
+            best = values[i]
+            ties = 1
+        elif values[i] == best:
+            ties += 1
+
+    k = np.random.randint(ties)
+
+    for i in range(values.shape[0]):
+        if values[i] == best:
+            if k == 0:
+                return i
+            k -= 1
+
+    return 0
+
+
+@njit(cache=True)
+def _choice(prob):
+    # Selección a partir de la función de distribución acumulada
+    cumulative = np.cumsum(prob)
+    u = np.random.random() * cumulative[-1]
+
+    for i in range(cumulative.shape[0]):
+        if cumulative[i] > u:
+            return i
+
+    return cumulative.shape[0] - 1
+
+
+@njit(cache=True)
+def _record(plays, mean, bandit, reward):
+    plays[bandit] += 1
+    mean[bandit] += (reward - mean[bandit]) / plays[bandit]
+
+
+@njit(cache=True)
+def _record2(plays, mean, m2, bandit, reward):
+    # Actualización de Welford de la media y de la suma de cuadrados de
+    # las desviaciones, igual que en SufficientStatistics
+    plays[bandit] += 1
+    delta = reward - mean[bandit]
+    mean[bandit] += delta / plays[bandit]
+    m2[bandit] += delta * (reward - mean[bandit])
+
+
+@njit(cache=True)
+def _kl_bin(p, q, n, eps):
+    p = min(max(p, eps), 1 - eps)
+    q = min(max(q, eps), 1 - eps)
+
+    return n * (p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q)))
+
+
+@njit(cache=True)
+def epsilon(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+
+    for t in range(tape.shape[0]):
+        if np.random.random() < params[0]:
+            bandit = np.random.randint(num_bandits)
+        else:
+            bandit = _argmax(mean)
+
+        params[0] *= params[1]
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def ucb1(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    ucb = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total < num_bandits:
+            bandit = total
+        else:
+            log_total = np.log(total)
+
+            for i in range(num_bandits):
+                ucb[i] = mean[i] + np.sqrt(2 * log_total / plays[i])
+
+            bandit = _argmax(ucb)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def ucb1_tuned(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    m2 = extra[0]
+    ucb = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total == 0:
+            bandit = np.random.randint(num_bandits)
+        else:
+            log_total = np.log(total)
+
+            for i in range(num_bandits):
+                if plays[i] == 0:
+                    v = np.sqrt(2 * log_total)
+                else:
+                    v = m2[i] / plays[i] + np.sqrt(2 * log_total / plays[i])
+
+                ucb[i] = mean[i] + np.sqrt(log_total * min(1 / 4, v))
+
+            bandit = _argmax(ucb)
+
+        reward = tape[t, bandit]
+        _record2(plays, mean, m2, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def ucb_normal(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    m2 = extra[0]
+    ucb = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total > 0:
+            min_plays = np.ceil(8 * np.log(total))
+        else:
+            min_plays = 1
+
+        # Selección del bandido con menos tiradas si no alcanza el mínimo,
+        # con los empates a favor del de menor índice como en el agente
+        bandit = -1
+        for i in range(num_bandits):
+            if plays[i] < min_plays and (bandit < 0 or plays[i] < plays[bandit]):
+                bandit = i
+
+        if bandit < 0:
+            for i in range(num_bandits):
+                if plays[i] > 1:
+                    bonus = 16 * m2[i] / (plays[i] - 1)
+                    bonus *= np.log(total - 1) / plays[i]
+                    ucb[i] = mean[i] + np.sqrt(bonus)
+                else:
+                    ucb[i] = mean[i]
+
+            bandit = _argmax(ucb)
+
+        reward = tape[t, bandit]
+        _record2(plays, mean, m2, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def ucbv(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    m2 = extra[0]
+    ucb = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total < num_bandits:
+            bandit = total
+        else:
+            log_total = np.log(total)
+
+            for i in range(num_bandits):
+                ucb[i] = mean[i]
+                ucb[i] += np.sqrt(2 * m2[i] / plays[i] * log_total / plays[i])
+                ucb[i] += params[0] * log_total / plays[i]
+
+            bandit = _argmax(ucb)
+
+        reward = tape[t, bandit]
+        _record2(plays, mean, m2, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def moss(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    ucb = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total < num_bandits:
+            bandit = total
+        else:
+            for i in range(num_bandits):
+                ucb[i] = mean[i] + np.sqrt(max(0, np.log(total / (num_bandits * plays[i]))) / plays[i])
+
+            bandit = _argmax(ucb)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def klucb(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    ucb = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total < num_bandits:
+            bandit = total
+        else:
+            d = np.log(total) + params[1] * np.log(total + 1)
+
+            for i in range(num_bandits):
+                ucb[i] = _kl_bin(mean[i], d / plays[i], params[0], 1e-15)
+
+            bandit = _argmax(ucb)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def exp3(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    weights = extra[0]
+    gamma = params[0]
+    prob = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        if total < num_bandits:
+            bandit = total
+        else:
+            total_weights = np.sum(weights)
+
+            for i in range(num_bandits):
+                prob[i] = (1 - gamma) * weights[i] / total_weights + gamma / num_bandits
+
+            bandit = _choice(prob)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        weights[bandit] *= np.exp(mean[bandit] * gamma / num_bandits)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def softmax(tape, total, plays, mean, extra, params, rewards, bandits):
+    for t in range(tape.shape[0]):
+        bandit = _choice(np.exp(mean / params[0]))
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def pursuit(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    p = extra[0]
+    beta = params[0]
+
+    for t in range(tape.shape[0]):
+        bandit = _choice(p)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+
+        max_bandit = np.argmax(mean)
+        for i in range(num_bandits):
+            if i == max_bandit:
+                p[i] += beta * (1 - p[i])
+            else:
+                p[i] -= beta * p[i]
+
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def reinforcement_comparison(tape, total, plays, mean, extra, params, rewards, bandits):
+    pi = extra[0]
+    r = extra[1]
+    alpha = params[0]
+    beta = params[1]
+
+    for t in range(tape.shape[0]):
+        bandit = _choice(np.exp(pi))
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        r[bandit] = (1 - alpha) * r[bandit] + alpha * reward
+        pi[bandit] += beta * (reward - r[bandit])
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def thompson_sampling(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    alpha = extra[0]
+    beta = extra[1]
+    bayes = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        for i in range(num_bandits):
+            bayes[i] = np.random.beta(alpha[i], beta[i])
+
+        bandit = _argmax(bayes)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        alpha[bandit] += reward
+        beta[bandit] += max(params[0] - reward, 0)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
+
+
+@njit(cache=True)
+def bayes_ucb(tape, total, plays, mean, extra, params, rewards, bandits):
+    num_bandits = plays.shape[0]
+    alpha = extra[0]
+    beta = extra[1]
+    bayes = np.empty(num_bandits)
+
+    for t in range(tape.shape[0]):
+        for i in range(num_bandits):
+            a = alpha[i]
+            b = beta[i]
+            std = np.sqrt(a * b / ((a + b) ** 2 * (a + b + 1)))
+            bayes[i] = mean[i] + std * params[1]
+
+        bandit = _argmax(bayes)
+
+        reward = tape[t, bandit]
+        _record(plays, mean, bandit, reward)
+        alpha[bandit] += reward
+        beta[bandit] += max(params[0] - reward, 0)
+        rewards[t] = reward
+        bandits[t] = bandit
+        total += 1
+
+    return total
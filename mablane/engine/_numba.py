@@ -0,0 +1,13 @@
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """ Sustituto de numba.njit cuando numba no está instalado """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+
+        return lambda function: function
@@ -0,0 +1,95 @@
+import os
+
+from itertools import islice
+
+import numpy as np
+
+
+class LoggedData:
+    """
+    Lectura por bloques de un registro histórico de tiradas
+
+    Cada registro contiene el bandido jugado, la recompensa obtenida y,
+    opcionalmente, la probabilidad con la que la política que generó los
+    datos eligió ese bandido (propensión). Los datos se leen en bloques
+    de tamaño acotado, por lo que se pueden recorrer ficheros mayores
+    que la memoria disponible.
+
+    Parámetros
+    ----------
+    source : string or array of float
+        Ruta a un fichero CSV o NPY, o matriz en memoria, con las
+        columnas (bandido, recompensa[, propensión])
+    chunksize : integer
+        Número máximo de registros de cada bloque
+    delimiter : string
+        Separador de las columnas en los ficheros CSV
+    skiprows : integer
+        Número de filas de cabecera que se deben ignorar en los ficheros
+        CSV
+
+    Métodos
+    -------
+    chunks :
+        Iterador sobre los bloques de registros
+    """
+
+    def __init__(self, source, chunksize=100000, delimiter=',', skiprows=0):
+        self.source = source
+        self.chunksize = chunksize
+        self.delimiter = delimiter
+        self.skiprows = skiprows
+
+
+    def __iter__(self):
+        return self.chunks()
+
+
+    def chunks(self):
+        """ Recorre los registros por bloques
+
+        Retorna
+        -------
+        chunk: tuple of array
+            Vectores con los bandidos, las recompensas y las
+            propensiones de cada bloque. Las propensiones son None si
+            no se encuentran en los datos
+        """
+        if isinstance(self.source, str) and os.path.splitext(self.source)[1] != '.npy':
+            yield from self._csv_chunks()
+        else:
+            if isinstance(self.source, str):
+                data = np.load(self.source, mmap_mode='r')
+            else:
+                data = np.asarray(self.source)
+
+            for start in range(0, len(data), self.chunksize):
+                yield self._split(np.asarray(data[start:start + self.chunksize], dtype=float))
+
+
+    def _csv_chunks(self):
+        with open(self.source) as fd:
+            for _ in range(self.skiprows):
+                next(fd, None)
+
+            while True:
+                lines = list(islice(fd, self.chunksize))
+
+                if len(lines) == 0:
+                    break
+
+                data = np.loadtxt(lines, delimiter=self.delimiter, ndmin=2)
+                yield self._split(data)
+
+
+    @staticmethod
+    def _split(data):
+        bandits = data[:, 0].astype(int)
+        rewards = data[:, 1]
+
+        if data.shape[1] > 2:
+            propensities = data[:, 2]
+        else:
+            propensities = None
+
+        return bandits, rewards, propensities
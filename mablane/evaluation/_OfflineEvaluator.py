@@ -0,0 +1,159 @@
+import numpy as np
+
+from ._LoggedData import LoggedData
+
+
+class OfflineEvaluator:
+    """
+    Evaluación fuera de línea (off-policy) de agentes a partir de un
+    registro histórico de tiradas
+
+    Los agentes se manejan únicamente a través de sus métodos select y
+    record, por lo que se puede evaluar cualquier algoritmo del paquete.
+    En cada registro se pregunta a todos los agentes qué bandido
+    jugarían y con la respuesta se actualizan a la vez los estimadores
+    de repetición (replay), ponderación por probabilidad inversa (IPS) y
+    doblemente robusto (DR). Así se evalúan varias políticas con una
+    única pasada sobre los datos.
+
+    Los agentes solamente aprenden de los registros en los que coinciden
+    con la política original. Como su estado no cambia mientras no
+    aprenden, cada agente elige una sola vez y mantiene su elección
+    hasta el siguiente registro aceptado, sin volver a llamar a select
+    en los registros que no coinciden. Si se indica el parámetro scale, estos
+    registros se aceptan con probabilidad scale / propensión (muestreo
+    por rechazo), con lo que la repetición no está sesgada aunque la
+    política original no fuese uniforme.
+
+    Parámetros
+    ----------
+    policies : dict or array of Epsilon
+        Agentes a evaluar. Si es un diccionario las claves se usan como
+        nombre de cada uno de ellos
+    scale : float
+        Probabilidad mínima de la política original empleada en el
+        muestreo por rechazo. Si es None se aceptan todas las
+        coincidencias
+
+    Métodos
+    -------
+    run :
+        Evalúa los agentes con los registros indicados
+    results :
+        Obtención de las estimaciones de cada uno de los agentes
+
+    References
+    ----------
+    Lihong Li, Wei Chu, John Langford, and Xuanhui Wang. "Unbiased Offline
+    Evaluation of Contextual-bandit-based News Article Recommendation
+    Algorithms." Proceedings of the Fourth ACM International Conference on
+    Web Search and Data Mining (2011).
+
+    Miroslav Dudík, John Langford, and Lihong Li. "Doubly Robust Policy
+    Evaluation and Learning." Proceedings of the 28th International
+    Conference on Machine Learning (2011).
+    """
+
+    def __init__(self, policies, scale=None):
+        if isinstance(policies, dict):
+            self.policies = dict(policies)
+        else:
+            self.policies = {f'{type(p).__name__}_{i}': p for i, p in enumerate(policies)}
+
+        self.scale = scale
+
+        self._events = 0
+        self._matches = {name: 0 for name in self.policies}
+        self._accepted = {name: 0 for name in self.policies}
+        self._replay = {name: 0.0 for name in self.policies}
+        self._ips = {name: 0.0 for name in self.policies}
+        self._dr = {name: 0.0 for name in self.policies}
+
+        # Elección pendiente de cada agente desde su último registro
+        self._selected = {name: None for name in self.policies}
+
+        # Modelo de la recompensa de cada bandido usado por el estimador DR
+        self._model_plays = None
+        self._model_mean = None
+
+
+    def run(self, data, chunksize=100000):
+        """ Evalúa los agentes con un registro histórico
+
+        Parámetros
+        ----------
+        data : LoggedData, string or array of float
+            Registros con las columnas (bandido, recompensa[, propensión])
+        chunksize : integer
+            Número de registros de cada bloque si data no es LoggedData
+
+        Retorna
+        -------
+        results: dict
+            Estimaciones obtenidas para cada uno de los agentes
+        """
+        if not isinstance(data, LoggedData):
+            data = LoggedData(data, chunksize=chunksize)
+
+        for bandits, rewards, propensities in data:
+            self._process(bandits, rewards, propensities)
+
+        return self.results()
+
+
+    def results(self):
+        results = {}
+
+        for name in self.policies:
+            results[name] = {
+                'events': self._events,
+                'matches': self._matches[name],
+                'replay': self._replay[name] / max(self._accepted[name], 1),
+                'ips': self._ips[name] / max(self._events, 1),
+                'dr': float(self._dr[name]) / max(self._events, 1)}
+
+        return results
+
+
+    def _process(self, bandits, rewards, propensities):
+        if self._model_plays is None:
+            num_bandits = max(p._num_bandits for p in self.policies.values())
+            self._model_plays = np.zeros(num_bandits)
+            self._model_mean = np.zeros(num_bandits)
+
+        # Sin propensiones se supone que la política original era uniforme
+        if propensities is None:
+            propensities = np.full(len(bandits), 1.0 / len(self._model_plays))
+
+        if self.scale is None:
+            accept = np.ones(len(bandits), dtype=bool)
+        else:
+            accept = np.random.random(len(bandits)) < self.scale / propensities
+
+        for bandit, reward, propensity, accepted in zip(bandits.tolist(), rewards.tolist(),
+                                                        propensities.tolist(), accept.tolist()):
+            self._events += 1
+            model = self._model_mean
+
+            for name, policy in self.policies.items():
+                selected = self._selected[name]
+
+                if selected is None:
+                    selected = self._selected[name] = policy.select()
+
+                self._dr[name] += model[selected]
+
+                if selected == bandit:
+                    self._matches[name] += 1
+                    self._ips[name] += reward / propensity
+                    self._dr[name] += (reward - model[bandit]) / propensity
+
+                    if accepted:
+                        self._accepted[name] += 1
+                        self._replay[name] += reward
+                        policy.record(bandit, reward)
+                        self._selected[name] = None
+
+            # El modelo se actualiza después para no usar el registro actual
+            self._model_plays[bandit] += 1
+            self._model_mean[bandit] += (reward - self._model_mean[bandit]) / self._model_plays[bandit]
@@ -0,0 +1,4 @@
+from ._LoggedData import LoggedData
+from ._OfflineEvaluator import OfflineEvaluator
+
+__all__ = ['LoggedData', 'OfflineEvaluator']
@@ -0,0 +1,73 @@
+import numpy as np
+
+from ._SuccessiveElimination import SuccessiveElimination
+
+
+class LUCB(SuccessiveElimination):
+    """
+    Identificación del mejor bandido con confianza fija mediante el
+    algoritmo LUCB (Lower and Upper Confidence Bounds)
+
+    En cada ronda se juega con el bandido de mayor recompensa promedio y
+    con el competidor de mayor cota superior. El agente se detiene
+    cuando la cota inferior del primero supera la cota superior de
+    todos los demás.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    delta : float
+        Probabilidad de error admitida
+    scale : float
+        Amplitud del rango de las recompensas
+
+    Métodos
+    -------
+    run :
+        Realiza tiradas hasta identificar el mejor bandido o agotar el
+        presupuesto
+    step :
+        Realiza una ronda del algoritmo
+    best :
+        Obtención del bandido con mejor recompensa promedio
+
+    References
+    ----------
+    Shivaram Kalyanakrishnan, Ambuj Tewari, Peter Auer, and Peter Stone.
+    "PAC Subset Selection in Stochastic Multi-armed Bandits." Proceedings
+    of the 29th International Conference on Machine Learning (2012).
+    """
+
+    def step(self):
+        if self.sample_complexity == 0:
+            for bandit in range(self._num_bandits):
+                self._pull(bandit)
+        else:
+            leader, challenger = self._candidates()
+            self._pull(leader)
+            self._pull(challenger)
+
+        leader, challenger = self._candidates()
+        lower, upper = self._bounds()
+
+        if lower[leader] > upper[challenger]:
+            self.identified = True
+            self._active = np.array([leader])
+
+
+    def _bounds(self):
+        t = max(self.sample_complexity, 1)
+        radius = self.scale * np.sqrt(np.log(5 * self._num_bandits * t ** 4 / (4 * self.delta))
+                                      / (2 * self._plays))
+
+        return self._mean - radius, self._mean + radius
+
+
+    def _candidates(self):
+        leader = int(np.argmax(self._mean))
+
+        upper = self._bounds()[1].copy()
+        upper[leader] = -np.inf
+
+        return leader, int(np.argmax(upper))
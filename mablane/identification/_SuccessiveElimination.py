@@ -0,0 +1,106 @@
+import numpy as np
+
+from .._SufficientStatistics import SufficientStatistics
+
+
+class SuccessiveElimination:
+    """
+    Identificación del mejor bandido con confianza fija mediante el
+    algoritmo de eliminación sucesiva (Successive Elimination)
+
+    En lugar de jugar un número fijo de tiradas, el agente se detiene en
+    cuanto puede afirmar con probabilidad 1 - delta cuál es el bandido
+    con mayor recompensa esperada. En cada ronda se juega una vez con
+    cada uno de los bandidos activos y se eliminan aquellos cuya cota
+    superior queda por debajo de la cota inferior del mejor.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    delta : float
+        Probabilidad de error admitida
+    scale : float
+        Amplitud del rango de las recompensas
+
+    Métodos
+    -------
+    run :
+        Realiza tiradas hasta identificar el mejor bandido o agotar el
+        presupuesto
+    step :
+        Realiza una ronda del algoritmo
+    best :
+        Obtención del bandido con mejor recompensa promedio
+
+    References
+    ----------
+    Eyal Even-Dar, Shie Mannor, and Yishay Mansour. "Action Elimination
+    and Stopping Conditions for the Multi-Armed Bandit and Reinforcement
+    Learning Problems." Journal of Machine Learning Research 7 (2006)
+    1079-1105.
+    """
+
+    def __init__(self, bandits, delta=0.05, scale=1):
+        self.bandits = bandits
+        self.delta = delta
+        self.scale = scale
+
+        self._num_bandits = len(bandits)
+        self._stats = SufficientStatistics(self._num_bandits, moments=1)
+        self._plays = self._stats.count
+        self._mean = self._stats.mean
+        self._active = np.arange(self._num_bandits)
+
+        self.identified = False
+        self.sample_complexity = 0
+
+
+    def run(self, max_pulls=None):
+        """ Juega hasta identificar el mejor bandido
+
+        Parámetros
+        ----------
+        max_pulls : integer
+            Número máximo de tiradas. Si es None se juega hasta que se
+            cumple la condición de parada
+
+        Retorna
+        -------
+        best: integer
+            Índice del bandido identificado como mejor
+        """
+        while not self.identified:
+            if max_pulls is not None and self.sample_complexity >= max_pulls:
+                break
+
+            self.step()
+
+        return self.best()
+
+
+    def step(self):
+        for bandit in self._active:
+            self._pull(bandit)
+
+        n = self._plays[self._active[0]]
+        radius = self.scale * np.sqrt(np.log(4 * self._num_bandits * n ** 2 / self.delta) / (2 * n))
+
+        # Eliminación de los bandidos dominados por el mejor
+        mean = self._mean[self._active]
+        self._active = self._active[mean >= np.max(mean) - 2 * radius]
+        self.identified = len(self._active) == 1
+
+
+    def best(self):
+        if self.identified:
+            return int(self._active[0])
+
+        return int(self._active[np.argmax(self._mean[self._active])])
+
+
+    def _pull(self, bandit):
+        reward = self.bandits[bandit].pull()
+
+        self._stats.update(bandit, reward)
+        self.sample_complexity += 1
@@ -0,0 +1,176 @@
+import math
+
+import numpy as np
+
+from scipy.optimize import brentq
+
+from ._SuccessiveElimination import SuccessiveElimination
+
+
+def klBernoulli(p, q, eps=1e-15):
+    p = np.clip(p, eps, 1 - eps)
+    q = np.clip(q, eps, 1 - eps)
+
+    return p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q))
+
+
+def optimal_weights(mean, eps=1e-6):
+    """ Proporción óptima de tiradas de cada bandido
+
+    Parámetros
+    ----------
+    mean : array of float
+        Recompensa esperada de cada bandido (entre 0 y 1)
+
+    Retorna
+    -------
+    weights: array of float
+        Fracción de las tiradas que se debería jugar con cada bandido
+        para identificar el mejor con el menor número de tiradas
+    """
+    mean = np.clip(np.asarray(mean, dtype=float), eps, 1 - eps)
+    best = int(np.argmax(mean))
+    others = np.delete(np.arange(len(mean)), best)
+    gaps = klBernoulli(mean[best], mean[others])
+
+    # Con empates no existe una asignación mejor que la uniforme
+    if np.any(np.isclose(mean[others], mean[best], rtol=1e-9, atol=1e-12)):
+        return np.full(len(mean), 1 / len(mean))
+
+    def kl(p, q):
+        # Versión escalar, mucho más rápida dentro de las búsquedas de raíces
+        q = min(max(q, 1e-15), 1 - 1e-15)
+        return p * math.log(p / q) + (1 - p) * math.log((1 - p) / (1 - q))
+
+    values = mean.tolist()
+
+    def mixture(x, a):
+        return (values[best] + x * values[a]) / (1 + x)
+
+    def inverse_g(y, a):
+        # Resuelve g_a(x) = y, con g_a creciente entre 0 y d(mu_1, mu_a)
+        def g(x):
+            m = mixture(x, a)
+            return kl(values[best], m) + x * kl(values[a], m) - y
+
+        upper = 1.0
+        while g(upper) < 0:
+            upper *= 2
+
+        return brentq(g, 0, upper)
+
+    def ratio(y):
+        total = 0
+        for a in others:
+            m = mixture(inverse_g(y, a), a)
+            total += kl(values[best], m) / max(kl(values[a], m), 1e-300)
+
+        return total - 1
+
+    # Muy cerca del límite el cociente pierde precisión numérica
+    limit = np.min(gaps)
+    lower, upper = limit * 1e-9, limit * (1 - 1e-6)
+
+    if ratio(upper) > 0:
+        y = brentq(ratio, lower, upper)
+    else:
+        y = upper
+
+    x = np.array([inverse_g(y, a) for a in others])
+
+    weights = np.empty(len(mean))
+    weights[best] = 1 / (1 + np.sum(x))
+    weights[others] = x * weights[best]
+
+    return weights
+
+
+class TrackAndStop(SuccessiveElimination):
+    """
+    Identificación del mejor bandido con confianza fija mediante el
+    algoritmo Track-and-Stop para recompensas de Bernoulli
+
+    El agente juega siguiendo la proporción óptima de tiradas calculada
+    con las medias estimadas (D-Tracking) y se detiene cuando el
+    estadístico de la razón de verosimilitudes generalizada entre el
+    mejor bandido y cada uno de los demás supera el umbral
+    correspondiente a la confianza 1 - delta.
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    delta : float
+        Probabilidad de error admitida
+    scale : float
+        Amplitud del rango de las recompensas, con la que se llevan a
+        valores entre 0 y 1
+    every : integer
+        Número de tiradas entre dos cálculos de la proporción óptima
+
+    Métodos
+    -------
+    run :
+        Realiza tiradas hasta identificar el mejor bandido o agotar el
+        presupuesto
+    step :
+        Realiza una tirada del algoritmo
+    best :
+        Obtención del bandido con mejor recompensa promedio
+
+    References
+    ----------
+    Aurélien Garivier and Emilie Kaufmann. "Optimal Best Arm Identification
+    with Fixed Confidence." Proceedings of the 29th Conference on Learning
+    Theory, PMLR 49:998-1027, 2016.
+    """
+
+    def __init__(self, bandits, delta=0.05, scale=1, every=10):
+        self.every = every
+
+        super(TrackAndStop, self).__init__(bandits, delta, scale)
+
+        self._weights = np.full(self._num_bandits, 1 / self._num_bandits)
+
+
+    def step(self):
+        t = self.sample_complexity
+
+        if t < self._num_bandits:
+            bandit = t
+        else:
+            if t % self.every == 0:
+                self._weights = optimal_weights(self._mean / self.scale)
+
+            # Exploración forzada de los bandidos con pocas tiradas
+            starved = self._plays < np.sqrt(t) - self._num_bandits / 2
+
+            if np.any(starved):
+                bandit = int(np.argmin(self._plays))
+            else:
+                bandit = int(np.argmax(t * self._weights - self._plays))
+
+        self._pull(bandit)
+
+        if self.sample_complexity >= self._num_bandits and self._statistic() > self._threshold():
+            self.identified = True
+            self._active = np.array([int(np.argmax(self._mean))])
+
+
+    def _statistic(self):
+        mean = self._mean / self.scale
+        best = np.argmax(mean)
+        others = np.delete(np.arange(self._num_bandits), best)
+
+        plays_best = self._plays[best]
+        plays = self._plays[others]
+        mixture = (plays_best * mean[best] + plays * mean[others]) / (plays_best + plays)
+
+        statistic = plays_best * klBernoulli(mean[best], mixture) \
+                    + plays * klBernoulli(mean[others], mixture)
+
+        return np.min(statistic)
+
+
+    def _threshold(self):
+        return np.log((np.log(self.sample_complexity) + 1) / self.delta)
@@ -0,0 +1,5 @@
+from ._LUCB import LUCB
+from ._SuccessiveElimination import SuccessiveElimination
+from ._TrackAndStop import TrackAndStop, optimal_weights
+
+__all__ = ['LUCB', 'SuccessiveElimination', 'TrackAndStop', 'optimal_weights']
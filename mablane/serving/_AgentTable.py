@@ -0,0 +1,206 @@
+import numpy as np
+
+from .._SufficientStatistics import SufficientStatistics
+from .._utils import argmax_random
+from ..algortims import Epsilon, ThompsonSampling, UCB1, UCBV
+from ._CompactAgents import CompactEpsilon, CompactThompsonSampling, CompactUCB1, CompactUCBV
+
+
+# Regla de selección y valores por defecto de los hiperparámetros de cada
+# uno de los algoritmos soportados
+RULES = {
+    Epsilon: ('epsilon', {'epsilon': 0.05, 'decay': 1}),
+    CompactEpsilon: ('epsilon', {'epsilon': 0.05, 'decay': 1}),
+    UCB1: ('ucb1', {}),
+    CompactUCB1: ('ucb1', {}),
+    UCBV: ('ucbv', {'b': 3}),
+    CompactUCBV: ('ucbv', {'b': 3}),
+    ThompsonSampling: ('thompson', {'N': 1}),
+    CompactThompsonSampling: ('thompson', {'N': 1}),
+}
+
+
+class AgentTable:
+    """
+    Tabla con los agentes independientes de muchos inquilinos (segmentos,
+    páginas, campañas...) que usan el mismo algoritmo
+
+    En lugar de un objeto por inquilino, las estadísticas de todos ellos
+    se guardan en matrices (inquilinos, bandidos). La selección y la
+    actualización reciben un lote de peticiones que puede mezclar
+    inquilinos y se resuelven con operaciones vectorizadas sobre las
+    filas correspondientes, por lo que el coste por petición es mucho
+    menor que el de llamar a select y record de un agente en cada una.
+
+    Parámetros
+    ----------
+    algorithm : class
+        Algoritmo de los agentes. Se admiten Epsilon, UCB1, UCBV y
+        ThompsonSampling, así como sus versiones compactas
+    num_tenants : integer
+        Número de inquilinos
+    num_bandits : integer
+        Número de bandidos de cada inquilino
+    dtype : numpy.dtype
+        Tipo de las medias y los momentos de las recompensas
+    **params :
+        Hiperparámetros del algoritmo (epsilon, decay, b o N)
+
+    Métodos
+    -------
+    select :
+        Selecciona un bandido para cada una de las peticiones
+    update :
+        Registra las recompensas de un lote de peticiones
+    average_reward :
+        Obtención de la recompensa promedio de los inquilinos
+    """
+
+    def __init__(self, algorithm, num_tenants, num_bandits, dtype=np.float64, **params):
+        if algorithm not in RULES:
+            raise ValueError(f'Unsupported algorithm: {algorithm.__name__}')
+
+        self.algorithm = algorithm
+        self.num_tenants = num_tenants
+        self.num_bandits = num_bandits
+
+        self.rule, defaults = RULES[algorithm]
+        self.params = dict(defaults, **params)
+
+        unknown = set(self.params) - set(defaults)
+        if unknown:
+            raise ValueError(f'Unknown parameters for {algorithm.__name__}: {sorted(unknown)}')
+
+        # Los lotes con inquilinos y bandidos repetidos se resumen antes
+        # de combinarse con los estadísticos acumulados
+        moments = 2 if self.rule == 'ucbv' else 1
+        self._stats = SufficientStatistics((num_tenants, num_bandits), moments, dtype)
+        self._plays = self._stats.count
+        self._total = np.zeros(num_tenants, dtype=np.int64)
+
+        if self.rule == 'epsilon':
+            self._epsilon = np.full(num_tenants, self.params['epsilon'], dtype=float)
+
+
+    def select(self, tenant_ids):
+        """ Selecciona un bandido para cada petición
+
+        Parámetros
+        ----------
+        tenant_ids : array of integer
+            Inquilino de cada una de las peticiones. Un mismo inquilino
+            puede aparecer varias veces en el lote
+
+        Retorna
+        -------
+        bandits: array of integer
+            Bandido seleccionado para cada petición
+        """
+        tenant_ids = np.asarray(tenant_ids)
+
+        return getattr(self, '_select_' + self.rule)(tenant_ids)
+
+
+    def update(self, tenant_ids, bandits, rewards):
+        """ Registra las recompensas de un lote de peticiones
+
+        Parámetros
+        ----------
+        tenant_ids : array of integer
+            Inquilino de cada una de las peticiones
+        bandits : array of integer
+            Bandido jugado en cada petición
+        rewards : array of float
+            Recompensa obtenida en cada petición
+        """
+        tenant_ids = np.asarray(tenant_ids)
+
+        self._stats.update_batch((tenant_ids, np.asarray(bandits)), rewards)
+        np.add.at(self._total, tenant_ids, 1)
+
+
+    def average_reward(self, tenant_ids=None):
+        """ Recompensa promedio de los inquilinos
+
+        Parámetros
+        ----------
+        tenant_ids : array of integer
+            Inquilinos de los que se quiere la recompensa. Si es None se
+            devuelve la de todos
+
+        Retorna
+        -------
+        average: array of float
+            Recompensa promedio de cada inquilino
+        """
+        if tenant_ids is None:
+            tenant_ids = slice(None)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sum(self._stats.sum(tenant_ids), axis=1) / self._total[tenant_ids]
+
+
+    def _mean(self, tenant_ids):
+        return self._stats.mean[tenant_ids], self._plays[tenant_ids]
+
+
+    def _select_epsilon(self, tenant_ids):
+        mean, _ = self._mean(tenant_ids)
+        bandits = argmax_random(mean, axis=1)
+        epsilon = self._epsilon[tenant_ids]
+
+        # Cada petición reduce una vez el epsilon de su inquilino, también
+        # para las siguientes peticiones del mismo inquilino en el lote
+        if self.params['decay'] != 1:
+            order = np.argsort(tenant_ids, kind='stable')
+            ordered = tenant_ids[order]
+            rank = np.empty(len(tenant_ids), dtype=np.int64)
+            rank[order] = np.arange(len(tenant_ids)) - np.searchsorted(ordered, ordered)
+
+            epsilon = epsilon * self.params['decay'] ** rank
+            np.multiply.at(self._epsilon, tenant_ids, self.params['decay'])
+
+        explore = np.random.random(len(tenant_ids)) < epsilon
+        bandits[explore] = np.random.randint(self.num_bandits, size=np.count_nonzero(explore))
+
+        return bandits
+
+
+    def _select_ucb1(self, tenant_ids):
+        mean, plays = self._mean(tenant_ids)
+        log_total = np.log(np.maximum(self._total[tenant_ids], 1))[:, None]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            width = np.sqrt(2 * log_total / plays)
+
+        return self._select_index(mean + width, plays)
+
+
+    def _select_ucbv(self, tenant_ids):
+        mean, plays = self._mean(tenant_ids)
+        log_total = np.log(np.maximum(self._total[tenant_ids], 1))[:, None]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = self._stats.variance(tenant_ids)
+            width = np.sqrt(2 * var * log_total / plays)
+            width += self.params['b'] * log_total / plays
+
+        return self._select_index(mean + width, plays)
+
+
+    def _select_thompson(self, tenant_ids):
+        successes = self._stats.sum(tenant_ids)
+        failures = self.params['N'] * self._plays[tenant_ids] - successes
+
+        return argmax_random(np.random.beta(1 + successes, 1 + failures), axis=1)
+
+
+    def _select_index(self, index, plays):
+        bandits = argmax_random(index, axis=1)
+
+        # Los inquilinos con bandidos sin jugar juegan el primero de ellos
+        unplayed = plays == 0
+        pending = np.any(unplayed, axis=1)
+        bandits[pending] = np.argmax(unplayed[pending], axis=1)
+
+        return bandits
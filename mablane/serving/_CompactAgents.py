@@ -0,0 +1,326 @@
+import numpy as np
+
+
+# Los tipos estructurados se comparten entre todas las instancias, ya que
+# cada uno ocupa varios cientos de bytes
+_DTYPES = {}
+
+
+def _arms_dtype(fields, dtype, count_dtype):
+    key = (fields, np.dtype(dtype), np.dtype(count_dtype))
+
+    if key not in _DTYPES:
+        _DTYPES[key] = np.dtype([('plays', count_dtype)] + [(name, dtype) for name in fields])
+
+    return _DTYPES[key]
+
+
+class CompactAgent:
+    """
+    Base de los agentes compactos pensados para mantener millones de
+    instancias, por ejemplo una por segmento de usuarios
+
+    A diferencia de Epsilon, los agentes no guardan el histórico de
+    recompensas ni una referencia a los bandidos y no tienen __dict__.
+    Todo el estado de los bandidos se almacena en un único vector
+    estructurado con las tiradas y los valores estimados en los tipos
+    indicados, por lo que el tamaño de cada instancia es un múltiplo
+    pequeño de K×8 bytes, siendo K el número de bandidos. El número
+    total de tiradas y la recompensa promedio se obtienen a partir de
+    las tiradas y las medias de cada bandido.
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se juega
+    dtype : numpy.dtype
+        Tipo de los valores estimados para cada bandido
+    count_dtype : numpy.dtype
+        Tipo del número de tiradas de cada bandido
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos indicados
+    record :
+        Registra la recompensa obtenida con un bandido
+    update:
+        Actualiza los valores adicionales después de una tirada
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    average_reward :
+        Obtención de la recompensa promedio
+    """
+
+    __slots__ = ('_arms',)
+
+    # Valores estimados de cada bandido además del número de tiradas
+    _fields = ('mean',)
+
+    def __init__(self, num_bandits, dtype=np.float32, count_dtype=np.uint32):
+        self._arms = np.zeros(num_bandits, dtype=_arms_dtype(self._fields, dtype, count_dtype))
+
+
+    @property
+    def _plays(self):
+        return self._arms['plays']
+
+
+    @property
+    def _mean(self):
+        return self._arms['mean']
+
+
+    @property
+    def total(self):
+        return int(np.sum(self._plays, dtype=np.int64))
+
+
+    def run(self, bandits, episodes=1):
+        for i in range(episodes):
+            bandit = self.select()
+            self.record(bandit, bandits[bandit].pull())
+
+        return self.average_reward()
+
+
+    def record(self, bandit, reward):
+        plays = self._arms['plays']
+        mean = self._arms['mean']
+
+        plays[bandit] += 1
+        mean[bandit] += (reward - mean[bandit]) / plays[bandit]
+
+        self.update(bandit, reward)
+
+
+    def update(self, bandit, reward):
+        pass
+
+
+    def select(self):
+        raise NotImplementedError
+
+
+    def average_reward(self):
+        total = self.total
+
+        if total == 0:
+            return np.nan
+
+        return float(np.dot(self._plays, self._mean.astype(float))) / total
+
+
+    def _argmax(self, values):
+        max_bandits = np.flatnonzero(values == np.max(values))
+
+        if len(max_bandits) == 1:
+            return int(max_bandits[0])
+
+        return int(np.random.choice(max_bandits))
+
+
+class CompactEpsilon(CompactAgent):
+    """
+    Versión compacta del agente Epsilon Greedy pensada para mantener
+    millones de instancias
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se juega
+    epsilon : float
+        Porcentaje de veces en las que el agente jugada de forma
+        aleatoria
+    decay : float
+        Velocidad con la que decae la probabilidad de seleccionar una
+        jugada al azar
+    dtype : numpy.dtype
+        Tipo de los valores estimados para cada bandido
+    count_dtype : numpy.dtype
+        Tipo del número de tiradas de cada bandido
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos indicados
+    record :
+        Registra la recompensa obtenida con un bandido
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    average_reward :
+        Obtención de la recompensa promedio
+    """
+
+    __slots__ = ('epsilon', 'decay', '_epsilon')
+
+    def __init__(self, num_bandits, epsilon=0.05, decay=1, dtype=np.float32, count_dtype=np.uint32):
+        self.epsilon = epsilon
+        self.decay = decay
+        self._epsilon = epsilon
+
+        super(CompactEpsilon, self).__init__(num_bandits, dtype, count_dtype)
+
+
+    def select(self):
+        if np.random.random() < self._epsilon:
+            bandit = np.random.randint(len(self._arms))
+        else:
+            bandit = self._argmax(self._mean)
+
+        # Con decay igual a 1 no se crea un nuevo objeto en cada tirada
+        if self.decay != 1:
+            self._epsilon *= self.decay
+
+        return bandit
+
+
+class CompactUCB1(CompactAgent):
+    """
+    Versión compacta del agente UCB1 pensada para mantener millones de
+    instancias
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se juega
+    dtype : numpy.dtype
+        Tipo de los valores estimados para cada bandido
+    count_dtype : numpy.dtype
+        Tipo del número de tiradas de cada bandido
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos indicados
+    record :
+        Registra la recompensa obtenida con un bandido
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    average_reward :
+        Obtención de la recompensa promedio
+    """
+
+    __slots__ = ()
+
+    def select(self):
+        # Primero se juega una vez con cada bandido
+        unplayed = np.flatnonzero(self._plays == 0)
+
+        if len(unplayed) > 0:
+            return int(unplayed[0])
+
+        # Los índices se calculan en doble precisión
+        plays = self._plays.astype(float)
+        ucb = self._mean + self._width(np.log(np.sum(plays)), plays)
+
+        return self._argmax(ucb)
+
+
+    def _width(self, log_total, plays):
+        return np.sqrt(2 * log_total / plays)
+
+
+class CompactUCBV(CompactUCB1):
+    """
+    Versión compacta del agente UCBV pensada para mantener millones de
+    instancias
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se juega
+    b : float
+        Hiperparámetro para seleccionar el ration de aprendizaje
+    dtype : numpy.dtype
+        Tipo de los valores estimados para cada bandido
+    count_dtype : numpy.dtype
+        Tipo del número de tiradas de cada bandido
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos indicados
+    record :
+        Registra la recompensa obtenida con un bandido
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    average_reward :
+        Obtención de la recompensa promedio
+    """
+
+    __slots__ = ('b',)
+
+    # Suma de los cuadrados de las desviaciones respecto a la media
+    _fields = ('mean', 'm2')
+
+    def __init__(self, num_bandits, b=3, dtype=np.float32, count_dtype=np.uint32):
+        self.b = b
+
+        super(CompactUCBV, self).__init__(num_bandits, dtype, count_dtype)
+
+
+    def update(self, bandit, reward):
+        # Actualización de Welford a partir de la media ya actualizada, ya
+        # que la desviación previa es n / (n - 1) veces la actual
+        n = int(self._plays[bandit])
+
+        if n > 1:
+            delta = reward - float(self._mean[bandit])
+            self._arms['m2'][bandit] += delta * delta * n / (n - 1)
+
+
+    def _width(self, log_total, plays):
+        var = self._arms['m2'] / plays
+
+        return np.sqrt(2 * var * log_total / plays) + self.b * log_total / plays
+
+
+class CompactThompsonSampling(CompactAgent):
+    """
+    Versión compacta del agente de Muestreo de Thompson pensada para
+    mantener millones de instancias
+
+    Parámetros
+    ----------
+    num_bandits : integer
+        Número de bandidos con los que se juega
+    N : float
+        El número de sucesos de la distribución Binomial
+    dtype : numpy.dtype
+        Tipo de los valores estimados para cada bandido
+    count_dtype : numpy.dtype
+        Tipo del número de tiradas de cada bandido
+
+    Métodos
+    -------
+    run :
+        Realiza una serie de tiradas con los bandidos indicados
+    record :
+        Registra la recompensa obtenida con un bandido
+    select :
+        Selecciona un bandido para jugar en la próxima tirada
+    average_reward :
+        Obtención de la recompensa promedio
+    """
+
+    __slots__ = ('N',)
+
+    # Los fracasos se obtienen a partir del número de tiradas
+    _fields = ('mean', 'successes')
+
+    def __init__(self, num_bandits, N=1, dtype=np.float32, count_dtype=np.uint32):
+        self.N = N
+
+        super(CompactThompsonSampling, self).__init__(num_bandits, dtype, count_dtype)
+
+
+    def update(self, bandit, reward):
+        self._arms['successes'][bandit] += reward
+
+
+    def select(self):
+        successes = self._arms['successes'].astype(float)
+        failures = self.N * self._plays - successes
+
+        return self._argmax(np.random.beta(1 + successes, 1 + failures))
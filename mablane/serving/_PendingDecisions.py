@@ -0,0 +1,281 @@
+import numpy as np
+
+
+# Políticas para las decisiones que caducan sin recompensa
+EXPIRY = ('drop', 'zero')
+
+
+class PendingDecisions:
+    """
+    Almacén de decisiones pendientes de recompensa para un agente con
+    realimentación diferida
+
+    Cada decisión recibe un identificador consecutivo y se guarda, con
+    el bandido, el instante y la propensión, en la posición
+    identificador % capacity de unos vectores circulares de tamaño fijo,
+    por lo que la memoria no depende del número de decisiones abiertas.
+    Las recompensas que llegan más tarde se buscan en bloque por su
+    identificador y se incorporan al agente con una única llamada.
+
+    Las decisiones sin respuesta caducan cuando pasan más de ttl
+    unidades de tiempo o cuando su posición se necesita para una
+    decisión nueva. Con la política 'drop' se descartan, con 'zero' se
+    registran con recompensa nula y con una función se registra la
+    recompensa que esta devuelva para los bandidos, instantes y
+    propensiones de las decisiones caducadas.
+
+    Parámetros
+    ----------
+    agent : Epsilon or CompactAgent
+        Agente que toma las decisiones y recibe las recompensas
+    capacity : integer
+        Número máximo de decisiones pendientes
+    ttl : float
+        Tiempo tras el que caduca una decisión. Si es None solamente
+        caducan al agotar la capacidad
+    expiry : string or callable
+        Política para las decisiones caducadas: 'drop', 'zero' o una
+        función expiry(bandits, steps, propensities) que devuelve las
+        recompensas que se registran
+
+    Métodos
+    -------
+    select :
+        Toma una o varias decisiones con el agente y las guarda
+    add :
+        Guarda decisiones tomadas fuera del almacén
+    join :
+        Incorpora al agente las recompensas de un lote de decisiones
+    expire :
+        Aplica la política de caducidad a las decisiones antiguas
+    """
+
+    def __init__(self, agent, capacity=2**20, ttl=None, expiry='drop'):
+        if not callable(expiry) and expiry not in EXPIRY:
+            raise ValueError(f'Unknown expiry policy: {expiry}')
+
+        self.agent = agent
+        self.capacity = capacity
+        self.ttl = ttl
+        self.expiry = expiry
+
+        # Identificador de la decisión guardada en cada posición, -1 si
+        # está libre, y sus datos
+        self._ids = np.full(capacity, -1, dtype=np.int64)
+        self._bandits = np.zeros(capacity, dtype=np.int32)
+        self._steps = np.zeros(capacity, dtype=np.float64)
+        self._propensities = np.zeros(capacity, dtype=np.float32)
+
+        # Próximo identificador y el más antiguo que puede seguir abierto
+        self._next = 0
+        self._oldest = 0
+
+        self.joined = 0
+        self.expired = 0
+        self.unmatched = 0
+
+
+    def __len__(self):
+        return int(np.count_nonzero(self._ids[self._slots(self._oldest, self._next)] >= 0))
+
+
+    def select(self, size=1, step=None, propensities=None, distinct=True):
+        """ Toma decisiones con el agente sin esperar a sus recompensas
+
+        Las decisiones de un lote se toman sin registrar recompensas entre
+        ellas, por lo que un agente determinista como UCB1 elegiría el
+        mismo bandido en todas, incluidos los bandidos sin tiradas al
+        empezar. Con distinct, si el agente dispone de select_slate, el
+        lote recorre en orden los bandidos de una lista de mayor a menor
+        índice y vuelve a empezar si hay más decisiones que bandidos
+
+        Parámetros
+        ----------
+        size : integer
+            Número de decisiones
+        step : float
+            Instante de las decisiones. Si es None se usa el identificador
+        propensities : array of float
+            Probabilidad con la que el agente eligió cada bandido
+        distinct : boolean
+            Reparte el lote entre bandidos distintos con select_slate. Si
+            es False se llama a select en cada decisión
+
+        Retorna
+        -------
+        ids: array of integer
+            Identificador de cada decisión
+        bandits: array of integer
+            Bandido seleccionado en cada decisión
+        """
+        select_slate = getattr(self.agent, 'select_slate', None) if distinct else None
+
+        if select_slate is not None and size > 1:
+            bandits = np.resize(np.asarray(select_slate(size), dtype=int), size)
+        else:
+            bandits = np.array([self.agent.select() for _ in range(size)], dtype=int)
+
+        return self.add(bandits, step, propensities), bandits
+
+
+    def add(self, bandits, step=None, propensities=None):
+        """ Guarda un lote de decisiones
+
+        Parámetros
+        ----------
+        bandits : array of integer
+            Bandido seleccionado en cada decisión
+        step : float or array of float
+            Instante de cada decisión, que no puede ser anterior al de
+            las decisiones ya guardadas. Si es None se usa el
+            identificador
+        propensities : array of float
+            Probabilidad con la que se eligió cada bandido. Si es None se
+            guarda 1
+
+        Retorna
+        -------
+        ids: array of integer
+            Identificador de cada decisión
+        """
+        bandits = np.atleast_1d(np.asarray(bandits))
+        size = len(bandits)
+
+        if size > self.capacity:
+            raise ValueError(f'Cannot add {size} decisions to a buffer of capacity {self.capacity}')
+
+        ids = np.arange(self._next, self._next + size, dtype=np.int64)
+
+        if step is None:
+            step = ids
+
+        step = np.broadcast_to(np.asarray(step, dtype=float), (size,))
+
+        if size > 0 and self._next > self._oldest and step[0] < self._steps[(self._next - 1) % self.capacity]:
+            raise ValueError('Decision steps must be non-decreasing')
+
+        if propensities is None:
+            propensities = 1
+
+        # Las decisiones más antiguas ceden su posición a las nuevas
+        overflow = self._next + size - self.capacity
+        if overflow > self._oldest:
+            self._expire(self._oldest, overflow)
+
+        slots = ids % self.capacity
+        self._ids[slots] = ids
+        self._bandits[slots] = bandits
+        self._steps[slots] = step
+        self._propensities[slots] = propensities
+
+        self._next += size
+
+        return ids
+
+
+    def join(self, ids, rewards):
+        """ Incorpora al agente las recompensas de un lote de decisiones
+
+        Las recompensas de decisiones desconocidas, ya respondidas o
+        caducadas se descartan
+
+        Parámetros
+        ----------
+        ids : array of integer
+            Identificador de la decisión de cada recompensa
+        rewards : array of float
+            Recompensas obtenidas
+
+        Retorna
+        -------
+        matched: array of boolean
+            Indica qué recompensas se han incorporado al agente
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        rewards = np.broadcast_to(np.asarray(rewards, dtype=float), ids.shape)
+
+        slots = ids % self.capacity
+        matched = (ids >= 0) & (self._ids[slots] == ids)
+
+        # Una decisión repetida en el lote solamente se une la primera vez
+        _, first = np.unique(ids, return_index=True)
+        unique = np.zeros(len(ids), dtype=bool)
+        unique[first] = True
+        matched &= unique
+
+        slots = slots[matched]
+        self._record(self._bandits[slots], rewards[matched])
+        self._ids[slots] = -1
+
+        self.joined += len(slots)
+        self.unmatched += len(ids) - len(slots)
+
+        return matched
+
+
+    def expire(self, now):
+        """ Aplica la política de caducidad a las decisiones antiguas
+
+        Parámetros
+        ----------
+        now : float
+            Instante actual. Caducan las decisiones anteriores a now - ttl
+
+        Retorna
+        -------
+        expired: integer
+            Número de decisiones caducadas
+        """
+        if self.ttl is None:
+            return 0
+
+        # Los instantes son crecientes en el orden de los identificadores
+        steps = self._steps[self._slots(self._oldest, self._next)]
+        stop = self._oldest + int(np.searchsorted(steps, now - self.ttl, side='left'))
+
+        return self._expire(self._oldest, stop)
+
+
+    def _expire(self, start, stop):
+        slots = self._slots(start, stop)
+        slots = slots[self._ids[slots] >= 0]
+
+        if self.expiry == 'zero':
+            self._record(self._bandits[slots], np.zeros(len(slots)))
+        elif callable(self.expiry):
+            self._record(self._bandits[slots], self.expiry(self._bandits[slots], self._steps[slots],
+                                                           self._propensities[slots]))
+
+        self._ids[slots] = -1
+        self._oldest = max(self._oldest, stop)
+        self.expired += len(slots)
+
+        return len(slots)
+
+
+    def _slots(self, start, stop):
+        # Posiciones de los identificadores entre start y stop, como
+        # mucho dos tramos contiguos de los vectores circulares
+        if stop <= start:
+            return np.zeros(0, dtype=np.int64)
+
+        first = start % self.capacity
+        last = first + (stop - start)
+
+        if last <= self.capacity:
+            return np.arange(first, last)
+
+        return np.concatenate([np.arange(first, self.capacity), np.arange(last - self.capacity)])
+
+
+    def _record(self, bandits, rewards):
+        if len(bandits) == 0:
+            return
+
+        record_batch = getattr(self.agent, 'record_batch', None)
+
+        if record_batch is not None:
+            record_batch(bandits, rewards)
+        else:
+            for bandit, reward in zip(bandits.tolist(), np.asarray(rewards, dtype=float).tolist()):
+                self.agent.record(bandit, reward)
@@ -0,0 +1,6 @@
+from ._AgentTable import AgentTable
+from ._CompactAgents import CompactAgent, CompactEpsilon, CompactThompsonSampling, CompactUCB1, CompactUCBV
+from ._PendingDecisions import PendingDecisions
+
+__all__ = ['AgentTable', 'CompactAgent', 'CompactEpsilon', 'CompactThompsonSampling', 'CompactUCB1',
+           'CompactUCBV', 'PendingDecisions']
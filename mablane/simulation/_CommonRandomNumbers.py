@@ -0,0 +1,173 @@
+import copy
+import os
+import tempfile
+
+import numpy as np
+
+from scipy.stats import t as student
+
+from ..bandits import reward_tape
+from ..engine import run_fused
+
+
+class CommonRandomNumbers:
+    """
+    Comparación de agentes con números aleatorios comunes
+
+    En cada réplica se genera una única cinta con la recompensa de todos
+    los bandidos en cada tirada y todos los agentes juegan con ella, por
+    lo que dos agentes que eligen el mismo bandido en la misma tirada
+    obtienen la misma recompensa. Así las diferencias entre agentes no
+    se ven afectadas por el ruido de las recompensas y se necesitan
+    menos réplicas para obtener la misma precisión. La cinta se recorre
+    por bloques una sola vez y cada bloque lo juegan todos los agentes.
+    Las cintas grandes se guardan en un fichero mapeado en memoria.
+
+    Parámetros
+    ----------
+    policies : dict or array of class
+        Clases de los agentes, o funciones que reciben los bandidos y
+        devuelven un agente. Si es un diccionario las claves se usan
+        como nombre
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    episodes : integer
+        Número de tiradas de cada réplica
+    replicas : integer
+        Número de réplicas
+    baseline : string
+        Nombre del agente con el que se comparan el resto. Por defecto
+        el primero
+    confidence : float
+        Nivel de confianza de los intervalos
+    chunksize : integer
+        Número de tiradas de cada bloque de la cinta
+    max_memory : integer
+        Tamaño en bytes a partir del cual las cintas se guardan en un
+        fichero mapeado en memoria
+    directory : string
+        Directorio para los ficheros de las cintas
+    random_state : integer
+        Semilla con la que se generan las cintas
+
+    Métodos
+    -------
+    run :
+        Simula todas las réplicas
+    results :
+        Obtención de la recompensa de cada agente y de las diferencias
+        pareadas con su intervalo de confianza
+    """
+
+    def __init__(self, policies, bandits, episodes, replicas=10, baseline=None,
+                 confidence=0.95, chunksize=65536, max_memory=2**28, directory=None,
+                 random_state=None):
+        if isinstance(policies, dict):
+            self.policies = dict(policies)
+        else:
+            self.policies = {p.__name__: p for p in policies}
+
+        self.bandits = bandits
+        self.episodes = episodes
+        self.replicas = replicas
+        self.baseline = list(self.policies)[0] if baseline is None else baseline
+        self.confidence = confidence
+        self.chunksize = chunksize
+        self.max_memory = max_memory
+        self.directory = directory
+        self.random_state = random_state
+
+        self._rewards = {name: [] for name in self.policies}
+
+
+    def run(self):
+        seeds = np.random.SeedSequence(self.random_state).spawn(self.replicas)
+
+        for seed in seeds:
+            # Cada réplica empieza con los bandidos en su estado inicial,
+            # como el reloj de los no estacionarios
+            bandits = copy.deepcopy(self.bandits)
+
+            tape, path = self._tape(bandits, np.random.default_rng(seed))
+            agent_seed = int(seed.generate_state(1)[0])
+
+            try:
+                agents = {name: policy(bandits) for name, policy in self.policies.items()}
+
+                for start in range(0, self.episodes, self.chunksize):
+                    chunk = np.asarray(tape[start:start + self.chunksize])
+
+                    for agent in agents.values():
+                        run_fused(agent, tape=chunk, seed=(agent_seed + start) % 2**32)
+            finally:
+                del tape
+                if path is not None:
+                    os.remove(path)
+
+            for name, agent in agents.items():
+                self._rewards[name].append(agent.average_reward())
+
+        return self.results()
+
+
+    def results(self):
+        """ Resumen de la comparación
+
+        Retorna
+        -------
+        results: dict
+            Recompensa promedio de cada agente y, para cada agente
+            distinto del de referencia, la diferencia pareada media, su
+            intervalo de confianza y la reducción de varianza respecto
+            a una comparación con muestras independientes
+        """
+        rewards = {name: np.array(values) for name, values in self._rewards.items()}
+        baseline = rewards[self.baseline]
+        replicas = len(baseline)
+        quantile = student.ppf((1 + self.confidence) / 2, max(replicas - 1, 1))
+
+        results = {'mean': {name: float(np.mean(values)) for name, values in rewards.items()},
+                   'differences': {}}
+
+        for name, values in rewards.items():
+            if name == self.baseline:
+                continue
+
+            difference = values - baseline
+
+            # Con una sola réplica no se puede estimar la varianza, por lo
+            # que el intervalo se reduce a la media y no hay reducción
+            if replicas > 1:
+                error = quantile * np.std(difference, ddof=1) / np.sqrt(replicas)
+                independent = np.var(values, ddof=1) + np.var(baseline, ddof=1)
+                reduction = independent / max(np.var(difference, ddof=1), 1e-300)
+            else:
+                error = 0.0
+                reduction = 1.0
+
+            results['differences'][name] = {
+                'mean': float(np.mean(difference)),
+                'low': float(np.mean(difference) - error),
+                'high': float(np.mean(difference) + error),
+                'variance_reduction': float(reduction)}
+
+        return results
+
+
+    def _tape(self, bandits, random_state):
+        shape = (self.episodes, len(bandits))
+
+        if self.episodes * len(bandits) * 8 <= self.max_memory:
+            return reward_tape(bandits, self.episodes, random_state), None
+
+        fd, path = tempfile.mkstemp(suffix='.tape', dir=self.directory)
+        os.close(fd)
+        tape = np.memmap(path, dtype=float, mode='w+', shape=shape)
+
+        for start in range(0, self.episodes, self.chunksize):
+            end = min(start + self.chunksize, self.episodes)
+            reward_tape(bandits, end - start, random_state, out=tape[start:end])
+
+        tape.flush()
+
+        return tape, path
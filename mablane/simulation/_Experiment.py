@@ -0,0 +1,275 @@
+import copy
+import hashlib
+import itertools
+import json
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .. import __version__
+from .. import algortims
+from .. import bandits as bandits_module
+from ..engine import HAS_NUMBA, run_fused
+
+
+class Experiment:
+    """
+    Estudio declarativo con los resultados guardados en disco y
+    direccionados por su contenido
+
+    El estudio se describe con un diccionario, o un fichero JSON, con
+    los algoritmos, los conjuntos de bandidos, los horizontes y las
+    semillas. Cada combinación es una celda cuya especificación completa,
+    junto a la versión del paquete, se resume con SHA-256. El resultado
+    de cada celda se guarda en un fichero .npz cuyo nombre es ese
+    resumen, por lo que al volver a ejecutar el estudio solamente se
+    calculan las celdas que faltan o cuya especificación ha cambiado.
+    Los ficheros se escriben de forma atómica, así que un estudio
+    interrumpido se reanuda desde la última celda terminada.
+
+    Ejemplo de especificación:
+
+        {'algorithms': {'ucb1': 'UCB1', 'eps': {'class': 'Epsilon', 'epsilon': 0.1}},
+         'bandits': {'low': [0.02, 0.06, 0.10]},
+         'episodes': [1000, 10000],
+         'seeds': 10}
+
+    Los algoritmos se indican con su clase o su nombre en
+    mablane.algortims, opcionalmente con los parámetros. Los bandidos se
+    indican con objetos, con su probabilidad para BinomialBandit o con
+    un diccionario con el nombre de la clase y sus parámetros. Si seeds
+    es un número se usan las semillas de 0 a seeds - 1.
+
+    Parámetros
+    ----------
+    spec : dict or string
+        Especificación del estudio o ruta a un fichero JSON con ella
+    directory : string
+        Directorio en el que se guardan los resultados
+    workers : integer
+        Número de procesos con los que se calculan las celdas. Con 1 se
+        calculan en el proceso actual
+
+    Métodos
+    -------
+    run :
+        Calcula las celdas que no se encuentran en disco
+    results :
+        Obtención del resumen de todas las celdas calculadas
+    load :
+        Carga los resultados completos de una celda
+    """
+
+    def __init__(self, spec, directory='mablane-cache', workers=1):
+        if isinstance(spec, (str, os.PathLike)):
+            with open(spec) as f:
+                spec = json.load(f)
+
+        self.spec = spec
+        self.directory = directory
+        self.workers = workers
+
+        self.cells = list(self._cells(spec))
+
+
+    def run(self, force=False):
+        """ Calcula las celdas pendientes
+
+        Parámetros
+        ----------
+        force : boolean
+            Si es True se vuelven a calcular todas las celdas
+
+        Retorna
+        -------
+        computed: integer
+            Número de celdas calculadas
+        """
+        pending = [cell for cell in self.cells if force or not os.path.exists(self._path(cell))]
+
+        if self.workers == 1:
+            for cell in pending:
+                _run_cell(cell, self._path(cell))
+        else:
+            with ProcessPoolExecutor(self.workers) as executor:
+                for future in [executor.submit(_run_cell, cell, self._path(cell)) for cell in pending]:
+                    future.result()
+
+        return len(pending)
+
+
+    def results(self):
+        """ Resumen de las celdas calculadas
+
+        Retorna
+        -------
+        results: list of dict
+            Para cada celda, el algoritmo, los bandidos, el horizonte, la
+            semilla, la clave, la recompensa promedio y las tiradas de
+            cada bandido. Las celdas pendientes no se incluyen
+        """
+        results = []
+
+        for cell in self.cells:
+            if not os.path.exists(self._path(cell)):
+                continue
+
+            with np.load(self._path(cell)) as data:
+                results.append({'algorithm': cell['name'], 'bandits': cell['environment'],
+                                'episodes': cell['episodes'], 'seed': cell['seed'],
+                                'key': cell['key'],
+                                'average_reward': float(np.mean(data['rewards'], dtype=float)),
+                                'plays': data['plays']})
+
+        return results
+
+
+    def load(self, key):
+        """ Resultados completos de una celda
+
+        Parámetros
+        ----------
+        key : string
+            Clave de la celda
+
+        Retorna
+        -------
+        data: dict
+            Recompensa de cada tirada, tiradas de cada bandido y
+            especificación de la celda
+        """
+        with np.load(os.path.join(self.directory, key[:2], key + '.npz')) as data:
+            return {'rewards': data['rewards'], 'plays': data['plays'],
+                    'spec': json.loads(str(data['spec']))}
+
+
+    def _path(self, cell):
+        return os.path.join(self.directory, cell['key'][:2], cell['key'] + '.npz')
+
+
+    def _cells(self, spec):
+        algorithms = spec['algorithms']
+        if not isinstance(algorithms, dict):
+            algorithms = {_name(value): value for value in algorithms}
+
+        environments = spec['bandits']
+        if not isinstance(environments, dict):
+            environments = {'bandits': environments}
+
+        episodes = spec['episodes']
+        if np.isscalar(episodes):
+            episodes = [episodes]
+
+        seeds = spec.get('seeds', 1)
+        if np.isscalar(seeds):
+            seeds = range(seeds)
+
+        for (name, algorithm), (environment, bandits), horizon, seed in itertools.product(
+                algorithms.items(), environments.items(), episodes, seeds):
+            algorithm, params = _algorithm(algorithm)
+            bandits = [_bandit(bandit) for bandit in bandits]
+
+            # Especificación completa de la celda, de la que se obtiene la
+            # clave. Los atributos privados de los bandidos, como las bolsas
+            # de recompensas mapeadas en memoria, no forman parte de ella.
+            # Los núcleos compilados usan su propio generador aleatorio, por
+            # lo que el motor también forma parte de la clave
+            description = {'algorithm': _qualname(algorithm), 'params': params,
+                           'bandits': [_description(bandit) for bandit in bandits],
+                           'episodes': int(horizon), 'seed': int(seed), 'version': __version__,
+                           'backend': 'numba' if HAS_NUMBA else 'python'}
+            text = json.dumps(description, sort_keys=True, default=_json_default)
+
+            yield {'name': name, 'environment': environment, 'algorithm': algorithm,
+                   'params': params, 'bandits': bandits, 'episodes': int(horizon),
+                   'seed': int(seed), 'spec': text,
+                   'key': hashlib.sha256(text.encode()).hexdigest()}
+
+
+def _run_cell(cell, path):
+    # Copia de los bandidos para que las celdas no compartan su estado
+    agent = cell['algorithm'](copy.deepcopy(cell['bandits']), **cell['params'])
+    run_fused(agent, cell['episodes'], random_state=cell['seed'], seed=cell['seed'])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Escritura atómica: el fichero definitivo solamente aparece completo
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        np.savez_compressed(f, rewards=np.asarray(agent._rewards, dtype=np.float32),
+                            plays=np.asarray(agent._plays), spec=np.array(cell['spec']))
+    os.replace(temporary, path)
+
+
+def _algorithm(value):
+    if isinstance(value, str):
+        return getattr(algortims, value), {}
+
+    if isinstance(value, dict):
+        params = dict(value)
+        algorithm = params.pop('class')
+        if isinstance(algorithm, str):
+            algorithm = getattr(algortims, algorithm)
+
+        return algorithm, params
+
+    if isinstance(value, (tuple, list)):
+        algorithm, params = value
+        return _algorithm(algorithm)[0], dict(params)
+
+    return value, {}
+
+
+def _bandit(value):
+    if isinstance(value, (int, float)):
+        return bandits_module.BinomialBandit(value)
+
+    if isinstance(value, dict):
+        params = dict(value)
+        return getattr(bandits_module, params.pop('class'))(**params)
+
+    return value
+
+
+def _description(bandit):
+    description = {key: value for key, value in vars(bandit).items() if not key.startswith('_')}
+    description['class'] = _qualname(type(bandit))
+
+    # Los bandidos con datos propios se identifican por su contenido y no
+    # por la ruta o el vector de origen
+    if hasattr(bandit, 'digest'):
+        description.pop('source', None)
+        description['digest'] = bandit.digest
+
+    return description
+
+
+def _name(value):
+    algorithm, params = _algorithm(value)
+
+    if not params:
+        return algorithm.__name__
+
+    return algorithm.__name__ + '(' + ', '.join(f'{k}={v}' for k, v in sorted(params.items())) + ')'
+
+
+def _qualname(cls):
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    if isinstance(value, type):
+        return _qualname(value)
+
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+
+    raise TypeError(f'Cannot hash value of type {type(value).__name__}')
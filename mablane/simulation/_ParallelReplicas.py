@@ -0,0 +1,219 @@
+import copy
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..engine import run_fused
+from ._QuantileBands import QuantileBands
+
+
+# Estado de cada proceso de trabajo, que se fija una sola vez al crearlo
+_WORKER = {}
+
+
+class ParallelReplicas:
+    """
+    Simulación de muchas réplicas de una misma configuración repartidas
+    entre varios procesos
+
+    Las réplicas se reparten en bloques consecutivos entre los procesos,
+    que reciben la configuración una sola vez al arrancar y escriben la
+    recompensa de cada réplica directamente en matrices de memoria
+    compartida, por lo que en cada tarea solamente se envían los límites
+    del bloque. Si se indica una cinta común, esta también se coloca en
+    memoria compartida y todos los procesos la leen sin copiarla.
+
+    Cada réplica usa su propia semilla, derivada de random_state y del
+    número de réplica, tanto para la cinta como para el agente, así que
+    los resultados son idénticos con cualquier número de procesos.
+
+    Parámetros
+    ----------
+    algorithm : class
+        Clase del agente
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    episodes : integer
+        Número de tiradas de cada réplica
+    replicas : integer
+        Número de réplicas
+    params : dict
+        Parámetros con los que se crean los agentes
+    workers : integer
+        Número de procesos. Si es None se usan todos los procesadores y
+        con 1 se simula en el proceso actual
+    checkpoints : integer or array of integer
+        Tiradas en las que se guarda la recompensa promedio acumulada de
+        cada réplica. Si es un número se usan tantos puntos espaciados de
+        forma logarítmica
+    tape : array of float
+        Matriz (tiradas, bandidos) con las recompensas que juegan todas
+        las réplicas. Si es None cada réplica genera la suya
+    block : integer
+        Número de réplicas de cada tarea
+    random_state : integer
+        Semilla de la que se derivan las de las réplicas
+
+    Métodos
+    -------
+    run :
+        Simula todas las réplicas
+    results :
+        Obtención de la recompensa promedio y de la curva media
+    bands :
+        Obtención de las bandas de cuantiles de las curvas
+    """
+
+    def __init__(self, algorithm, bandits, episodes, replicas=1000, params=None, workers=None,
+                 checkpoints=100, tape=None, block=64, random_state=None):
+        if tape is not None and len(tape) < episodes:
+            raise ValueError(f'The tape has {len(tape)} rows but {episodes} episodes were requested')
+
+        self.algorithm = algorithm
+        self.bandits = bandits
+        self.episodes = episodes
+        self.replicas = replicas
+        self.params = {} if params is None else params
+        self.workers = os.cpu_count() if workers is None else workers
+        self.tape = tape
+        self.block = block
+        self.random_state = random_state
+
+        if np.isscalar(checkpoints):
+            checkpoints = np.geomspace(1, episodes, checkpoints).astype(int)
+
+        self.checkpoints = np.unique(np.append(checkpoints, episodes))
+
+        self.rewards = None
+        self.plays = None
+
+
+    def run(self):
+        entropy = np.random.SeedSequence(self.random_state).entropy
+        arrays = {'rewards': ((self.replicas, len(self.checkpoints)), np.float64),
+                  'plays': ((self.replicas, len(self.bandits)), np.int64)}
+
+        if self.tape is not None:
+            arrays['tape'] = (np.shape(self.tape), np.float64)
+
+        memory = {name: shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+                  for name, (shape, _) in arrays.items()}
+
+        try:
+            if self.tape is not None:
+                _view(memory['tape'], *arrays['tape'])[:] = self.tape
+
+            layout = {name: (memory[name].name, shape, dtype) for name, (shape, dtype) in arrays.items()}
+            config = (layout, self.algorithm, self.params, self.bandits, self.episodes,
+                      self.checkpoints, entropy)
+            blocks = [(start, min(start + self.block, self.replicas))
+                      for start in range(0, self.replicas, self.block)]
+
+            if self.workers == 1:
+                _initialize(*config)
+                for start, stop in blocks:
+                    _run_block(start, stop)
+            else:
+                with ProcessPoolExecutor(self.workers, initializer=_initialize, initargs=config) as executor:
+                    for future in [executor.submit(_run_block, start, stop) for start, stop in blocks]:
+                        future.result()
+
+            self.rewards = _view(memory['rewards'], *arrays['rewards']).copy()
+            self.plays = _view(memory['plays'], *arrays['plays']).copy()
+        finally:
+            _release()
+
+            for block in memory.values():
+                block.close()
+                block.unlink()
+
+        return self.results()
+
+
+    def results(self):
+        """ Resumen de las réplicas
+
+        Retorna
+        -------
+        results: dict
+            Recompensa promedio de todas las réplicas, su error estándar,
+            los puntos de control, la curva media y las tiradas medias de
+            cada bandido
+        """
+        final = self.rewards[:, -1]
+
+        return {'mean': float(np.mean(final)),
+                'error': float(np.std(final, ddof=1) / np.sqrt(len(final))) if len(final) > 1 else 0.0,
+                'checkpoints': self.checkpoints,
+                'curve': np.mean(self.rewards, axis=0),
+                'plays': np.mean(self.plays, axis=0)}
+
+
+    def bands(self, quantiles=(0.05, 0.5, 0.95)):
+        """ Bandas de cuantiles de la recompensa promedio acumulada
+
+        Parámetros
+        ----------
+        quantiles : array of float
+            Cuantiles que se estiman en cada punto de control
+
+        Retorna
+        -------
+        bands: QuantileBands
+            Bandas con todas las réplicas
+        """
+        bands = QuantileBands(self.checkpoints, quantiles)
+        bands.update(self.rewards)
+
+        return bands
+
+
+def _view(block, shape, dtype):
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _initialize(layout, algorithm, params, bandits, episodes, checkpoints, entropy):
+    _release()
+
+    _WORKER['memory'] = {name: shared_memory.SharedMemory(name=name_) for name, (name_, _, _) in layout.items()}
+    _WORKER['arrays'] = {name: _view(_WORKER['memory'][name], shape, dtype)
+                         for name, (_, shape, dtype) in layout.items()}
+    _WORKER.update(algorithm=algorithm, params=params, bandits=bandits, episodes=episodes,
+                   checkpoints=checkpoints, entropy=entropy)
+
+
+def _release():
+    # Se eliminan las vistas antes de cerrar los bloques compartidos
+    memory = _WORKER.pop('memory', {})
+    _WORKER.clear()
+
+    for block in memory.values():
+        block.close()
+
+
+def _run_block(start, stop):
+    arrays = _WORKER['arrays']
+    checkpoints = _WORKER['checkpoints']
+    tape = arrays.get('tape')
+
+    for replica in range(start, stop):
+        # Semilla de la réplica, la misma que el hijo replica de spawn
+        sequence = np.random.SeedSequence(_WORKER['entropy'], spawn_key=(replica,))
+        seed = int(sequence.generate_state(1)[0])
+
+        # Los bandidos con estado, como los no estacionarios, empiezan
+        # igual en todas las réplicas
+        agent = _WORKER['algorithm'](copy.deepcopy(_WORKER['bandits']), **_WORKER['params'])
+
+        if tape is None:
+            run_fused(agent, _WORKER['episodes'], random_state=np.random.default_rng(sequence), seed=seed)
+        else:
+            run_fused(agent, tape=tape[:_WORKER['episodes']], seed=seed)
+
+        cumulative = np.cumsum(agent._rewards, dtype=float)[checkpoints - 1]
+
+        arrays['rewards'][replica] = cumulative / checkpoints
+        arrays['plays'][replica] = agent._plays
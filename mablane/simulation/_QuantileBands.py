@@ -0,0 +1,208 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from .._SufficientStatistics import SufficientStatistics
+
+
+class QuantileBands:
+    """
+    Agregación en línea de las curvas de recompensa de muchas réplicas
+
+    Para cada uno de los puntos de control se mantiene la media y la
+    varianza de las réplicas con el algoritmo de Welford y una
+    aproximación de los cuantiles con el algoritmo P², que solamente
+    necesita cinco marcadores por cuantil. La memoria ocupada depende del
+    número de puntos de control y de cuantiles, pero no del de réplicas,
+    por lo que se pueden representar las bandas de 10^5 réplicas sin
+    guardarlas.
+
+    Parámetros
+    ----------
+    checkpoints : integer or array of integer
+        Número de tiradas en las que se evalúan las curvas. Si es un
+        número se usan num puntos espaciados de forma logarítmica entre
+        1 y ese número de tiradas
+    quantiles : array of float
+        Cuantiles que se estiman
+    num : integer
+        Número de puntos de control cuando checkpoints es un número
+
+    Métodos
+    -------
+    update :
+        Incorpora los valores de una o varias réplicas en los puntos de
+        control
+    update_rewards :
+        Incorpora la recompensa promedio acumulada de una réplica a
+        partir de las recompensas de cada tirada
+    mean :
+        Obtención de la media en cada punto de control
+    variance :
+        Obtención de la varianza en cada punto de control
+    quantile :
+        Obtención de un cuantil en cada punto de control
+    plot :
+        Representación gráfica de la mediana y las bandas
+
+    References
+    ----------
+    Raj Jain and Imrich Chlamtac. "The P² Algorithm for Dynamic
+    Calculation of Quantiles and Histograms Without Storing
+    Observations." Communications of the ACM 28(10):1076-1085, 1985.
+    """
+
+    def __init__(self, checkpoints, quantiles=(0.05, 0.5, 0.95), num=100):
+        if np.isscalar(checkpoints):
+            checkpoints = np.unique(np.geomspace(1, checkpoints, num).astype(int))
+
+        self.checkpoints = np.asarray(checkpoints)
+        self.quantiles = np.asarray(quantiles, dtype=float)
+        self.replicas = 0
+
+        num_checkpoints = len(self.checkpoints)
+
+        self._stats = SufficientStatistics(num_checkpoints, moments=2)
+
+        # Alturas y posiciones de los cinco marcadores de cada pareja de
+        # cuantil y punto de control, guardadas en filas contiguas para
+        # que cada paso del algoritmo sea una operación vectorizada
+        p = np.repeat(self.quantiles, num_checkpoints)
+        ones = np.ones_like(p)
+
+        self._heights = np.zeros((5, len(p)))
+        self._positions = np.arange(1.0, 6.0)[:, None] * ones
+        self._desired = np.vstack([ones, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 * ones])
+        self._increments = np.vstack([0 * ones, p / 2, p, (1 + p) / 2, ones])
+
+
+    def update(self, values):
+        """ Incorpora una o varias réplicas
+
+        Parámetros
+        ----------
+        values : array of float
+            Vector con el valor de una réplica en cada punto de control o
+            matriz (réplicas, puntos de control)
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+
+        index = np.tile(np.arange(len(self.checkpoints)), len(values))
+        self._stats.update_batch(index, values)
+
+        for row in values:
+            self._update_markers(row)
+
+
+    def update_rewards(self, rewards):
+        """ Incorpora una réplica a partir de sus recompensas
+
+        Parámetros
+        ----------
+        rewards : array of float
+            Recompensa de cada tirada, por ejemplo agent._rewards. Debe
+            contener al menos tantas tiradas como el último punto de
+            control
+        """
+        cumulative = np.cumsum(rewards, dtype=float)[self.checkpoints - 1]
+
+        self.update(cumulative / self.checkpoints)
+
+
+    def mean(self):
+        return self._stats.mean.copy()
+
+
+    def variance(self):
+        return self._stats.variance(ddof=1)
+
+
+    def quantile(self, q):
+        """ Estimación de un cuantil
+
+        Parámetros
+        ----------
+        q : float
+            Cuantil, debe ser uno de los indicados al crear el objeto
+
+        Retorna
+        -------
+        values: array of float
+            Valor estimado del cuantil en cada punto de control
+        """
+        matches = np.flatnonzero(np.isclose(self.quantiles, q))
+
+        if len(matches) == 0:
+            raise ValueError(f'Quantile {q} is not tracked, use one of {self.quantiles.tolist()}')
+
+        cells = slice(matches[0] * len(self.checkpoints), (matches[0] + 1) * len(self.checkpoints))
+
+        # Con menos de cinco réplicas los marcadores son las observaciones
+        if self.replicas < 5:
+            return np.quantile(self._heights[:self.replicas, cells], q, axis=0)
+
+        return self._heights[2, cells].copy()
+
+
+    def plot(self, log=False, label=None, bands=((0.05, 0.95),)):
+        if np.any(np.isclose(self.quantiles, 0.5)):
+            center = self.quantile(0.5)
+        else:
+            center = self.mean()
+
+        lines = plt.plot(self.checkpoints, center, label=label)
+
+        for low, high in bands:
+            plt.fill_between(self.checkpoints, self.quantile(low), self.quantile(high),
+                             color=lines[0].get_color(), alpha=0.2)
+
+        if log:
+            plt.xscale('log')
+
+
+    def _update_markers(self, values):
+        q = self._heights
+        n = self._positions
+        x = np.tile(values, len(self.quantiles))
+        self.replicas += 1
+
+        # Las cinco primeras observaciones son los marcadores iniciales
+        if self.replicas <= 5:
+            q[self.replicas - 1] = x
+
+            if self.replicas == 5:
+                q.sort(axis=0)
+
+            return
+
+        # Ajuste de los extremos y de las posiciones de los marcadores
+        # situados por encima de la celda en la que cae la observación
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        cell = (x >= q[1]).astype(int) + (x >= q[2]) + (x >= q[3])
+
+        n[1] += cell < 1
+        n[2] += cell < 2
+        n[3] += cell < 3
+        n[4] += 1
+        self._desired += self._increments
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            up = (d >= 1) & (n[i + 1] - n[i] > 1)
+            down = (d <= -1) & (n[i - 1] - n[i] < -1)
+            move = np.flatnonzero(up | down)
+
+            if len(move) == 0:
+                continue
+
+            d = np.where(up[move], 1.0, -1.0)
+            q0, q1, q2 = q[i - 1, move], q[i, move], q[i + 1, move]
+            n0, n1, n2 = n[i - 1, move], n[i, move], n[i + 1, move]
+
+            # Predicción parabólica y, si se sale del intervalo, lineal
+            parabolic = q1 + d / (n2 - n0) * ((n1 - n0 + d) * (q2 - q1) / (n2 - n1)
+                                              + (n2 - n1 - d) * (q1 - q0) / (n1 - n0))
+            linear = q1 + d * (np.where(d > 0, q2, q0) - q1) / (np.where(d > 0, n2, n0) - n1)
+
+            q[i, move] = np.where((q0 < parabolic) & (parabolic < q2), parabolic, linear)
+            n[i, move] += d
@@ -0,0 +1,247 @@
+import copy
+import math
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..engine import run_fused
+
+
+def _evaluate(algorithm, params, bandits, episodes, seeds):
+    """ Recompensa promedio de un agente en varias réplicas
+
+    Parámetros
+    ----------
+    algorithm : class
+        Clase del agente
+    params : dict
+        Hiperparámetros con los que se crea el agente
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    episodes : integer
+        Número de tiradas de cada réplica
+    seeds : array of integer
+        Semilla de cada una de las réplicas
+
+    Retorna
+    -------
+    rewards: array of float
+        Recompensa promedio obtenida en cada réplica
+    """
+    rewards = []
+
+    for seed in seeds:
+        # Cada réplica empieza con los bandidos en su estado inicial
+        agent = algorithm(copy.deepcopy(bandits), **params)
+        rewards.append(run_fused(agent, episodes, random_state=seed, seed=seed))
+
+    return rewards
+
+
+class SuccessiveHalving:
+    """
+    Ajuste de los hiperparámetros de un algoritmo mediante división
+    sucesiva (Successive Halving)
+
+    Se generan candidatos al azar en el espacio de búsqueda y se evalúan
+    con un número pequeño de réplicas simuladas. Solamente la fracción
+    1 / eta de los mejores pasa a la siguiente ronda, en la que el número
+    de réplicas se multiplica por eta, por lo que el cálculo se concentra
+    en las configuraciones prometedoras. Las evaluaciones se reparten
+    entre varios procesos y todas las configuraciones usan las mismas
+    semillas en cada réplica, con lo que las comparaciones son pareadas.
+
+    Parámetros
+    ----------
+    algorithm : class
+        Clase del agente, por ejemplo una de mablane.algortims
+    space : dict
+        Espacio de búsqueda. Para cada parámetro se indica una lista de
+        valores, una tupla (mínimo, máximo) para una distribución
+        uniforme o una distribución de scipy
+    bandits : array of Bandit
+        Vector con los bandidos con los que se simula
+    episodes : integer
+        Número de tiradas de cada réplica
+    candidates : integer
+        Número de configuraciones iniciales
+    min_replicas : integer
+        Número de réplicas de la primera ronda
+    max_replicas : integer
+        Número máximo de réplicas de una configuración
+    eta : integer
+        Factor de reducción entre rondas
+    workers : integer
+        Número de procesos. Si es None se usan todos los procesadores
+    random_state : integer
+        Semilla para generar las configuraciones y las réplicas
+
+    Métodos
+    -------
+    run :
+        Realiza la búsqueda y devuelve la mejor configuración
+
+    References
+    ----------
+    Kevin Jamieson and Ameet Talwalkar. "Non-stochastic Best Arm
+    Identification and Hyperparameter Optimization." Proceedings of the
+    19th International Conference on Artificial Intelligence and
+    Statistics, PMLR 51:240-248, 2016.
+    """
+
+    def __init__(self, algorithm, space, bandits, episodes, candidates=27, min_replicas=1,
+                 max_replicas=None, eta=3, workers=None, random_state=None):
+        self.algorithm = algorithm
+        self.space = space
+        self.bandits = bandits
+        self.episodes = episodes
+        self.candidates = candidates
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.eta = eta
+        self.workers = workers
+        self.random_state = random_state
+
+        self.best_params = None
+        self.best_score = -np.inf
+        self.trials = []
+
+
+    def run(self):
+        """ Realiza la búsqueda
+
+        Retorna
+        -------
+        params: dict
+            Mejor configuración encontrada. El registro completo de las
+            evaluaciones se encuentra en el atributo trials
+        """
+        rng = np.random.default_rng(self.random_state)
+        self._base_seed = int(rng.integers(2**31))
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            for bracket, (candidates, replicas) in enumerate(self._brackets()):
+                configurations = [self._sample(rng) for _ in range(candidates)]
+                self._bracket(executor, bracket, configurations, replicas)
+
+        return self.best_params
+
+
+    def _brackets(self):
+        yield self.candidates, self.min_replicas
+
+
+    def _bracket(self, executor, bracket, configurations, replicas):
+        scores = [[] for _ in configurations]
+        alive = list(range(len(configurations)))
+        rung = 0
+
+        while True:
+            # Solamente se simulan las réplicas que faltan a cada candidato
+            futures = {i: executor.submit(_evaluate, self.algorithm, configurations[i],
+                                          self.bandits, self.episodes,
+                                          self._seeds(len(scores[i]), replicas))
+                       for i in alive}
+
+            for i, future in futures.items():
+                scores[i].extend(future.result())
+                self.trials.append({'bracket': bracket, 'rung': rung,
+                                    'params': configurations[i],
+                                    'replicas': len(scores[i]),
+                                    'score': float(np.mean(scores[i]))})
+
+            alive.sort(key=lambda i: np.mean(scores[i]), reverse=True)
+
+            if len(alive) == 1 or (self.max_replicas is not None and replicas >= self.max_replicas):
+                break
+
+            alive = alive[:max(1, len(alive) // self.eta)]
+            replicas *= self.eta
+            if self.max_replicas is not None:
+                replicas = min(replicas, self.max_replicas)
+            rung += 1
+
+        best = alive[0]
+        if np.mean(scores[best]) > self.best_score:
+            self.best_score = float(np.mean(scores[best]))
+            self.best_params = configurations[best]
+
+
+    def _seeds(self, start, stop):
+        return [self._base_seed + i for i in range(start, stop)]
+
+
+    def _sample(self, rng):
+        params = {}
+
+        for name, values in self.space.items():
+            if isinstance(values, tuple):
+                params[name] = float(rng.uniform(*values))
+            elif hasattr(values, 'rvs'):
+                params[name] = float(values.rvs(random_state=rng))
+            else:
+                params[name] = values[rng.integers(len(values))]
+
+        return params
+
+
+class Hyperband(SuccessiveHalving):
+    """
+    Ajuste de los hiperparámetros de un algoritmo mediante Hyperband
+
+    Ejecuta varias rondas de división sucesiva que reparten el mismo
+    presupuesto de forma diferente: desde muchas configuraciones con
+    pocas réplicas hasta pocas configuraciones con todas las réplicas.
+    Así no es necesario elegir de antemano cuántas réplicas hacen falta
+    para distinguir las buenas configuraciones.
+
+    Parámetros
+    ----------
+    algorithm : class
+        Clase del agente, por ejemplo una de mablane.algortims
+    space : dict
+        Espacio de búsqueda. Para cada parámetro se indica una lista de
+        valores, una tupla (mínimo, máximo) para una distribución
+        uniforme o una distribución de scipy
+    bandits : array of Bandit
+        Vector con los bandidos con los que se simula
+    episodes : integer
+        Número de tiradas de cada réplica
+    max_replicas : integer
+        Número máximo de réplicas de una configuración
+    eta : integer
+        Factor de reducción entre rondas
+    workers : integer
+        Número de procesos. Si es None se usan todos los procesadores
+    random_state : integer
+        Semilla para generar las configuraciones y las réplicas
+
+    Métodos
+    -------
+    run :
+        Realiza la búsqueda y devuelve la mejor configuración
+
+    References
+    ----------
+    Lisha Li, Kevin Jamieson, Giulia DeSalvo, Afshin Rostamizadeh, and
+    Ameet Talwalkar. "Hyperband: A Novel Bandit-Based Approach to
+    Hyperparameter Optimization." Journal of Machine Learning Research
+    18 (2018) 1-52.
+    """
+
+    def __init__(self, algorithm, space, bandits, episodes, max_replicas=27, eta=3,
+                 workers=None, random_state=None):
+        super(Hyperband, self).__init__(algorithm, space, bandits, episodes,
+                                        max_replicas=max_replicas, eta=eta, workers=workers,
+                                        random_state=random_state)
+
+
+    def _brackets(self):
+        s_max = int(math.floor(math.log(self.max_replicas) / math.log(self.eta) + 1e-9))
+
+        for s in range(s_max, -1, -1):
+            candidates = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+            replicas = max(1, int(self.max_replicas * self.eta ** -s))
+
+            yield candidates, replicas
@@ -0,0 +1,9 @@
+from ._CommonRandomNumbers import CommonRandomNumbers
+from ._Experiment import Experiment
+from ._ParallelReplicas import ParallelReplicas
+from ._QuantileBands import QuantileBands
+from ._SuccessiveHalving import Hyperband, SuccessiveHalving
+from ._equivalence import check_equivalence, compare_engines, run_reference
+
+__all__ = ['CommonRandomNumbers', 'Experiment', 'Hyperband', 'ParallelReplicas', 'QuantileBands',
+           'SuccessiveHalving', 'check_equivalence', 'compare_engines', 'run_reference']
@@ -0,0 +1,197 @@
+import time
+
+import numpy as np
+
+from ..algortims import IndexPolicy
+from ..bandits import reward_tape
+from ..engine import KERNELS, run_fused
+from ..engine._fused import _attribute
+
+
+def check_equivalence(algorithm, bandits, episodes, params=None, engine=run_fused, state=None,
+                      checkpoints=10, seed=0, random_state=0, rtol=1e-7, atol=1e-9):
+    """ Comprueba que un motor rápido se comporta como el agente original
+
+    El agente de referencia juega tirada a tirada con select y record y
+    el motor juega por tramos hasta cada punto de control, ambos con la
+    misma cinta de recompensas y la misma semilla. En cada tirada se
+    compara el bandido elegido y en cada punto de control el estado de
+    los agentes, con tolerancias para las diferencias de redondeo. Si
+    los bandidos elegidos difieren se indica la primera tirada en la
+    que ocurre y, para las políticas de índices, si se debe a un empate
+    resuelto de otra forma. Además se mide el tiempo de ambos con
+    agentes nuevos.
+
+    Parámetros
+    ----------
+    algorithm : class
+        Clase del agente
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    episodes : integer
+        Número de tiradas
+    params : dict
+        Parámetros con los que se crean los agentes
+    engine : callable
+        Motor con la interfaz de run_fused: engine(agent, tape=tape,
+        seed=seed, out=out). Con seed None debe continuar la secuencia
+        de números aleatorios de la llamada anterior
+    state : array of string
+        Atributos del agente que se comparan. Por defecto las tiradas,
+        las medias y los valores adicionales registrados en KERNELS
+    checkpoints : integer or array of integer
+        Tiradas en las que se compara el estado. Si es un número se usan
+        tantos puntos espaciados de forma logarítmica
+    seed : integer
+        Semilla del generador usado por los agentes
+    random_state : numpy.random.Generator or integer
+        Generador o semilla con la que se genera la cinta
+    rtol : float
+        Tolerancia relativa en la comparación del estado y los índices
+    atol : float
+        Tolerancia absoluta en la comparación del estado y los índices
+
+    Retorna
+    -------
+    report: dict
+        Resultado de la comparación: si los agentes son equivalentes, la
+        primera tirada con bandidos distintos, su causa ('tie' o
+        'choice') y los bandidos elegidos, el primer punto de control y
+        atributo con el estado distinto, el mayor error de cada
+        atributo, los tiempos y la aceleración
+    """
+    params = {} if params is None else params
+    tape = reward_tape(bandits, episodes, random_state)
+
+    if np.isscalar(checkpoints):
+        checkpoints = np.geomspace(1, episodes, checkpoints).astype(int)
+
+    checkpoints = np.unique(np.append(checkpoints, episodes))
+
+    if state is None:
+        state = ['_plays', '_mean'] + (KERNELS[algorithm][1] if algorithm in KERNELS else [])
+
+    # Ejecución del motor por tramos, que además realiza la compilación
+    # antes de medir los tiempos. Los agentes se crean con la misma
+    # semilla por si usan números aleatorios al inicializarse
+    np.random.seed(seed)
+    fast = algorithm(bandits, **params)
+    arms = np.empty(episodes, dtype=np.int64)
+    snapshots = {}
+    start = 0
+
+    for stop in checkpoints:
+        engine(fast, tape=tape[start:stop], seed=seed if start == 0 else None, out=arms[start:stop])
+        snapshots[stop] = [np.array(_attribute(fast, name), dtype=float) for name in state]
+        start = stop
+
+    report = {'algorithm': algorithm.__name__, 'divergence': None, 'kind': None, 'arms': None,
+              'mismatch': None, 'max_error': dict.fromkeys(state, 0.0)}
+
+    np.random.seed(seed)
+    reference = algorithm(bandits, **params)
+    np.random.seed(seed)
+
+    for step, row in enumerate(tape):
+        bandit = reference.select()
+
+        if report['divergence'] is None and bandit != arms[step]:
+            report['divergence'] = step
+            report['kind'] = _divergence_kind(reference, step, bandit, arms[step], rtol, atol)
+            report['arms'] = (int(bandit), int(arms[step]))
+
+        reference.record(bandit, row[bandit])
+
+        # El estado solamente se compara mientras las trayectorias coinciden
+        if step + 1 in snapshots and report['divergence'] is None:
+            for name, values in zip(state, snapshots[step + 1]):
+                expected = np.array(_attribute(reference, name), dtype=float)
+                error = float(np.max(np.abs(values - expected), initial=0))
+                report['max_error'][name] = max(report['max_error'][name], error)
+
+                if report['mismatch'] is None and not np.allclose(values, expected, rtol, atol):
+                    report['mismatch'] = (step + 1, name)
+
+    report['equivalent'] = report['divergence'] is None and report['mismatch'] is None
+
+    # Tiempos con agentes nuevos y sin comparaciones
+    report['reference_time'] = _timed(lambda agent: run_reference(agent, tape, seed),
+                                      algorithm(bandits, **params))
+    report['engine_time'] = _timed(lambda agent: engine(agent, tape=tape, seed=seed),
+                                   algorithm(bandits, **params))
+    report['speedup'] = report['reference_time'] / max(report['engine_time'], 1e-12)
+
+    return report
+
+
+def compare_engines(bandits, episodes, algorithms=None, engine=run_fused, **kwargs):
+    """ Comprueba la equivalencia de un motor con varios algoritmos
+
+    Parámetros
+    ----------
+    bandits : array of Bandit
+        Vector con los bandidos con los que se debe jugar
+    episodes : integer
+        Número de tiradas
+    algorithms : array of class or dict
+        Clases de los agentes, o diccionario con las clases y sus
+        parámetros. Por defecto todos los algoritmos con núcleo
+    engine : callable
+        Motor con la interfaz de run_fused
+    **kwargs :
+        Argumentos adicionales de check_equivalence
+
+    Retorna
+    -------
+    reports: list of dict
+        Resultado de la comparación de cada algoritmo
+    """
+    if algorithms is None:
+        algorithms = list(KERNELS)
+
+    if not isinstance(algorithms, dict):
+        algorithms = {algorithm: None for algorithm in algorithms}
+
+    return [check_equivalence(algorithm, bandits, episodes, params, engine, **kwargs)
+            for algorithm, params in algorithms.items()]
+
+
+def run_reference(agent, tape, seed=None, out=None):
+    """ Juega la cinta tirada a tirada con los métodos del agente
+
+    Tiene la interfaz de run_fused, por lo que sirve de referencia con
+    la que comparar los motores rápidos
+    """
+    if seed is not None:
+        np.random.seed(seed)
+
+    for step, row in enumerate(tape):
+        bandit = agent.select()
+        agent.record(bandit, row[bandit])
+
+        if out is not None:
+            out[step] = bandit
+
+    return agent.average_reward()
+
+
+def _divergence_kind(agent, total, bandit, other, rtol, atol):
+    # Con las políticas de índices se comprueba si ambos bandidos tenían
+    # el mayor índice, en cuyo caso la diferencia se debe al desempate
+    if not isinstance(agent, IndexPolicy):
+        return 'choice'
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        index = np.asarray(agent._index(total, np.array([bandit, other])), dtype=float)
+
+    if np.isclose(index[0], index[1], rtol, atol, equal_nan=True):
+        return 'tie'
+
+    return 'choice'
+
+
+def _timed(play, agent):
+    start = time.perf_counter()
+    play(agent)
+
+    return time.perf_counter() - start
@@ -29,6 +29,10 @@ setup(
 
     install_requires=['matplotlib', 'numpy', 'scipy', 'statsmodels'],
 
+    extras_require={
+        'jit': ['numba'],
+    },
+
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'License :: OSI Approved :: MIT License',
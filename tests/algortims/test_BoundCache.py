@@ -0,0 +1,66 @@
+import numpy as np
+
+from mablane.algortims import BoundCache, CPUCB, KLUCB
+from mablane.bandits import BinomialBandit
+
+
+def test_bound_cache(tmp_path):
+    calls = []
+
+    def bound(successes, plays, total):
+        calls.append(len(plays))
+        return successes / plays + np.log(total)
+
+    path = str(tmp_path / 'bounds.npz')
+    cache = BoundCache(maxsize=4, resolution=1, path=path)
+
+    # En los puntos de la rejilla la cota es exacta y se interpola entre ellos
+    assert np.allclose(cache.lookup(bound, [1, 2], [2, 4], 4), [0.5 + np.log(4)] * 2)
+    assert np.allclose(cache.lookup(bound, [1], [2], 6), [0.5 + np.log(4) + np.log2(1.5) * np.log(2)])
+    assert cache.hits == 1 and cache.misses == 3 and calls == [2, 1]
+
+    # Solamente se conservan las últimas maxsize cotas
+    cache.lookup(bound, [3, 4], [8, 8], 16)
+    assert len(cache._values) == 4
+
+    cache.save()
+    assert len(BoundCache(path=path)._values) == 4
+
+
+def test_cpucb_cache():
+    bandits = [BinomialBandit(p) for p in (0.1, 0.2, 0.3)]
+    cache = BoundCache()
+
+    np.random.seed(0)
+    CPUCB(bandits, cache=cache).run(300)
+
+    assert cache.hits > 0
+    assert 0 < cache.hit_rate < 1
+
+
+def test_shared_cache_fingerprints(tmp_path):
+    bandits = [BinomialBandit(p) for p in (0.1, 0.2, 0.3)]
+    successes = np.array([1, 2, 3])
+    plays = np.array([4, 4, 6])
+    path = str(tmp_path / 'bounds.npz')
+    cache = BoundCache(resolution=None, path=path)
+
+    # Los agentes con distintos parámetros comparten la caché sin leer
+    # las cotas de los demás
+    agents = [CPUCB(bandits, c=1, cache=cache), CPUCB(bandits, c=3, cache=cache),
+              CPUCB(bandits, c=1, method='wilson', cache=cache), KLUCB(bandits, cache=cache)]
+
+    for agent in agents:
+        assert np.allclose(cache.lookup(agent._bound, successes, plays, 20, agent._fingerprint()),
+                           agent._bound(successes, plays, 20))
+
+    assert cache.hits == 0 and len(cache._values) == 12
+
+    cache.save()
+    loaded = BoundCache(resolution=None, path=path)
+
+    for agent in agents:
+        assert np.allclose(loaded.lookup(agent._bound, successes, plays, 20, agent._fingerprint()),
+                           agent._bound(successes, plays, 20))
+
+    assert loaded.misses == 0
@@ -0,0 +1,33 @@
+import numpy as np
+
+from mablane.algortims import CUSUMUCB, GLRklUCB, MonitoredUCB
+from mablane.bandits import BinomialBandit, PiecewiseBinomialBandit
+from mablane.engine import run_fused
+
+
+def test_change_detection_resets_changed_arm():
+    for algorithm in (CUSUMUCB, MonitoredUCB, GLRklUCB):
+        bandits = [PiecewiseBinomialBandit([0.9, 0.1], [2000]), BinomialBandit(0.5)]
+        agent = algorithm(bandits)
+
+        run_fused(agent, 4000, random_state=0, seed=0)
+
+        # El cambio del primer bandido se detecta poco después de ocurrir
+        steps = [step for step, bandit in agent.changes if bandit == 0 and step >= 2000]
+        assert steps and steps[0] < 2500, algorithm.__name__
+        assert np.argmax(agent._mean) == 1
+
+
+def test_glr_cumulative_sums():
+    agent = GLRklUCB([BinomialBandit(0.5), BinomialBandit(0.5)])
+    rewards = np.random.default_rng(0).integers(0, 2, 300).astype(float)
+
+    for reward in rewards:
+        agent.record(0, reward)
+
+    # El vector crece por duplicación y guarda las sumas desde el reinicio
+    restart = agent._restarts[0]
+    n = agent._length[0]
+
+    assert len(agent._cumsum[0]) >= n + 1
+    assert np.allclose(agent._cumsum[0][1:n + 1], np.cumsum(rewards[restart:]))
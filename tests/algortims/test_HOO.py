@@ -0,0 +1,21 @@
+import numpy as np
+
+from mablane.algortims import HOO
+from mablane.bandits import BinomialBandit
+
+
+def test_hoo_tree_statistics():
+    bandits = [BinomialBandit(p) for p in np.linspace(0.1, 0.9, 5)]
+    agent = HOO(bandits)
+
+    np.random.seed(0)
+    agent.run(500)
+
+    # Cada nodo acumula las tiradas de los bandidos de su intervalo
+    assert agent._leaves == 8
+    assert agent._tree.count[1] == 500
+    assert np.array_equal(agent._tree.count[8:13], agent._plays)
+    assert agent._tree.count[2] == agent._plays[:4].sum()
+    assert np.all(agent._tree.count[13:] == 0)
+
+    assert np.argmax(agent._plays) == 4
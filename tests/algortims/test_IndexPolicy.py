@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+
+from mablane.algortims import UCB1, UCBNormal
+from mablane.bandits import BinomialBandit
+
+
+def test_select_slate():
+    bandits = [BinomialBandit(0.5) for _ in range(5)]
+    agent = UCB1(bandits)
+
+    # Primero se muestran los bandidos sin tiradas
+    slate = agent.select_slate(3)
+    assert len(set(slate)) == 3
+
+    agent.record_slate(slate, [0, 1, 1], model='cascade')
+    assert np.array_equal(agent._plays[slate], [1, 1, 0])
+
+    for bandit, mean in enumerate([0.1, 0.9, 0.5, 0.3, 0.7]):
+        agent.record(bandit, mean)
+
+    assert np.array_equal(agent.select_slate(5), np.argsort(-agent._index(len(agent._rewards), np.arange(5))))
+
+
+def test_lazy_index():
+    bandits = [BinomialBandit(p) for p in (0.1, 0.5, 0.9)]
+    agent = UCB1(bandits, lazy=True, staleness=2)
+
+    np.random.seed(0)
+    agent.run(200)
+
+    # El índice del bandido jugado se recalcula y el resto se mantiene
+    # hasta la siguiente actualización completa
+    agent._lazy_index(len(agent._rewards))
+    cache = agent._cache.copy()
+
+    agent.record(0, 1)
+    total = len(agent._rewards)
+    agent._lazy_index(total)
+
+    assert agent._next_refresh <= 2 * total
+    assert agent._cache[0] == agent._index(total, np.array([0]))[0]
+    assert np.array_equal(agent._cache[1:], cache[1:])
+
+
+def test_lazy_index_without_records():
+    bandits = [BinomialBandit(p) for p in (0.1, 0.5, 0.9)]
+    agent = UCB1(bandits, lazy=True)
+
+    np.random.seed(0)
+    agent.run(50)
+
+    # Dos selecciones seguidas sin registros entre ellas
+    assert agent.select() == agent.select()
+
+    fitted = UCB1(bandits, lazy=True)
+    fitted.fit_from_logs(np.array([0, 1, 2, 2]), np.array([0.0, 1.0, 1.0, 0.0]))
+
+    assert fitted.select() in range(3)
+
+
+def test_ucb_normal_heap_matches_scan():
+    bandits = [BinomialBandit(p) for p in (0.2, 0.4, 0.4, 0.6, 0.8)]
+    agent = UCBNormal(bandits)
+    rng = np.random.default_rng(0)
+
+    for total in range(2000):
+        # Recorrido lineal: el bandido con menos tiradas por debajo del
+        # mínimo, con los empates a favor del de menor índice
+        min_plays = math.ceil(8 * math.log(total)) if total > 0 else 1
+        scan = int(np.argmin(agent._plays)) if np.min(agent._plays) < min_plays else None
+
+        state = np.random.get_state()
+        assert agent._forced(total) == scan, total
+        assert np.array_equal(np.random.get_state()[1], state[1])
+
+        bandit = scan if scan is not None else int(rng.integers(5))
+        agent.record(bandit, float(rng.random() < 0.5))
+
+
+def test_elimination():
+    bandits = [BinomialBandit(p) for p in (0.1, 0.2, 0.9)]
+
+    np.random.seed(0)
+    agent = UCB1(bandits, elimination='permanent')
+    agent.run(2000)
+
+    # Los bandidos dominados se retiran y no se vuelven a jugar
+    assert np.array_equal(agent._active, [2])
+
+    plays = agent._plays.copy()
+    agent.run(100)
+    assert np.array_equal(agent._plays[:2], plays[:2])
+
+
+def test_periodic_restore_with_batches():
+    bandits = [BinomialBandit(p) for p in (0.1, 0.2, 0.9)]
+    agent = UCB1(bandits, elimination='periodic', period=100)
+
+    for _ in range(30):
+        agent.record_batch([0, 1, 2], [0.0, 0.0, 1.0])
+
+    agent.select()
+    assert np.array_equal(agent._active, [2])
+
+    # Los lotes de tres tiradas saltan los múltiplos de period, pero los
+    # bandidos se restauran igualmente al pasar period tiradas
+    for _ in range(4):
+        agent.record_batch([2, 2, 2], [1.0, 1.0, 1.0])
+        agent.select()
+
+    assert agent._last_restore == 102
+
+
+class _Normal:
+    # Bandido normal local con recompensas fuera de [0, 1]
+    def __init__(self, mu, sigma):
+        self.mu = mu
+        self.sigma = sigma
+        self.reward = mu
+
+    def pull(self, size=None, random_state=None):
+        generator = np.random if random_state is None else random_state
+
+        return generator.normal(self.mu, self.sigma, size)
+
+
+def test_elimination_with_reward_scale():
+    bandits = [_Normal(100, 50), _Normal(110, 50)]
+
+    # Con recompensas fuera de [0, 1] el radio se ajusta a su amplitud y
+    # el mejor bandido no se elimina
+    for seed in range(10):
+        np.random.seed(seed)
+        agent = UCBNormal(bandits, elimination='permanent')
+        agent.run(3000)
+
+        assert 1 in agent._active, seed
+
+    # Con una amplitud dada se obtiene el mismo radio que con recompensas
+    # en [0, 1] y la misma escala
+    scaled = UCB1(bandits, elimination='permanent', scale=200)
+    unit = UCB1(bandits, elimination='permanent', scale=1)
+
+    for agent, factor in ((scaled, 200), (unit, 1)):
+        agent.record_batch([0, 0, 1], factor * np.array([0.2, 0.4, 0.6]))
+
+    assert np.allclose(scaled._radius(3, np.arange(2)), 200 * unit._radius(3, np.arange(2)))
@@ -0,0 +1,59 @@
+import numpy as np
+
+from mablane.algortims import HOO, Exp3, ReinforcementComparison, ThompsonSampling, UCBV
+from mablane.bandits import BinomialBandit
+
+
+def test_fit_from_logs_matches_record():
+    bandits = [BinomialBandit(p) for p in (0.2, 0.5, 0.7)]
+
+    rng = np.random.default_rng(0)
+    arms = rng.integers(3, size=500)
+    rewards = (rng.random(500) < 0.5).astype(float)
+
+    for algorithm, extra in [(UCBV, ['_stats.m2']), (Exp3, ['_weights']),
+                             (ReinforcementComparison, ['_pi', '_r']),
+                             (ThompsonSampling, ['_alpha', '_beta'])]:
+        reference = algorithm(bandits)
+        for bandit, reward in zip(arms, rewards):
+            reference.record(bandit, reward)
+
+        # Los registros se leen por bloques desde una matriz
+        agent = algorithm(bandits).fit_from_logs(arms[:100], rewards[:100])
+        agent.fit_from_logs(np.column_stack([arms[100:], rewards[100:]]))
+
+        # El histórico conserva el orden de los registros
+        assert agent._rewards == reference._rewards
+        assert np.array_equal(agent._plays, reference._plays)
+
+        for name in ['_mean'] + extra:
+            value, expected = agent, reference
+            for part in name.split('.'):
+                value, expected = getattr(value, part), getattr(expected, part)
+
+            assert np.allclose(value, expected), (algorithm.__name__, name)
+
+
+def test_fit_from_logs_hoo():
+    bandits = [BinomialBandit(p) for p in np.linspace(0, 1, 16)]
+
+    rng = np.random.default_rng(0)
+    arms = rng.integers(16, size=300)
+    rewards = (rng.random(300) < 0.5).astype(float)
+
+    reference = HOO(bandits)
+    for bandit, reward in zip(arms, rewards):
+        reference.record(bandit, reward)
+
+    agent = HOO(bandits).fit_from_logs(arms, rewards)
+
+    assert agent._rewards == reference._rewards
+    assert np.allclose(agent._tree.mean, reference._tree.mean)
+    assert np.array_equal(agent._tree.count, reference._tree.count)
+
+    # Los valores B de las hojas usan el total de registros
+    leaves = agent._leaves + np.unique(arms)
+    count = agent._tree.count[leaves]
+    u = agent._tree.mean[leaves] + np.sqrt(2 * np.log(300) / count) + agent._variation[leaves]
+
+    assert np.allclose(agent._b[leaves], u)
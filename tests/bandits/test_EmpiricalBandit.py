@@ -0,0 +1,43 @@
+import pickle
+
+import numpy as np
+
+from mablane.bandits import EmpiricalBandit, reward_tape
+
+
+def test_empirical_bandit(tmp_path):
+    path = str(tmp_path / 'pools.npy')
+    np.save(path, np.array([0, 0, 1, 1, 1, 5, 6, 7], dtype=float))
+
+    low, high = EmpiricalBandit.from_pools(path, [5, 3], replace=False)
+
+    assert isinstance(low._pool, np.memmap)
+    assert low.reward == 0.6
+
+    # Sin reemplazo cada bolsa se agota antes de volver a empezar
+    rng = np.random.default_rng(0)
+    assert sorted(high.pull(3, rng)) == [5, 6, 7]
+    assert sorted(low.pull(10, rng)) == [0, 0, 0, 0, 1, 1, 1, 1, 1, 1]
+
+    # Al serializar solamente se guarda la ruta
+    copy = pickle.loads(pickle.dumps(high))
+    assert isinstance(copy._pool, np.memmap)
+    assert len(pickle.dumps(high)) < 1000
+
+    tape = reward_tape([low, high], 20, random_state=1)
+    assert set(tape[:, 1]) <= {5, 6, 7}
+
+
+def test_empirical_bandit_digest(tmp_path):
+    path = str(tmp_path / 'pool.npy')
+    np.save(path, np.array([0, 1, 1, 0], dtype=float))
+
+    bandit = EmpiricalBandit(path)
+    digest = bandit.digest
+
+    assert EmpiricalBandit(np.array([0, 1, 1, 0], dtype=float)).digest == digest
+
+    # Al modificar el fichero cambian el resumen y la recompensa media
+    np.save(path, np.array([1, 1, 1, 1, 1], dtype=float))
+    assert bandit.digest != digest
+    assert bandit.reward == 1.0
@@ -0,0 +1,80 @@
+import numpy as np
+
+from mablane.algortims import Epsilon
+from mablane.bandits import Clock, DriftingBinomialBandit, PiecewiseBinomialBandit, reward_tape
+
+
+def test_piecewise_bandit_chunks():
+    bandit = PiecewiseBinomialBandit([0.0, 1.0], [5])
+
+    # Los bloques consecutivos continúan el reloj del bandido
+    assert np.array_equal(bandit.pull(3), [0, 0, 0])
+    assert np.array_equal(bandit.pull(4), [0, 0, 1, 1])
+    assert bandit.probability == 1.0
+
+    bandit.reset()
+    assert bandit.pull() == 0
+
+
+def test_drifting_bandit_tape():
+    bandits = [DriftingBinomialBandit(0.0, 1.0, 100), DriftingBinomialBandit(0.0, 1.0, 100, periodic=True)]
+
+    assert np.allclose(bandits[0].probability_at(np.array([0, 50, 200])), [0, 0.5, 1])
+    assert np.allclose(bandits[1].probability_at(np.array([0, 50, 100])), [0, 1, 0])
+
+    tape = reward_tape(bandits, 100, random_state=0)
+    assert tape[:, 0].sum() > 25 and tape[:25, 0].sum() < tape[75:, 0].sum()
+    assert all(bandit.step == 100 for bandit in bandits)
+
+
+def test_shared_clock():
+    clock = Clock()
+    bandits = [PiecewiseBinomialBandit([0.0, 1.0], [50], clock=clock),
+               PiecewiseBinomialBandit([1.0, 0.0], [50], clock=clock)]
+
+    # Con run cada tirada avanza una ronda, juegue el bandido que juegue
+    agent = Epsilon(bandits, epsilon=0.5)
+    agent.run(60)
+
+    assert bandits[0].step == bandits[1].step == 60
+    assert bandits[0].probability == 1.0 and bandits[1].probability == 0.0
+
+    # La cinta avanza el reloj común una vez por fila
+    clock.reset()
+    tape = reward_tape(bandits, 100, random_state=0)
+
+    assert clock.step == 100
+    assert np.array_equal(tape[:50], np.tile([0, 1], (50, 1)))
+    assert np.array_equal(tape[50:], np.tile([1, 0], (50, 1)))
+
+
+class _Constant:
+    # Bandido estacionario local sin reloj
+    reward = 0.5
+
+    def pull(self, size=None, random_state=None):
+        return 0.5 if size is None else np.full(size, 0.5)
+
+
+def test_private_clocks_follow_rounds():
+    from mablane.engine import run_fused
+
+    # Sin un reloj común los relojes de cada bandido avanzan igualmente
+    # una ronda por tirada, también al jugar un bandido estacionario
+    bandits = [PiecewiseBinomialBandit([0.0, 1.0], [50]), DriftingBinomialBandit(0.0, 1.0, 100), _Constant()]
+
+    np.random.seed(0)
+    Epsilon(bandits, epsilon=0.5).run(60)
+    assert bandits[0].step == bandits[1].step == 60
+
+    for bandit in bandits[:2]:
+        bandit.reset()
+
+    run_fused(Epsilon(bandits, epsilon=0.5), 60, random_state=0, seed=0)
+    assert bandits[0].step == bandits[1].step == 60
+
+    for bandit in bandits[:2]:
+        bandit.reset()
+
+    reward_tape(bandits, 60, random_state=0)
+    assert bandits[0].step == bandits[1].step == 60
@@ -0,0 +1,49 @@
+import numpy as np
+
+from mablane.contextual import HybridLinUCB
+
+
+def test_hybrid_linucb_statistics():
+    rng = np.random.default_rng(0)
+    contexts = rng.random((60, 3))
+    shared = rng.random((60, 2))
+    bandits = rng.integers(0, 3, 60)
+    rewards = rng.random(60)
+
+    agent = HybridLinUCB(3, 3, shared_dimension=2)
+    agent.update(bandits[:25], contexts[:25], rewards[:25], shared[:25])
+    agent.update(bandits[25:], contexts[25:], rewards[25:], shared[25:])
+
+    # Estadísticos del algoritmo 2 de Li et al. calculados de una vez
+    A0 = np.eye(2) + shared.T @ shared
+    b0 = shared.T @ rewards
+
+    for bandit in range(3):
+        x, z, r = contexts[bandits == bandit], shared[bandits == bandit], rewards[bandits == bandit]
+        A = np.eye(3) + x.T @ x
+        B = x.T @ z
+        b = x.T @ r
+
+        assert np.allclose(agent._inverse[bandit], np.linalg.inv(A))
+        assert np.allclose(agent._B[bandit], B)
+
+        A0 -= B.T @ np.linalg.solve(A, B)
+        b0 -= B.T @ np.linalg.solve(A, b)
+
+    assert np.allclose(agent._shared_inverse, np.linalg.inv(A0))
+    assert np.allclose(agent._shared_b, b0)
+
+    # Índice de un contexto con la fórmula directa
+    beta = np.linalg.solve(A0, b0)
+    x, z = contexts[0], shared[0]
+
+    for bandit in range(3):
+        A_inv = agent._inverse[bandit]
+        B = agent._B[bandit]
+        theta = A_inv @ (agent._b[bandit] - B @ beta)
+        C = np.linalg.inv(A0)
+        s = z @ C @ z - 2 * z @ C @ B.T @ A_inv @ x + x @ A_inv @ x + x @ A_inv @ B @ C @ B.T @ A_inv @ x
+
+        assert np.isclose(agent.scores(x, z)[0, bandit], z @ beta + x @ theta + np.sqrt(s))
+
+    assert agent.select(contexts, shared).shape == (60,)
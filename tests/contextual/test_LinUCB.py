@@ -0,0 +1,41 @@
+import numpy as np
+
+from mablane.contextual import LinTS, LinUCB
+
+def test_linucb_inverse():
+    contexts = np.random.random((50, 3))
+    bandits = np.random.choice(2, 50)
+    rewards = np.random.random(50)
+
+    agent = LinUCB(2, 3)
+    agent.update(bandits, contexts, rewards)
+
+    for bandit in range(2):
+        x = contexts[bandits == bandit]
+        design = np.eye(3) + x.T @ x
+
+        assert np.allclose(agent._inverse[bandit], np.linalg.inv(design))
+        assert np.allclose(agent._theta[bandit], np.linalg.solve(design, x.T @ rewards[bandits == bandit]))
+
+    assert agent.select(contexts).shape == (50,)
+    assert agent.scores(contexts).shape == (50, 2)
+
+
+def test_lints_posterior_samples():
+    rng = np.random.default_rng(0)
+    contexts = rng.random((200, 2))
+    bandits = rng.integers(0, 2, 200)
+    rewards = contexts @ np.array([1.0, -1.0]) + (bandits == 1)
+
+    agent = LinTS(2, 2, v=0.5)
+    agent.update(bandits, contexts, rewards)
+
+    # Las muestras se centran en la predicción con la escala indicada
+    np.random.seed(0)
+    x = np.tile(contexts[:1], (20000, 1))
+    samples = agent.scores(x)
+    width = np.sqrt(np.einsum('j,ijk,k->i', x[0], agent._inverse, x[0]))
+
+    assert np.allclose(samples.mean(axis=0), x[0] @ agent._theta.T, atol=0.01)
+    assert np.allclose(samples.std(axis=0), 0.5 * width, rtol=0.05)
+    assert agent.select(contexts).shape == (200,)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from mablane.algortims import Exp3, UCBNormal
+from mablane.bandits import BinomialBandit, reward_tape
+from mablane.engine import HAS_NUMBA, run_fused
+
+def test_run_fused_exp3():
+    bandits = [BinomialBandit(0.2), BinomialBandit(0.5)]
+    tape = reward_tape(bandits, 500, random_state=1)
+
+    reference = Exp3(bandits)
+    np.random.seed(0)
+    for row in tape:
+        bandit = reference.select()
+        reference.record(bandit, row[bandit])
+
+    agent = Exp3(bandits)
+    run_fused(agent, tape=tape, chunksize=128, seed=0)
+
+    assert np.array_equal(agent._plays, reference._plays)
+    assert np.allclose(agent._weights, reference._weights)
+    assert agent.average_reward() == reference.average_reward()
+
+
+def test_run_fused_arguments_and_refresh():
+    bandits = [BinomialBandit(0.2), BinomialBandit(0.5), BinomialBandit(0.8)]
+
+    with pytest.raises(ValueError):
+        run_fused(Exp3(bandits))
+
+    # Tras devolver el estado al agente el montículo refleja las tiradas
+    agent = UCBNormal(bandits)
+    run_fused(agent, 300, random_state=0, seed=0)
+
+    if HAS_NUMBA:
+        assert sorted(agent._heap) == sorted(zip(agent._plays.tolist(), range(3)))
+
+    assert agent._forced(10**6) == int(np.argmin(agent._plays))
+
+
+def test_kernels_match_reference_with_ties():
+    pytest.importorskip('numba')
+
+    from mablane.algortims import UCB1, BayesUCB
+
+    # Recompensas repetidas, y mayores que N en BayesUCB, para que los
+    # índices empaten con frecuencia y el suelo de los fracasos actúe
+    bandits = [BinomialBandit(0.5) for _ in range(4)]
+    rng = np.random.default_rng(2)
+    tape = rng.integers(0, 3, (600, 4)).astype(float)
+
+    for algorithm in (UCB1, BayesUCB):
+        reference = algorithm(bandits)
+        np.random.seed(5)
+        for row in tape:
+            bandit = reference.select()
+            reference.record(bandit, row[bandit])
+
+        agent = algorithm(bandits)
+        run_fused(agent, tape=tape, chunksize=128, seed=5)
+
+        assert np.array_equal(agent._plays, reference._plays), algorithm
+        assert agent.average_reward() == reference.average_reward()
+
+    assert np.array_equal(agent._beta, reference._beta)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from mablane.evaluation import LoggedData
+
+
+def test_logged_data_chunks(tmp_path):
+    data = np.array([[0, 1.0, 0.5], [1, 0.0, 0.25], [2, 1.0, 0.25], [1, 1.0, 0.25], [0, 0.0, 0.5]])
+
+    path = str(tmp_path / 'log.csv')
+    np.savetxt(path, data, delimiter=',', header='bandit,reward,propensity', comments='')
+
+    # Los bloques de CSV, NPY y memoria son iguales
+    np.save(str(tmp_path / 'log.npy'), data)
+
+    for source in (LoggedData(path, chunksize=2, skiprows=1), LoggedData(str(tmp_path / 'log.npy'), chunksize=2),
+                   LoggedData(data, chunksize=2)):
+        chunks = list(source)
+
+        assert [len(bandits) for bandits, _, _ in chunks] == [2, 2, 1]
+        assert np.array_equal(np.concatenate([bandits for bandits, _, _ in chunks]), [0, 1, 2, 1, 0])
+        assert np.allclose(np.concatenate([p for _, _, p in chunks]), data[:, 2])
+
+    bandits, rewards, propensities = next(iter(LoggedData(data[:, :2])))
+    assert propensities is None and np.array_equal(rewards, data[:, 1])
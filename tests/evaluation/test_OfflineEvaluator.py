@@ -0,0 +1,55 @@
+import numpy as np
+
+from mablane.algortims import UCB1, Epsilon
+from mablane.bandits import BinomialBandit
+from mablane.evaluation import OfflineEvaluator
+
+
+class Fixed(Epsilon):
+    """ Agente que siempre juega el mismo bandido """
+
+    def __init__(self, bandits, arm):
+        self.arm = arm
+        self.selections = 0
+
+        super(Fixed, self).__init__(bandits, epsilon=0)
+
+
+    def select(self):
+        self.selections += 1
+        return self.arm
+
+
+def test_offline_estimators():
+    # Registro generado con una política uniforme sobre tres bandidos
+    rng = np.random.default_rng(0)
+    means = np.array([0.2, 0.5, 0.8])
+    arms = rng.integers(0, 3, 30000)
+    rewards = (rng.random(30000) < means[arms]).astype(float)
+    data = np.column_stack([arms, rewards, np.full(30000, 1 / 3)])
+
+    bandits = [BinomialBandit(p) for p in means]
+    fixed = Fixed(bandits, 2)
+    evaluator = OfflineEvaluator({'fixed': fixed, 'lazy': UCB1(bandits, lazy=True)})
+    results = evaluator.run(data, chunksize=7000)['fixed']
+
+    assert results['events'] == 30000
+    assert results['matches'] == np.sum(arms == 2)
+
+    for estimator in ('replay', 'ips', 'dr'):
+        assert abs(results[estimator] - 0.8) < 0.03, estimator
+
+    # Solamente se vuelve a elegir después de cada registro aceptado
+    assert fixed.selections in (results['matches'], results['matches'] + 1)
+
+
+def test_offline_selection_state():
+    bandits = [BinomialBandit(0.5) for _ in range(3)]
+    fixed = Fixed(bandits, 2)
+
+    # Sin coincidencias el agente no vuelve a elegir
+    evaluator = OfflineEvaluator([fixed])
+    evaluator.run(np.array([[0, 1.0], [1, 0.0], [0, 1.0], [1, 0.0]]))
+
+    assert evaluator.results()['Fixed_0']['matches'] == 0
+    assert fixed.selections == 1
@@ -0,0 +1,40 @@
+import numpy as np
+
+from mablane.identification import LUCB, SuccessiveElimination, TrackAndStop, optimal_weights
+
+
+class Bernoulli:
+    """ Bandido de Bernoulli con el generador global de numpy """
+
+    def __init__(self, probability):
+        self.probability = probability
+
+
+    def pull(self):
+        return float(np.random.random() < self.probability)
+
+
+def test_identifiers_find_best_arm():
+    for identifier in (SuccessiveElimination, LUCB, TrackAndStop):
+        np.random.seed(0)
+        bandits = [Bernoulli(p) for p in (0.1, 0.5, 0.9)]
+        agent = identifier(bandits, delta=0.05)
+
+        # Con bandidos separados se identifica el mejor antes de agotar
+        # el presupuesto
+        assert agent.run(max_pulls=5000) == 2, identifier.__name__
+        assert agent.identified and agent.sample_complexity <= 5000, identifier.__name__
+
+        # Con un presupuesto pequeño se detiene sin llegar a identificarlo
+        np.random.seed(0)
+        agent = identifier(bandits, delta=0.05)
+        agent.run(max_pulls=10)
+
+        assert not agent.identified and 10 <= agent.sample_complexity < 10 + len(bandits), identifier.__name__
+
+
+def test_optimal_weights():
+    weights = optimal_weights(np.array([0.1, 0.5, 0.9]))
+
+    assert np.isclose(np.sum(weights), 1)
+    assert np.argmax(weights) in (1, 2) and weights[0] < weights[1]
@@ -0,0 +1,92 @@
+import numpy as np
+
+from mablane.algortims import Epsilon, ThompsonSampling, UCB1, UCBV
+from mablane.serving import AgentTable
+
+
+def test_agent_table_update():
+    table = AgentTable(UCB1, 3, 2)
+
+    table.update([0, 0, 2, 0], [1, 1, 0, 0], [1.0, 0.0, 1.0, 1.0])
+
+    assert np.array_equal(table._plays, [[1, 2], [0, 0], [1, 0]])
+    assert np.allclose(table._stats.sum(), [[1, 1], [0, 0], [1, 0]])
+    assert np.allclose(table.average_reward([0, 2]), [2 / 3, 1])
+
+    # Los inquilinos con bandidos sin jugar los juegan primero
+    assert np.array_equal(table.select([1, 2, 2]), [0, 1, 1])
+
+
+class _Bandit:
+    # Bandido local: los agentes solamente necesitan el número de bandidos
+    reward = 0.5
+
+
+def _history(seed, size=30):
+    rng = np.random.default_rng(seed)
+    bandits = np.concatenate([np.arange(3), rng.integers(0, 3, size - 3)])
+
+    return bandits, rng.random(size)
+
+
+def _frequencies(bandits, size=3):
+    return np.bincount(bandits, minlength=size) / len(bandits)
+
+
+def test_agent_table_ucbv_matches_agents():
+    table = AgentTable(UCBV, 2, 3, b=2)
+    agents = [UCBV([_Bandit() for _ in range(3)], b=2) for _ in range(2)]
+    rng = np.random.default_rng(0)
+
+    # Con recompensas continuas no hay empates y ambas versiones juegan
+    # exactamente los mismos bandidos
+    for _ in range(200):
+        bandits = table.select([0, 1])
+        assert np.array_equal(bandits, [agent.select() for agent in agents])
+
+        rewards = rng.random(2) * (1 + bandits)
+        table.update([0, 1], bandits, rewards)
+
+        for agent, bandit, reward in zip(agents, bandits, rewards):
+            agent.record(bandit, reward)
+
+    assert np.array_equal(table._plays, [agent._plays for agent in agents])
+
+
+def test_agent_table_epsilon_matches_agent():
+    bandits, rewards = _history(1)
+    table = AgentTable(Epsilon, 2, 3, epsilon=0.6, decay=0.999)
+    agent = Epsilon([_Bandit() for _ in range(3)], epsilon=0.6, decay=0.999)
+
+    table.update(np.ones(len(bandits), dtype=int), bandits, rewards)
+    agent.record_batch(bandits, rewards)
+
+    # Cada petición reduce el epsilon de su inquilino como cada select
+    # del agente, y la exploración se reparte igual entre los bandidos
+    np.random.seed(0)
+    selected = table.select(np.ones(5000, dtype=int))
+    expected = [agent.select() for _ in range(5000)]
+
+    assert np.isclose(table._epsilon[1], agent._epsilon)
+    assert table._epsilon[0] == 0.6
+    assert np.allclose(_frequencies(selected), _frequencies(expected), atol=0.03)
+
+
+def test_agent_table_thompson_matches_agent():
+    bandits, rewards = _history(2)
+    table = AgentTable(ThompsonSampling, 2, 3)
+    agent = ThompsonSampling([_Bandit() for _ in range(3)])
+
+    table.update(np.ones(len(bandits), dtype=int), bandits, rewards)
+    agent.record_batch(bandits, rewards)
+
+    # Las distribuciones beta de la tabla son las del agente
+    successes = table._stats.sum(1)
+    assert np.allclose(1 + successes, agent._alpha)
+    assert np.allclose(1 + table._plays[1] - successes, agent._beta)
+
+    np.random.seed(0)
+    selected = table.select(np.ones(10000, dtype=int))
+    expected = [agent.select() for _ in range(10000)]
+
+    assert np.allclose(_frequencies(selected), _frequencies(expected), atol=0.03)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from mablane.algortims import UCB1
+from mablane.bandits import BinomialBandit
+from mablane.serving import PendingDecisions
+
+
+def test_pending_decisions_join_and_expire():
+    agent = UCB1([BinomialBandit(0.5) for _ in range(3)])
+    pending = PendingDecisions(agent, capacity=4, ttl=10, expiry='zero')
+
+    ids = pending.add([0, 1, 2], step=[0, 5, 20])
+
+    # Las recompensas repetidas o desconocidas se descartan
+    matched = pending.join([ids[1], ids[1], 99], [1.0, 1.0, 1.0])
+    assert np.array_equal(matched, [True, False, False])
+    assert np.array_equal(agent._plays, [0, 1, 0])
+
+    # La primera decisión caduca y se registra con recompensa nula
+    assert pending.expire(15) == 1
+    assert np.array_equal(agent._plays, [1, 1, 0])
+    assert len(pending) == 1
+
+    # Al agotar la capacidad caducan las decisiones más antiguas
+    pending.add([0, 0, 0, 0], step=20)
+    assert len(pending) == 4
+    assert pending.expired == 2
+    assert np.array_equal(agent._plays, [1, 1, 1])
+
+
+def test_pending_decisions_select_distinct():
+    agent = UCB1([BinomialBandit(0.5) for _ in range(3)])
+    pending = PendingDecisions(agent)
+
+    # Sin tiradas UCB1 elegiría el mismo bandido en todo el lote
+    assert len(set(pending.select(3, distinct=False)[1])) == 1
+
+    ids, bandits = pending.select(5)
+    assert sorted(bandits[:3]) == [0, 1, 2]
+    assert np.array_equal(bandits[3:], bandits[:2])
+    assert np.array_equal(ids, np.arange(3, 8))
@@ -0,0 +1,25 @@
+import numpy as np
+
+from mablane.serving import CompactEpsilon, CompactUCBV
+
+
+def test_compact_record():
+    agent = CompactUCBV(3, dtype=np.float64)
+
+    for bandit, reward in [(0, 1.0), (0, 0.0), (2, 1.0), (0, 1.0)]:
+        agent.record(bandit, reward)
+
+    assert np.array_equal(agent._plays, [3, 0, 1])
+    assert np.allclose(agent._mean, [2 / 3, 0, 1])
+    assert np.allclose(agent._arms['m2'], [2 / 3, 0, 0])
+    assert agent.total == 4
+    assert agent.average_reward() == 0.75
+    assert agent.select() == 1
+
+
+def test_compact_slots():
+    agent = CompactEpsilon(4)
+
+    assert not hasattr(agent, '__dict__')
+    assert agent._mean.dtype == np.float32
+    assert agent._plays.dtype == np.uint32
@@ -0,0 +1,50 @@
+import numpy as np
+
+from mablane.algortims import UCB1, Epsilon
+from mablane.bandits import BinomialBandit, PiecewiseBinomialBandit
+from mablane.simulation import CommonRandomNumbers
+
+
+def test_common_random_numbers():
+    bandits = [BinomialBandit(p) for p in (0.2, 0.4, 0.6)]
+
+    # Dos copias del mismo agente juegan la misma cinta con la misma
+    # semilla, por lo que obtienen exactamente la misma recompensa
+    crn = CommonRandomNumbers({'a': UCB1, 'b': UCB1, 'epsilon': Epsilon}, bandits, 2000, replicas=20,
+                              random_state=0)
+    results = crn.run()
+
+    assert np.array_equal(crn._rewards['a'], crn._rewards['b'])
+    assert results['differences']['b']['mean'] == 0
+
+    # La diferencia pareada tiene menos varianza que con muestras
+    # independientes
+    difference = results['differences']['epsilon']
+    assert difference['variance_reduction'] > 1
+    assert difference['low'] <= difference['mean'] <= difference['high']
+
+
+def test_common_random_numbers_memmap_and_reset(tmp_path):
+    bandits = [PiecewiseBinomialBandit([1.0, 0.0], [100]), BinomialBandit(0.5)]
+
+    # Cada réplica empieza con el reloj de los bandidos a cero, también
+    # con las cintas en fichero, que se borran al terminar
+    for params in ({}, {'max_memory': 0, 'chunksize': 64, 'directory': str(tmp_path)}):
+        crn = CommonRandomNumbers([UCB1], bandits, 200, replicas=3, random_state=1, **params)
+        crn.run()
+
+        assert min(crn._rewards['UCB1']) > 0.5
+        assert bandits[0].step == 0
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_common_random_numbers_single_replica():
+    bandits = [BinomialBandit(p) for p in (0.2, 0.6)]
+
+    crn = CommonRandomNumbers({'ucb': UCB1, 'epsilon': Epsilon}, bandits, 200, replicas=1, random_state=0)
+    difference = crn.run()['differences']['epsilon']
+
+    # Sin varianza estimable el intervalo se reduce a la media
+    assert difference['low'] == difference['mean'] == difference['high']
+    assert difference['variance_reduction'] == 1.0
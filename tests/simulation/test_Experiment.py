@@ -0,0 +1,75 @@
+import numpy as np
+
+from mablane.bandits import PiecewiseBinomialBandit
+from mablane.simulation import Experiment
+
+
+def test_experiment_cache(tmp_path):
+    spec = {'algorithms': ['UCB1', {'class': 'Epsilon', 'epsilon': 0.1}],
+            'bandits': [0.1, 0.3],
+            'episodes': 200,
+            'seeds': 2}
+
+    experiment = Experiment(spec, tmp_path)
+
+    assert experiment.run() == 4
+    assert experiment.run() == 0
+
+    # Un cambio en la especificación solamente invalida sus celdas
+    spec['seeds'] = 3
+    assert Experiment(spec, tmp_path).run() == 2
+
+    results = experiment.results()
+    assert len(results) == 4
+    assert experiment.load(results[0]['key'])['rewards'].shape == (200,)
+
+
+def test_experiment_cache_backend(tmp_path, monkeypatch):
+    import mablane.simulation._Experiment as module
+
+    spec = {'algorithms': ['UCB1'], 'bandits': [0.1, 0.3], 'episodes': 100}
+
+    assert Experiment(spec, tmp_path).run() == 1
+
+    # Las trayectorias con y sin numba son distintas y no se reutilizan
+    monkeypatch.setattr(module, 'HAS_NUMBA', not module.HAS_NUMBA)
+    assert Experiment(spec, tmp_path).run() == 1
+    assert Experiment(spec, tmp_path).run() == 0
+
+
+def test_experiment_non_stationary_cache(tmp_path):
+    spec = {'algorithms': ['UCB1'],
+            'bandits': [PiecewiseBinomialBandit([0.1, 0.9], [100]), 0.5],
+            'episodes': 200,
+            'seeds': 2}
+
+    experiment = Experiment(spec, tmp_path)
+    assert experiment.run() == 2
+
+    # El reloj de los bandidos no cambia las claves ni se comparte
+    # entre celdas
+    assert experiment.run() == 0
+    assert Experiment(spec, tmp_path).run() == 0
+
+    rewards = [experiment.load(result['key'])['rewards'] for result in experiment.results()]
+    assert all(len(reward) == 200 for reward in rewards)
+    assert experiment.cells[0]['bandits'][0].step == 0
+
+
+def test_experiment_empirical_key(tmp_path):
+    path = str(tmp_path / 'pool.npy')
+    np.save(path, np.array([0, 1, 1, 0], dtype=float))
+
+    spec = {'algorithms': ['UCB1'],
+            'bandits': [{'class': 'EmpiricalBandit', 'source': path}, 0.5],
+            'episodes': 50}
+
+    key = Experiment(spec, tmp_path).cells[0]['key']
+    assert path not in Experiment(spec, tmp_path).cells[0]['spec']
+
+    # La clave depende del contenido de la bolsa y no de su ruta
+    np.save(path, np.array([1, 1, 1, 0], dtype=float))
+    assert Experiment(spec, tmp_path).cells[0]['key'] != key
+
+    spec['bandits'][0]['source'] = np.array([1, 1, 1, 0], dtype=float)
+    assert len(Experiment(spec, tmp_path).cells[0]['spec']) < 500
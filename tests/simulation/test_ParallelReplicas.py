@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from mablane.algortims import UCB1
+from mablane.bandits import BinomialBandit, reward_tape
+from mablane.simulation import ParallelReplicas
+
+
+def test_parallel_replicas():
+    bandits = [BinomialBandit(0.02), BinomialBandit(0.06), BinomialBandit(0.10)]
+    params = dict(episodes=500, replicas=12, checkpoints=10, block=5, random_state=0)
+
+    single = ParallelReplicas(UCB1, bandits, workers=1, **params)
+    results = single.run()
+
+    multiple = ParallelReplicas(UCB1, bandits, workers=2, **params)
+    multiple.run()
+
+    # Las réplicas no dependen del número de procesos
+    assert np.array_equal(single.rewards, multiple.rewards)
+    assert np.array_equal(single.plays, multiple.plays)
+    assert np.all(single.plays.sum(axis=1) == 500)
+    assert results['checkpoints'][-1] == 500
+    assert single.bands().replicas == 12
+
+
+def test_parallel_replicas_tape():
+    bandits = [BinomialBandit(0.2), BinomialBandit(0.8)]
+    tape = reward_tape(bandits, 100, random_state=0)
+
+    with pytest.raises(ValueError):
+        ParallelReplicas(UCB1, bandits, 200, tape=tape)
+
+    # Con una cinta común de la longitud justa se juegan todas las tiradas
+    replicas = ParallelReplicas(UCB1, bandits, 100, replicas=4, workers=1, tape=tape, random_state=0)
+    replicas.run()
+
+    assert np.all(replicas.plays.sum(axis=1) == 100)
@@ -0,0 +1,19 @@
+import numpy as np
+
+from mablane.simulation import QuantileBands
+
+
+def test_quantile_bands():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(5000, 4)) * np.arange(1, 5)
+
+    bands = QuantileBands([1, 2, 3, 4])
+    bands.update(values[:100])
+    bands.update(values[100:])
+
+    assert bands.replicas == 5000
+    assert np.allclose(bands.mean(), np.mean(values, axis=0))
+    assert np.allclose(bands.variance(), np.var(values, axis=0, ddof=1))
+
+    for q in (0.05, 0.5, 0.95):
+        assert np.allclose(bands.quantile(q), np.quantile(values, q, axis=0), atol=0.1)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from mablane.algortims import Epsilon
+from mablane.bandits import BinomialBandit
+from mablane.simulation import Hyperband, SuccessiveHalving
+
+
+def test_hyperband_brackets():
+    tuner = Hyperband(Epsilon, {}, [], 100, max_replicas=9, eta=3)
+
+    # Cada ronda reparte el mismo presupuesto de forma diferente
+    assert list(tuner._brackets()) == [(9, 1), (5, 3), (3, 9)]
+
+
+def test_successive_halving():
+    bandits = [BinomialBandit(p) for p in (0.1, 0.9)]
+    tuner = SuccessiveHalving(Epsilon, {'epsilon': [0.01, 1.0]}, bandits, 300, candidates=9,
+                              eta=3, workers=1, random_state=0)
+
+    assert tuner.run() == {'epsilon': 0.01}
+
+    # Sobreviven 9, 3 y 1 configuraciones con 1, 3 y 9 réplicas
+    rungs = [[trial for trial in tuner.trials if trial['rung'] == rung] for rung in range(3)]
+
+    assert [len(trials) for trials in rungs] == [9, 3, 1]
+    assert [trials[0]['replicas'] for trials in rungs] == [1, 3, 9]
+    assert np.isclose(tuner.best_score, rungs[2][0]['score'])
@@ -0,0 +1,24 @@
+import numpy as np
+
+from mablane.algortims import UCB1
+from mablane.bandits import BinomialBandit
+from mablane.simulation import check_equivalence, run_reference
+
+
+def test_check_equivalence():
+    bandits = [BinomialBandit(p) for p in (0.2, 0.4, 0.6)]
+
+    report = check_equivalence(UCB1, bandits, 300, engine=run_reference)
+    assert report['equivalent']
+    assert report['max_error'] == {'_plays': 0.0, '_mean': 0.0}
+
+    # Un motor que altera una tirada se detecta en esa tirada
+    def engine(agent, tape, seed=None, out=None):
+        run_reference(agent, tape, seed, out)
+        if len(agent._rewards) == 150:
+            out[-1] = (out[-1] + 1) % 3
+
+    report = check_equivalence(UCB1, bandits, 300, engine=engine, checkpoints=[150])
+    assert not report['equivalent']
+    assert report['divergence'] == 149
+    assert report['kind'] == 'choice'
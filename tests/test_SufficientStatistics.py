@@ -0,0 +1,23 @@
+import numpy as np
+
+from mablane._SufficientStatistics import SufficientStatistics
+
+
+def test_sufficient_statistics_moments():
+    rng = np.random.default_rng(0)
+    index = rng.integers(3, size=3000)
+    values = rng.gamma(2, size=3000) + 1e6
+
+    stats = SufficientStatistics(3, moments=4)
+    for i, value in zip(index[:1000], values[:1000]):
+        stats.update(i, value)
+    stats.update_batch(index[1000:], values[1000:])
+
+    for i in range(3):
+        deviation = values[index == i] - np.mean(values[index == i])
+
+        assert stats.count[i] == np.sum(index == i)
+        assert np.isclose(stats.mean[i], np.mean(values[index == i]), rtol=1e-14)
+        assert np.isclose(stats.m2[i], np.sum(deviation**2), rtol=1e-9)
+        assert np.isclose(stats.m3[i], np.sum(deviation**3), rtol=1e-6)
+        assert np.isclose(stats.m4[i], np.sum(deviation**4), rtol=1e-6)